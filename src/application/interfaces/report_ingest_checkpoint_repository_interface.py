@@ -0,0 +1,41 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Set
+
+from domain.enums.report_period_enum import ReportPeriod
+
+
+class IReportIngestCheckpointRepository(ABC):
+    @abstractmethod
+    async def list(
+        self,
+        report_file_path: Optional[str] = None,
+        period: Optional[ReportPeriod] = None,
+    ) -> List[dict]:
+        ...
+
+    @abstractmethod
+    async def get_committed_chunks(
+        self,
+        report_file_path: str,
+        period: ReportPeriod,
+        chunk_size: int,
+    ) -> Set[int]:
+        ...
+
+    @abstractmethod
+    async def create(
+        self,
+        report_file_path: str,
+        period: ReportPeriod,
+        chunk_size: int,
+        chunk_index: int,
+    ) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(
+        self,
+        report_file_path: Optional[str] = None,
+        period: Optional[ReportPeriod] = None,
+    ) -> int:
+        ...
@@ -0,0 +1,31 @@
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import Optional, Tuple
+
+from domain.entities.data_version_entity import DataVersionEntity
+
+
+class IResponseCache(ABC):
+    @abstractmethod
+    async def get(self, key: str, version: Optional[int] = None) -> Tuple[int, Optional[bytes]]:
+        """
+        Возвращает текущую версию данных и ответ, сохраненный для этой версии.
+        Если version передана, текущая версия не читается.
+        """
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, version: int, value: bytes, ttl: Optional[int] = None) -> None:
+        ...
+
+    @abstractmethod
+    async def get_version(self) -> DataVersionEntity:
+        ...
+
+    @abstractmethod
+    async def bump_version(self, day: Optional[date] = None) -> int:
+        ...
+
+    @abstractmethod
+    async def get_stats(self) -> dict:
+        ...
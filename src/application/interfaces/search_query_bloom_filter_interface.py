@@ -0,0 +1,38 @@
+from abc import ABC, abstractmethod
+from typing import Iterable, Tuple
+
+
+class ISearchQueryBloomFilter(ABC):
+    @property
+    @abstractmethod
+    def max_id(self) -> int:
+        ...
+
+    @property
+    @abstractmethod
+    def is_ready(self) -> bool:
+        ...
+
+    @abstractmethod
+    def load_values(self, items: Iterable[Tuple[str, int]]) -> None:
+        ...
+
+    @abstractmethod
+    def finish_loading(self) -> None:
+        ...
+
+    @abstractmethod
+    def add_many(self, values: Iterable[str]) -> None:
+        ...
+
+    @abstractmethod
+    def might_contain(self, value: str) -> bool:
+        """
+        False - значения точно нет, True - возможно есть. До первой
+        загрузки всегда True.
+        """
+        ...
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 from domain.entities.search_query_entity import SearchQueryEntity
 
@@ -10,9 +10,49 @@ class ISearchQueryCache(ABC):
         ...
 
     @abstractmethod
-    async def get_query_by_value(self, query_value: int) -> Optional[SearchQueryEntity]:
+    async def get_query_by_value(self, query_value: str) -> Optional[SearchQueryEntity]:
         ...
 
     @abstractmethod
     async def save_search_query(self, query: SearchQueryEntity, ttl: int = None) -> None:
         ...
+
+    @abstractmethod
+    async def get_queries_by_values(self, query_values: Iterable[str]) -> Dict[str, SearchQueryEntity]:
+        ...
+
+    @abstractmethod
+    async def save_many(self, queries: List[SearchQueryEntity], ttl: int = None) -> None:
+        ...
+
+    @abstractmethod
+    async def get_missing_values(self, query_values: Iterable[str]) -> Set[str]:
+        """
+        Значения, которых недавно не нашлось в базе.
+        """
+        ...
+
+    @abstractmethod
+    async def get_queries_and_missing_values(
+        self,
+        query_values: Iterable[str],
+    ) -> Tuple[Dict[str, SearchQueryEntity], Set[str]]:
+        """
+        get_queries_by_values и get_missing_values за одно чтение.
+        """
+        ...
+
+    @abstractmethod
+    async def save_missing_values(self, query_values: List[str], ttl: int) -> None:
+        """
+        Запоминает отсутствие значений на ttl секунд. save_many для этих
+        значений отменяет отметку.
+        """
+        ...
+
+    @abstractmethod
+    async def get_stats(self) -> dict:
+        """
+        Попадания и промахи чтения по значению в текущем процессе.
+        """
+        ...
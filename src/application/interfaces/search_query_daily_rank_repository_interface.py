@@ -0,0 +1,24 @@
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import AsyncIterator, Optional, Tuple
+
+
+class ISearchQueryDailyRankRepository(ABC):
+    @abstractmethod
+    async def calculate_ranks(
+        self,
+        day: date,
+    ) -> None:
+        ...
+
+    @abstractmethod
+    async def get_last_day(self) -> Optional[date]:
+        ...
+
+    @abstractmethod
+    def iter_requests(
+        self,
+        day: date,
+        batch_size: int = 10000,
+    ) -> AsyncIterator[Tuple[int, int]]:
+        ...
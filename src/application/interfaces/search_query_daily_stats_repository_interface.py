@@ -1,10 +1,14 @@
 from abc import ABC, abstractmethod
 from datetime import date
-from typing import List
+from typing import (
+    AsyncIterator, Awaitable, Callable, Iterable, List, Optional,
+)
+from uuid import UUID
 
 from domain.entities.search_query_daily_stats_entity import (
     SearchQueryDailyStatsEntity,
 )
+from domain.enums.granularity_enum import Granularity
 
 
 class ISearchQueryDailyStatsRepository(ABC):
@@ -14,12 +18,53 @@ class ISearchQueryDailyStatsRepository(ABC):
         search_query_ids: List[int],
         from_date: date,
         to_date: date,
+        granularity: Granularity = Granularity.DAY,
     ) -> List[SearchQueryDailyStatsEntity]:
         ...
 
+    @abstractmethod
+    def iter_day(
+        self,
+        day: date,
+        batch_size: int = 10000,
+    ) -> AsyncIterator[SearchQueryDailyStatsEntity]:
+        ...
+
+    @abstractmethod
+    async def copy_days(
+        self,
+        days: Iterable[date],
+        output: Callable[[bytes], Awaitable[None]],
+    ) -> None:
+        ...
+
     @abstractmethod
     async def bulk_create(
         self,
         insert_obj_list: List[dict],
     ) -> None:
         ...
+
+    @abstractmethod
+    async def stage(
+        self,
+        batch_id: UUID,
+        insert_obj_list: List[dict],
+    ) -> None:
+        ...
+
+    @abstractmethod
+    async def merge_staged(
+        self,
+        batch_id: UUID,
+        days: Iterable[date],
+        columns: Optional[Iterable[str]] = None,
+    ) -> None:
+        ...
+
+    @abstractmethod
+    async def delete_staged(
+        self,
+        batch_id: UUID,
+    ) -> None:
+        ...
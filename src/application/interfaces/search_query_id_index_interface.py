@@ -0,0 +1,28 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Tuple
+
+
+class ISearchQueryIdIndex(ABC):
+    @abstractmethod
+    def load_batch(self, items: Iterable[Tuple[str, int]]) -> None:
+        ...
+
+    @abstractmethod
+    def finish_loading(self) -> None:
+        ...
+
+    @abstractmethod
+    def get_ids(self, values: Iterable[str]) -> Dict[str, int]:
+        ...
+
+    @abstractmethod
+    def add(self, value: str, search_query_id: int) -> None:
+        ...
+
+    @abstractmethod
+    def memory_usage(self) -> int:
+        ...
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
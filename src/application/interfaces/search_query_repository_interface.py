@@ -1,8 +1,13 @@
 from abc import ABC, abstractmethod
 from datetime import date
-from typing import List, Optional
+from typing import (
+    AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple,
+)
 
 from domain.entities.search_query_entity import SearchQueryEntity
+from domain.entities.search_query_page_entity import SearchQueryPageEntity
+from domain.enums.granularity_enum import Granularity
+from domain.enums.search_mode_enum import SearchMode
 
 
 class ISearchQueryRepository(ABC):
@@ -11,6 +16,7 @@ class ISearchQueryRepository(ABC):
         self,
         search_query_ids: Optional[List[int]] = None,
         search: Optional[str] = None,
+        search_mode: SearchMode = SearchMode.FULLTEXT,
         target_day: Optional[date] = None,
         sort_by: str = 'day',
         sort_dir: str = 'desc',
@@ -18,6 +24,37 @@ class ISearchQueryRepository(ABC):
         offset: int = 0,
     ) -> List[SearchQueryEntity]:
         ...
+
+    @abstractmethod
+    async def list_page(
+        self,
+        search_query_ids: Optional[List[int]] = None,
+        search: Optional[str] = None,
+        search_mode: SearchMode = SearchMode.FULLTEXT,
+        target_day: Optional[date] = None,
+        sort_by: str = 'day',
+        sort_dir: str = 'desc',
+        limit: int = 100,
+        after: Optional[Sequence] = None,
+    ) -> SearchQueryPageEntity:
+        ...
+
+    @abstractmethod
+    async def list_page_with_statistics(
+        self,
+        from_date: date,
+        to_date: date,
+        search_query_ids: Optional[List[int]] = None,
+        search: Optional[str] = None,
+        search_mode: SearchMode = SearchMode.FULLTEXT,
+        target_day: Optional[date] = None,
+        sort_by: str = 'day',
+        sort_dir: str = 'desc',
+        limit: int = 100,
+        after: Optional[Sequence] = None,
+        granularity: Granularity = Granularity.DAY,
+    ) -> SearchQueryPageEntity:
+        ...
     
     @abstractmethod
     async def bulk_create(
@@ -27,5 +64,13 @@ class ISearchQueryRepository(ABC):
         ...
 
     @abstractmethod
-    async def get_query_by_value(self) -> Optional[SearchQueryEntity]:
+    async def get_query_by_value(self, value: str) -> Optional[SearchQueryEntity]:
+        ...
+
+    @abstractmethod
+    async def get_queries_by_values(self, values: Iterable[str]) -> Dict[str, SearchQueryEntity]:
+        ...
+
+    @abstractmethod
+    def iter_values(self, batch_size: int = 10000, min_id: int = 0) -> AsyncIterator[Tuple[str, int]]:
         ...
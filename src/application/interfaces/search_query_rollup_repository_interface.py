@@ -0,0 +1,11 @@
+from abc import ABC, abstractmethod
+from datetime import date
+
+
+class ISearchQueryRollupRepository(ABC):
+    @abstractmethod
+    async def calculate_rollups(
+        self,
+        day: date,
+    ) -> None:
+        ...
@@ -0,0 +1,49 @@
+from abc import ABC, abstractmethod
+from typing import Iterable, Iterator, List, Tuple
+
+from domain.entities.search_query_suggestion_entity import (
+    SearchQuerySuggestionEntity,
+)
+
+
+class ISearchQuerySuggestIndex(ABC):
+    @property
+    @abstractmethod
+    def max_id(self) -> int:
+        ...
+
+    @property
+    @abstractmethod
+    def top_size(self) -> int:
+        """
+        Наибольшее число подсказок, которое может вернуть suggest.
+        """
+        ...
+
+    @abstractmethod
+    def load_values(self, items: Iterable[Tuple[str, int]]) -> None:
+        ...
+
+    @abstractmethod
+    def load_weights(self, items: Iterable[Tuple[int, int]]) -> None:
+        ...
+
+    @abstractmethod
+    def finish_loading(self) -> None:
+        ...
+
+    @abstractmethod
+    def iter_finish_loading(self) -> Iterator[None]:
+        """
+        То же, что finish_loading, по шагам: между шагами можно отдать
+        управление циклу событий.
+        """
+        ...
+
+    @abstractmethod
+    def suggest(self, prefix: str, limit: int = 10) -> List[SearchQuerySuggestionEntity]:
+        ...
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
@@ -2,6 +2,11 @@ from abc import ABC, abstractmethod
 from datetime import date
 from typing import List
 
+from domain.entities.requests_total_by_day_entity import (
+    RequestsTotalByDayEntity,
+)
+from domain.enums.granularity_enum import Granularity
+
 
 class ISearchQueryTotalByDayRepository(ABC):
     @abstractmethod
@@ -9,6 +14,7 @@ class ISearchQueryTotalByDayRepository(ABC):
         self,
         from_date: date,
         to_date: date,
+        granularity: Granularity = Granularity.DAY,
     ) -> List[dict]:
         ...
 
@@ -18,3 +24,10 @@ class ISearchQueryTotalByDayRepository(ABC):
         day: date,
     ) -> None:
         ...
+
+    @abstractmethod
+    async def save(
+        self,
+        total: RequestsTotalByDayEntity,
+    ) -> None:
+        ...
@@ -1,4 +1,5 @@
 from datetime import date
+from typing import List
 
 from domain.enums.report_period_enum import ReportPeriod
 from domain.interfaces.task_factory_interface import ITaskFactory
@@ -20,6 +21,10 @@ class TaskService(ITaskService):
             task = self._task_factory.create_task('download_three_months_report')
             task.execute()
 
+    def download_combined_search_query_report(self) -> None:
+        task = self._task_factory.create_task('download_combined_report')
+        task.execute()
+
     def fetch_search_queries(self, report_file_path: str, period: ReportPeriod) -> None:
         task = self._task_factory.create_task('fetch_search_queries')
         task.execute(report_file_path, period)
@@ -27,3 +32,19 @@ class TaskService(ITaskService):
     def calculate_total_requests_per_day(self, day: date) -> None:
         task = self._task_factory.create_task('calculate_total_requests_per_day')
         task.execute(day)
+
+    def calculate_search_query_ranks(self, day: date) -> None:
+        task = self._task_factory.create_task('calculate_search_query_ranks')
+        task.execute(day)
+
+    def calculate_search_query_rollups(self, days: List[date]) -> None:
+        task = self._task_factory.create_task('calculate_search_query_rollups')
+        task.execute(days)
+
+    def warm_up_search_query_cache(self) -> None:
+        task = self._task_factory.create_task('warm_up_search_query_cache')
+        task.execute()
+
+    def archive_search_query_daily_stats(self, days: List[date]) -> None:
+        task = self._task_factory.create_task('archive_search_query_daily_stats')
+        task.execute(days)
@@ -1,2 +1,5 @@
+from .report_ingest_checkpoint_use_cases import *
+from .response_cache_use_cases import *
 from .search_query_daily_stats_use_cases import *
+from .search_query_suggest_use_cases import *
 from .search_query_use_cases import *
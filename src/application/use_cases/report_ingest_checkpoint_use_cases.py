@@ -0,0 +1,84 @@
+from typing import List, Optional, Set
+
+from application.interfaces.report_ingest_checkpoint_repository_interface import (
+    IReportIngestCheckpointRepository,
+)
+from domain.enums.report_period_enum import ReportPeriod
+
+
+class GetCommittedReportChunksUseCase:
+    def __init__(
+        self,
+        report_ingest_checkpoint_repository: IReportIngestCheckpointRepository,
+    ) -> None:
+        self._report_ingest_checkpoint_repository = report_ingest_checkpoint_repository
+
+    async def execute(
+        self,
+        report_file_path: str,
+        period: ReportPeriod,
+        chunk_size: int,
+    ) -> Set[int]:
+        return await self._report_ingest_checkpoint_repository.get_committed_chunks(
+            report_file_path=report_file_path,
+            period=period,
+            chunk_size=chunk_size,
+        )
+
+
+class CommitReportChunkUseCase:
+    def __init__(
+        self,
+        report_ingest_checkpoint_repository: IReportIngestCheckpointRepository,
+    ) -> None:
+        self._report_ingest_checkpoint_repository = report_ingest_checkpoint_repository
+
+    async def execute(
+        self,
+        report_file_path: str,
+        period: ReportPeriod,
+        chunk_size: int,
+        chunk_index: int,
+    ) -> None:
+        await self._report_ingest_checkpoint_repository.create(
+            report_file_path=report_file_path,
+            period=period,
+            chunk_size=chunk_size,
+            chunk_index=chunk_index,
+        )
+
+
+class FindReportIngestCheckpointsUseCase:
+    def __init__(
+        self,
+        report_ingest_checkpoint_repository: IReportIngestCheckpointRepository,
+    ) -> None:
+        self._report_ingest_checkpoint_repository = report_ingest_checkpoint_repository
+
+    async def execute(
+        self,
+        report_file_path: Optional[str] = None,
+        period: Optional[ReportPeriod] = None,
+    ) -> List[dict]:
+        return await self._report_ingest_checkpoint_repository.list(
+            report_file_path=report_file_path,
+            period=period,
+        )
+
+
+class ResetReportIngestCheckpointsUseCase:
+    def __init__(
+        self,
+        report_ingest_checkpoint_repository: IReportIngestCheckpointRepository,
+    ) -> None:
+        self._report_ingest_checkpoint_repository = report_ingest_checkpoint_repository
+
+    async def execute(
+        self,
+        report_file_path: Optional[str] = None,
+        period: Optional[ReportPeriod] = None,
+    ) -> int:
+        return await self._report_ingest_checkpoint_repository.delete(
+            report_file_path=report_file_path,
+            period=period,
+        )
@@ -0,0 +1,29 @@
+from datetime import date
+from typing import Optional
+
+from application.interfaces.response_cache_interface import IResponseCache
+from domain.entities.data_version_entity import DataVersionEntity
+
+
+class BumpDataVersionUseCase:
+    def __init__(self, response_cache: IResponseCache) -> None:
+        self._response_cache = response_cache
+
+    async def execute(self, day: Optional[date] = None) -> int:
+        return await self._response_cache.bump_version(day)
+
+
+class GetDataVersionUseCase:
+    def __init__(self, response_cache: IResponseCache) -> None:
+        self._response_cache = response_cache
+
+    async def execute(self) -> DataVersionEntity:
+        return await self._response_cache.get_version()
+
+
+class GetResponseCacheStatsUseCase:
+    def __init__(self, response_cache: IResponseCache) -> None:
+        self._response_cache = response_cache
+
+    async def execute(self) -> dict:
+        return await self._response_cache.get_stats()
@@ -1,70 +1,164 @@
+import zlib
 from datetime import date
-from typing import List, Optional
+from typing import (
+    AsyncIterator, Awaitable, Callable, Iterable, List, Optional, Sequence,
+)
+from uuid import UUID
 
 from dateutil.relativedelta import relativedelta
 
+from application.interfaces.search_query_daily_rank_repository_interface import (
+    ISearchQueryDailyRankRepository,
+)
 from application.interfaces.search_query_daily_stats_repository_interface import (
     ISearchQueryDailyStatsRepository,
 )
+from application.interfaces.search_query_id_index_interface import (
+    ISearchQueryIdIndex,
+)
+from application.interfaces.search_query_rollup_repository_interface import (
+    ISearchQueryRollupRepository,
+)
 from application.interfaces.search_query_total_by_day_repository_interface import (
     ISearchQueryTotalByDayRepository,
     ISearchQueryTotalByDayRepository as ISearchQueryTotalNumberPerDayRepository,
 )
 from application.utils import calendarutil
+from domain.entities.requests_total_by_day_entity import (
+    RequestsTotalByDayEntity,
+)
+from domain.entities.search_query_daily_stats_entity import (
+    SearchQueryDailyStatsEntity,
+)
 from domain.entities.search_query_entity import SearchQueryEntity
+from domain.enums.granularity_enum import Granularity
 from domain.enums.report_period_enum import ReportPeriod
+from domain.interfaces.task_service_interface import ITaskService
 
 
-class BulkCreateSearchQueryDailyStatsUseCase:
+class ResolveSearchQueryDailyStatsUseCase:
+    """
+    Преобразует пачку отчета (параллельные списки запросов и числа запросов)
+    в строки статистики, создавая отсутствующие поисковые запросы.
+    """
     def __init__(
         self,
-        search_query_daily_stats_repository: ISearchQueryDailyStatsRepository,
-        get_search_query_by_value_use_case,
+        get_search_queries_by_values_use_case,
         bulk_create_search_queries_use_case,
     ) -> None:
-        self._search_query_daily_stats_repository = search_query_daily_stats_repository
-        self._get_search_query_by_value_use_case = get_search_query_by_value_use_case
+        self._get_search_queries_by_values_use_case = get_search_queries_by_values_use_case
         self._bulk_create_search_queries_use_case = bulk_create_search_queries_use_case
 
     async def execute(
         self,
-        values: List[tuple],
+        values: List[str],
+        counts: Sequence[int],
         day: date,
         period: ReportPeriod,
-    ) -> list:
-        index_by_search_query_value = {}
-        inserted_search_query = []
-        inserted_daily_stat_data = []
+        search_query_id_index: Optional[ISearchQueryIdIndex] = None,
+    ) -> List[dict]:
+        search_query_id_by_value = {}
+        if search_query_id_index is not None:
+            search_query_id_by_value = search_query_id_index.get_ids(values)
+
+        # Оставшиеся значения пачки разрешаются в id одним запросом к кэшу и базе
+        unresolved_values = [value for value in values if value not in search_query_id_by_value]
+        if unresolved_values:
+            search_query_by_value = await self._get_search_queries_by_values_use_case.execute(unresolved_values)
+
+            inserted_search_query = []
+            for search_query_value in unresolved_values:
+                if search_query_value not in search_query_by_value:
+                    search_query = SearchQueryEntity(
+                        value=search_query_value,
+                    )
+
+                    inserted_search_query.append(search_query)
+
+                    search_query_by_value[search_query_value] = search_query
 
-        for i, (search_query_value, number_of_requests) in enumerate(values):
-            search_query = await self._get_search_query_by_value_use_case.execute(search_query_value)
+            if inserted_search_query:
+                await self._bulk_create_search_queries_use_case.execute(inserted_search_query)
 
-            if search_query is None:
-                search_query = SearchQueryEntity(
-                    value=search_query_value,
-                )
+            for search_query in search_query_by_value.values():
+                search_query_id_by_value[search_query.value] = search_query.id
 
-                inserted_search_query.append(search_query)
+                if search_query_id_index is not None:
+                    search_query_id_index.add(search_query.value, search_query.id)
 
-                index_by_search_query_value[search_query_value] = i
+        # Повтор запроса в пачке заменяет прежнюю строку: upsert оставит одну
+        # строку на (day, searchquery_id), и итоги за день считаются по ней же
+        daily_stat_by_search_query_id = {}
+        for search_query_value, number_of_requests in zip(values, counts):
+            search_query_id = search_query_id_by_value[search_query_value]
 
             search_query_daily_stat = {
                 'day': day,
-                'searchquery_id': search_query.id,
+                'searchquery_id': search_query_id,
             }
-            if period == ReportPeriod.ONE_WEEK:
-                search_query_daily_stat['requests_per_week'] = int(number_of_requests)
+            search_query_daily_stat[period.requests_field] = number_of_requests
+
+            daily_stat_by_search_query_id[search_query_id] = search_query_daily_stat
+
+        return list(daily_stat_by_search_query_id.values())
+
+
+class BulkCreateSearchQueryDailyStatsUseCase:
+    def __init__(
+        self,
+        search_query_daily_stats_repository: ISearchQueryDailyStatsRepository,
+    ) -> None:
+        self._search_query_daily_stats_repository = search_query_daily_stats_repository
+
+    async def execute(
+        self,
+        daily_stats: List[dict],
+    ) -> None:
+        await self._search_query_daily_stats_repository.bulk_create(daily_stats)
+
+
+class StageSearchQueryDailyStatsUseCase:
+    def __init__(
+        self,
+        search_query_daily_stats_repository: ISearchQueryDailyStatsRepository,
+    ) -> None:
+        self._search_query_daily_stats_repository = search_query_daily_stats_repository
 
-            inserted_daily_stat_data.append(search_query_daily_stat)
+    async def execute(
+        self,
+        batch_id: UUID,
+        daily_stats: List[dict],
+    ) -> None:
+        await self._search_query_daily_stats_repository.stage(batch_id, daily_stats)
 
-        if inserted_search_query:
-            await self._bulk_create_search_queries_use_case.execute(inserted_search_query)
 
-        for search_query in inserted_search_query:
-            search_query_daily_stat = inserted_daily_stat_data[index_by_search_query_value[search_query.value]]
-            search_query_daily_stat['searchquery_id'] = search_query.id
+class MergeStagedSearchQueryDailyStatsUseCase:
+    def __init__(
+        self,
+        search_query_daily_stats_repository: ISearchQueryDailyStatsRepository,
+    ) -> None:
+        self._search_query_daily_stats_repository = search_query_daily_stats_repository
+
+    async def execute(
+        self,
+        batch_id: UUID,
+        days: List[date],
+    ) -> None:
+        await self._search_query_daily_stats_repository.merge_staged(batch_id, days)
 
-        await self._search_query_daily_stats_repository.bulk_create(inserted_daily_stat_data)
+
+class DeleteStagedSearchQueryDailyStatsUseCase:
+    def __init__(
+        self,
+        search_query_daily_stats_repository: ISearchQueryDailyStatsRepository,
+    ) -> None:
+        self._search_query_daily_stats_repository = search_query_daily_stats_repository
+
+    async def execute(
+        self,
+        batch_id: UUID,
+    ) -> None:
+        await self._search_query_daily_stats_repository.delete_staged(batch_id)
 
 
 class FindSearchQueryDailyStatsUseCase:
@@ -79,6 +173,7 @@ class FindSearchQueryDailyStatsUseCase:
         search_query_ids: List[int],
         from_date: Optional[date] = None,
         to_date: Optional[date] = None,
+        granularity: str = Granularity.DAY.value,
     ) -> list:
         now = calendarutil.now()
         if to_date is None:
@@ -91,9 +186,73 @@ class FindSearchQueryDailyStatsUseCase:
             search_query_ids=search_query_ids,
             from_date=from_date,
             to_date=to_date,
+            granularity=Granularity(granularity),
         )
  
 
+class ExportSearchQueryDailyStatsUseCase:
+    def __init__(
+        self,
+        search_query_daily_stats_repository: ISearchQueryDailyStatsRepository,
+    ) -> None:
+        self._search_query_daily_stats_repository = search_query_daily_stats_repository
+
+    def execute(
+        self,
+        day: Optional[date] = None,
+    ) -> AsyncIterator[SearchQueryDailyStatsEntity]:
+        if day is None:
+            day = calendarutil.now().date()
+
+        return self._search_query_daily_stats_repository.iter_day(day)
+
+
+class ArchiveSearchQueryDailyStatsUseCase:
+    """
+    Выгружает статистику за дни в gzip CSV, передавая сжатые куски в output.
+    """
+    def __init__(
+        self,
+        search_query_daily_stats_repository: ISearchQueryDailyStatsRepository,
+        compress_level: int = 1,
+    ) -> None:
+        self._search_query_daily_stats_repository = search_query_daily_stats_repository
+        self._compress_level = compress_level
+
+    async def execute(
+        self,
+        days: Iterable[date],
+        output: Callable[[bytes], Awaitable[None]],
+    ) -> None:
+        # wbits=31 - формат gzip
+        compressor = zlib.compressobj(self._compress_level, zlib.DEFLATED, 31)
+
+        async def write(chunk: bytes) -> None:
+            if data := compressor.compress(chunk):
+                await output(data)
+
+        await self._search_query_daily_stats_repository.copy_days(days, write)
+
+        await output(compressor.flush())
+
+
+class RunSearchQueryDailyStatsArchiveUseCase:
+    def __init__(
+        self,
+        task_service: ITaskService,
+    ) -> None:
+        self._task_service = task_service
+
+    async def execute(
+        self,
+        days: Optional[List[date]] = None,
+    ) -> None:
+        if not days:
+            days = [calendarutil.now().date()]
+
+        self._task_service.archive_search_query_daily_stats(days=days)
+
+
 class CalculateTotalRequestsPerDayUseCase:
     def __init__(
         self,
@@ -108,6 +267,82 @@ class CalculateTotalRequestsPerDayUseCase:
         await self._search_query_total_number_per_day_repository.calculate_total_requests_per_day(day)
 
 
+class SaveTotalRequestsPerDayUseCase:
+    def __init__(
+        self,
+        search_query_total_by_day_repository: ISearchQueryTotalByDayRepository,
+    ) -> None:
+        self._search_query_total_by_day_repository = search_query_total_by_day_repository
+
+    async def execute(
+        self,
+        total: RequestsTotalByDayEntity,
+    ) -> None:
+        await self._search_query_total_by_day_repository.save(total)
+
+
+class CalculateSearchQueryRanksUseCase:
+    def __init__(
+        self,
+        search_query_daily_rank_repository: ISearchQueryDailyRankRepository,
+    ) -> None:
+        self._search_query_daily_rank_repository = search_query_daily_rank_repository
+
+    async def execute(
+        self,
+        day: date,
+    ) -> None:
+        await self._search_query_daily_rank_repository.calculate_ranks(day)
+
+
+class CalculateSearchQueryRollupsUseCase:
+    def __init__(
+        self,
+        search_query_rollup_repository: ISearchQueryRollupRepository,
+    ) -> None:
+        self._search_query_rollup_repository = search_query_rollup_repository
+
+    async def execute(
+        self,
+        day: date,
+    ) -> None:
+        await self._search_query_rollup_repository.calculate_rollups(day)
+
+
+class RunSearchQueryRollupsCalculationUseCase:
+    def __init__(
+        self,
+        task_service: ITaskService,
+    ) -> None:
+        self._task_service = task_service
+
+    async def execute(
+        self,
+        days: Optional[List[date]] = None,
+    ) -> None:
+        if not days:
+            days = [calendarutil.now().date()]
+
+        self._task_service.calculate_search_query_rollups(days=days)
+
+
+class RunSearchQueryRanksCalculationUseCase:
+    def __init__(
+        self,
+        task_service: ITaskService,
+    ) -> None:
+        self._task_service = task_service
+
+    async def execute(
+        self,
+        day: Optional[date] = None,
+    ) -> None:
+        if day is None:
+            day = calendarutil.now().date()
+
+        self._task_service.calculate_search_query_ranks(day=day)
+
+
 class FindTotalRequestsPerDayUseCase:
     def __init__(
         self,
@@ -119,6 +354,7 @@ class FindTotalRequestsPerDayUseCase:
         self,
         from_date: Optional[date] = None,
         to_date: Optional[date] = None,
+        granularity: str = Granularity.DAY.value,
     ) -> list:
         now = calendarutil.now()
         if to_date is None:
@@ -130,4 +366,5 @@ class FindTotalRequestsPerDayUseCase:
         return await self._search_query_total_number_per_day_repository.list(
             from_date=from_date,
             to_date=to_date,
+            granularity=Granularity(granularity),
         )
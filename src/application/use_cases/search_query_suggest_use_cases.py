@@ -0,0 +1,84 @@
+import asyncio
+from typing import List
+
+from application.interfaces.search_query_daily_rank_repository_interface import (
+    ISearchQueryDailyRankRepository,
+)
+from application.interfaces.search_query_repository_interface import (
+    ISearchQueryRepository,
+)
+from application.interfaces.search_query_suggest_index_interface import (
+    ISearchQuerySuggestIndex,
+)
+from domain.entities.search_query_suggestion_entity import (
+    SearchQuerySuggestionEntity,
+)
+
+
+class SuggestSearchQueriesUseCase:
+    def __init__(self, search_query_suggest_index: ISearchQuerySuggestIndex) -> None:
+        self._search_query_suggest_index = search_query_suggest_index
+
+    async def execute(self, prefix: str, limit: int = 10) -> List[SearchQuerySuggestionEntity]:
+        # Индекс хранит для префикса только top_size лучших позиций
+        if limit > self._search_query_suggest_index.top_size:
+            raise ValueError(f'limit must not exceed {self._search_query_suggest_index.top_size}')
+
+        return self._search_query_suggest_index.suggest(prefix, limit)
+
+
+class RefreshSearchQuerySuggestIndexUseCase:
+    """
+    Догружает в индекс подсказок новые запросы и частоты последнего дня,
+    после чего перестраивает индекс.
+
+    Загрузка отчета пишет запросы параллельными транзакциями, и запрос с
+    меньшим id может появиться в базе позже большего. Поэтому запросы с id
+    от max_id - id_window читаются повторно, индекс пропускает уже
+    загруженные.
+    """
+    def __init__(
+        self,
+        search_query_repository: ISearchQueryRepository,
+        search_query_daily_rank_repository: ISearchQueryDailyRankRepository,
+        search_query_suggest_index: ISearchQuerySuggestIndex,
+        id_window: int = 100000,
+    ) -> None:
+        self._search_query_repository = search_query_repository
+        self._search_query_daily_rank_repository = search_query_daily_rank_repository
+        self._search_query_suggest_index = search_query_suggest_index
+        self._id_window = id_window
+
+    async def execute(self, batch_size: int = 10000) -> ISearchQuerySuggestIndex:
+        index = self._search_query_suggest_index
+
+        min_id = max(index.max_id - self._id_window, 0)
+
+        batch = []
+        async for item in self._search_query_repository.iter_values(batch_size, min_id):
+            batch.append(item)
+
+            if len(batch) >= batch_size:
+                index.load_values(batch)
+                batch = []
+
+        index.load_values(batch)
+
+        if (day := await self._search_query_daily_rank_repository.get_last_day()) is not None:
+            batch = []
+            async for item in self._search_query_daily_rank_repository.iter_requests(day, batch_size):
+                batch.append(item)
+
+                if len(batch) >= batch_size:
+                    index.load_weights(batch)
+                    batch = []
+
+            index.load_weights(batch)
+
+        # Построение занимает секунды на миллионах запросов. В потоке оно
+        # держало бы GIL и задерживало запросы, поэтому идет в цикле событий
+        # короткими шагами
+        for _ in index.iter_finish_loading():
+            await asyncio.sleep(0)
+
+        return index
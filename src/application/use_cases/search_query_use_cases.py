@@ -1,16 +1,28 @@
-from typing import List, Optional
+import asyncio
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import dateutil
+from dateutil.relativedelta import relativedelta
 
+from application.interfaces.search_query_bloom_filter_interface import (
+    ISearchQueryBloomFilter,
+)
 from application.interfaces.search_query_cache_interface import (
     ISearchQueryCache,
 )
+from application.interfaces.search_query_id_index_interface import (
+    ISearchQueryIdIndex,
+)
 from application.interfaces.search_query_repository_interface import (
     ISearchQueryRepository,
 )
-from application.utils import calendarutil
+from application.utils import calendarutil, cursorutil
 from domain.entities.search_query_entity import SearchQueryEntity
+from domain.entities.search_query_page_entity import SearchQueryPageEntity
+from domain.enums.granularity_enum import Granularity
 from domain.enums.report_period_enum import ReportPeriod
+from domain.enums.search_mode_enum import SearchMode
 from domain.interfaces.task_service_interface import ITaskService
 
 
@@ -32,6 +44,18 @@ class DownloadSearchQueryReportUseCase:
         self._task_service.download_search_query_report(period)
 
 
+class DownloadCombinedSearchQueryReportUseCase:
+    """
+    Use Case для загрузки отчетов за неделю, месяц и три месяца
+    в одну строку статистики на день.
+    """
+    def __init__(self, task_service: ITaskService) -> None:
+        self._task_service = task_service
+
+    async def execute(self) -> None:
+        self._task_service.download_combined_search_query_report()
+
+
 class BulkCreateSearchQueriesUseCase:
     def __init__(self, search_query_repository: ISearchQueryRepository) -> None:
         self._search_query_repository = search_query_repository
@@ -77,20 +101,247 @@ class FindSearchQueriesUseCase:
         )
 
 
+class FindSearchQueriesPageUseCase:
+    """
+    Страница поисковых запросов с пагинацией по курсору.
+
+    Курсор содержит режим сортировки, день и ключ (sort_key, id) последнего
+    запроса страницы. Курсор от другого режима сортировки отклоняется
+    с ValueError.
+    """
+    def __init__(self, search_query_repository: ISearchQueryRepository) -> None:
+        self._search_query_repository = search_query_repository
+
+    async def execute(
+        self,
+        search_query_ids: Optional[List[int]] = None,
+        search: Optional[str] = None,
+        search_mode: str = SearchMode.FULLTEXT.value,
+        sort_by: Optional[str] = None,
+        sort_dir: str = 'desc',
+        limit: int = 1000,
+        cursor: Optional[str] = None,
+    ) -> SearchQueryPageEntity:
+        sort_by, target_day = self._parse_sort_by(sort_by)
+        cursor_prefix = [sort_by, sort_dir, target_day.isoformat() if target_day else None]
+
+        page = await self._search_query_repository.list_page(
+            search_query_ids=search_query_ids,
+            search=search,
+            # Неизвестный режим - ValueError, как и неверный курсор
+            search_mode=SearchMode(search_mode),
+            target_day=target_day,
+            sort_by=sort_by,
+            sort_dir=sort_dir,
+            limit=limit,
+            after=self._decode_cursor(cursor, cursor_prefix),
+        )
+
+        return self._encode_cursor(page, cursor_prefix)
+
+    def _parse_sort_by(self, sort_by: Optional[str]) -> Tuple[str, Optional[date]]:
+        if sort_by is not None and sort_by.startswith('day/'):
+            sort_by, date_string = sort_by.split('/')
+            try:
+                return sort_by, dateutil.parser.parse(date_string).date()
+            except Exception:
+                return sort_by, calendarutil.now().date()
+
+        return 'value', None
+
+    def _decode_cursor(self, cursor: Optional[str], cursor_prefix: list) -> Optional[list]:
+        if cursor is None:
+            return None
+
+        key = cursorutil.decode(cursor)
+        if key[:3] != cursor_prefix or len(key) != 5:
+            raise ValueError('Cursor does not match the sort order')
+
+        return key[3:]
+
+    def _encode_cursor(self, page: SearchQueryPageEntity, cursor_prefix: list) -> SearchQueryPageEntity:
+        if page.next_key is not None:
+            page.next_cursor = cursorutil.encode([*cursor_prefix, *page.next_key])
+
+        return page
+
+
+class FindSearchQueriesWithStatisticsUseCase(FindSearchQueriesPageUseCase):
+    """
+    Страница поисковых запросов вместе со статистикой за период,
+    получаемая одним запросом к базе.
+    """
+    async def execute(
+        self,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None,
+        search_query_ids: Optional[List[int]] = None,
+        search: Optional[str] = None,
+        search_mode: str = SearchMode.FULLTEXT.value,
+        sort_by: Optional[str] = None,
+        sort_dir: str = 'desc',
+        limit: int = 1000,
+        cursor: Optional[str] = None,
+        granularity: str = Granularity.DAY.value,
+    ) -> SearchQueryPageEntity:
+        if to_date is None:
+            to_date = calendarutil.now().date()
+
+        if from_date is None:
+            from_date = to_date - relativedelta(days=14)
+
+        sort_by, target_day = self._parse_sort_by(sort_by)
+        cursor_prefix = [sort_by, sort_dir, target_day.isoformat() if target_day else None]
+
+        page = await self._search_query_repository.list_page_with_statistics(
+            from_date=from_date,
+            to_date=to_date,
+            search_query_ids=search_query_ids,
+            search=search,
+            search_mode=SearchMode(search_mode),
+            target_day=target_day,
+            sort_by=sort_by,
+            sort_dir=sort_dir,
+            limit=limit,
+            after=self._decode_cursor(cursor, cursor_prefix),
+            granularity=Granularity(granularity),
+        )
+
+        return self._encode_cursor(page, cursor_prefix)
+
+
 class GetSearchQueryByValueUseCase:
     def __init__(
         self,
         search_query_repository: ISearchQueryRepository,
-        search_query_cache: ISearchQueryCache,
     ) -> None:
         self._search_query_repository = search_query_repository
-        self._search_query_cache = search_query_cache
 
     async def execute(
         self,
         value: str,
     ) -> Optional[SearchQueryEntity]:
-        if search_query := await self._search_query_cache.get_query_by_value(value):
-            return search_query
-
+        # Кэш, отметки отсутствия и фильтр Блума проверяет прокси репозитория
         return await self._search_query_repository.get_query_by_value(value)
+
+
+class GetSearchQueriesByValuesUseCase:
+    def __init__(
+        self,
+        search_query_repository: ISearchQueryRepository,
+    ) -> None:
+        self._search_query_repository = search_query_repository
+
+    async def execute(
+        self,
+        values: Iterable[str],
+    ) -> Dict[str, SearchQueryEntity]:
+        return await self._search_query_repository.get_queries_by_values(values)
+
+
+class LoadSearchQueryIdIndexUseCase:
+    def __init__(
+        self,
+        search_query_repository: ISearchQueryRepository,
+        search_query_id_index: ISearchQueryIdIndex,
+    ) -> None:
+        self._search_query_repository = search_query_repository
+        self._search_query_id_index = search_query_id_index
+
+    async def execute(self, batch_size: int = 10000) -> ISearchQueryIdIndex:
+        batch = []
+        async for item in self._search_query_repository.iter_values(batch_size):
+            batch.append(item)
+
+            if len(batch) >= batch_size:
+                self._search_query_id_index.load_batch(batch)
+                batch = []
+
+        self._search_query_id_index.load_batch(batch)
+        self._search_query_id_index.finish_loading()
+
+        return self._search_query_id_index
+
+
+class RefreshSearchQueryBloomFilterUseCase:
+    """
+    Догружает в фильтр Блума новые запросы.
+
+    Запрос с меньшим id может появиться в базе позже большего (запросы
+    пишут параллельные транзакции), поэтому запросы с id от
+    max_id - id_window читаются повторно: повторное добавление значения
+    фильтр не меняет.
+    """
+    def __init__(
+        self,
+        search_query_repository: ISearchQueryRepository,
+        search_query_bloom_filter: ISearchQueryBloomFilter,
+        id_window: int = 100000,
+    ) -> None:
+        self._search_query_repository = search_query_repository
+        self._search_query_bloom_filter = search_query_bloom_filter
+        self._id_window = id_window
+
+    async def execute(self, batch_size: int = 10000) -> ISearchQueryBloomFilter:
+        bloom_filter = self._search_query_bloom_filter
+
+        min_id = max(bloom_filter.max_id - self._id_window, 0)
+
+        batch = []
+        async for item in self._search_query_repository.iter_values(batch_size, min_id):
+            batch.append(item)
+
+            if len(batch) >= batch_size:
+                # Хеширование пачки не блокирует цикл событий
+                await asyncio.to_thread(bloom_filter.load_values, batch)
+                batch = []
+
+        await asyncio.to_thread(bloom_filter.load_values, batch)
+        bloom_filter.finish_loading()
+
+        return bloom_filter
+
+
+class WarmUpSearchQueryCacheUseCase:
+    """
+    Заполняет кэш запросов всеми запросами из базы. Нужен после смены
+    search_query_cache_backend: новый кэш начинает пустым.
+    """
+    def __init__(
+        self,
+        search_query_repository: ISearchQueryRepository,
+        search_query_cache: ISearchQueryCache,
+    ) -> None:
+        self._search_query_repository = search_query_repository
+        self._search_query_cache = search_query_cache
+
+    async def execute(self, batch_size: int = 10000) -> int:
+        count = 0
+        batch = []
+        async for value, search_query_id in self._search_query_repository.iter_values(batch_size):
+            batch.append(SearchQueryEntity(id=search_query_id, value=value))
+
+            if len(batch) >= batch_size:
+                await self._search_query_cache.save_many(batch)
+                count += len(batch)
+                batch = []
+
+        await self._search_query_cache.save_many(batch)
+
+        return count + len(batch)
+
+
+class GetSearchQueryCacheStatsUseCase:
+    def __init__(self, search_query_cache: ISearchQueryCache) -> None:
+        self._search_query_cache = search_query_cache
+
+    async def execute(self) -> dict:
+        return await self._search_query_cache.get_stats()
+
+
+class RunSearchQueryCacheWarmUpUseCase:
+    def __init__(self, task_service: ITaskService) -> None:
+        self._task_service = task_service
+
+    async def execute(self) -> None:
+        self._task_service.warm_up_search_query_cache()
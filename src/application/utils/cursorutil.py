@@ -0,0 +1,30 @@
+import base64
+import json
+from typing import Any, List
+
+
+def encode(key: List[Any]) -> str:
+    """
+    Return an opaque url-safe cursor for the list of json serializable values.
+    """
+    data = json.dumps(key, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def decode(cursor: str) -> List[Any]:
+    """
+    Return the list of values encoded by encode().
+
+    Raise ValueError if the cursor is malformed.
+    """
+    try:
+        data = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        key = json.loads(data)
+    except (ValueError, TypeError) as exc:
+        raise ValueError('Invalid cursor') from exc
+
+    if not isinstance(key, list):
+        raise ValueError('Invalid cursor')
+
+    return key
@@ -0,0 +1,122 @@
+"""
+Сравнение скорости загрузки статистики в searchquerydailystat:
+INSERT ... ON CONFLICT против COPY через промежуточную таблицу.
+
+Запуск (нужна поднятая база с примененными миграциями):
+    python -m benchmarks.bulk_create_daily_stats --rows 1000000 --chunk-size 1000
+
+Удаляет за собой строки статистики тестовых запросов и сами запросы,
+созданные во время запуска. Другие строки за тот же день не затрагиваются.
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import func
+from sqlalchemy.sql.expression import delete, select
+
+from application.utils import calendarutil
+from containers import Container
+from domain.entities.search_query_entity import SearchQueryEntity
+from infrastructure.repositories.sqlalchemy_constants import (
+    SEARCH_QUERY_DAILY_STATS_TABLE_NAME, SEARCH_QUERY_TABLE_NAME,
+)
+from infrastructure.repositories.sqlalchemy_orm import TableFactory
+
+
+async def prepare_search_queries(container: Container, rows: int, chunk_size: int) -> tuple:
+    """
+    Возвращает id тестовых запросов и id тех из них, что созданы этим
+    запуском: bulk_create возвращает id и для уже существующих значений.
+    """
+    search_query_repository = container.sqlalchemy_search_query_repository()
+    table = TableFactory().create_table(SEARCH_QUERY_TABLE_NAME)
+
+    async with container.sqlalchemy_session()() as session:
+        max_id = (await session.execute(select(func.max(table.c.id)))).scalar() or 0
+
+    search_query_ids = []
+    for offset in range(0, rows, chunk_size):
+        search_queries = [
+            SearchQueryEntity(value=f'benchmark query {i}')
+            for i in range(offset, min(offset + chunk_size, rows))
+        ]
+        await search_query_repository.bulk_create(search_queries)
+        search_query_ids.extend(search_query.id for search_query in search_queries)
+
+    return search_query_ids, [search_query_id for search_query_id in search_query_ids if search_query_id > max_id]
+
+
+async def clear_daily_stats(container: Container, day, search_query_ids: list, chunk_size: int) -> None:
+    table = TableFactory().create_table(SEARCH_QUERY_DAILY_STATS_TABLE_NAME)
+
+    async with container.sqlalchemy_session()() as session:
+        for offset in range(0, len(search_query_ids), chunk_size):
+            await session.execute(
+                delete(table)
+                .where(
+                      (table.c.day == day)
+                    & (table.c.searchquery_id.in_(search_query_ids[offset:offset + chunk_size]))
+                )
+            )
+        await session.commit()
+
+
+async def delete_search_queries(container: Container, search_query_ids: list, chunk_size: int) -> None:
+    table = TableFactory().create_table(SEARCH_QUERY_TABLE_NAME)
+
+    async with container.sqlalchemy_session()() as session:
+        for offset in range(0, len(search_query_ids), chunk_size):
+            await session.execute(
+                delete(table)
+                .where(
+                    (table.c.id.in_(search_query_ids[offset:offset + chunk_size]))
+                )
+            )
+        await session.commit()
+
+
+async def run(repository, search_query_ids: list, day, chunk_size: int) -> float:
+    started_at = time.perf_counter()
+
+    for offset in range(0, len(search_query_ids), chunk_size):
+        await repository.bulk_create([
+            {
+                'day': day,
+                'searchquery_id': search_query_id,
+                'requests_per_week': i,
+            } for i, search_query_id in enumerate(search_query_ids[offset:offset + chunk_size])
+        ])
+
+    return time.perf_counter() - started_at
+
+
+async def main(rows: int, chunk_size: int) -> None:
+    container = Container()
+    day = calendarutil.now().date()
+
+    search_query_ids, created_search_query_ids = await prepare_search_queries(container, rows, chunk_size)
+
+    repositories = {
+        'insert': container.sqlalchemy_search_query_daily_stats_repository(),
+        'copy': container.sqlalchemy_search_query_daily_stats_copy_repository(),
+    }
+    try:
+        for mode, repository in repositories.items():
+            await clear_daily_stats(container, day, search_query_ids, chunk_size)
+
+            elapsed = await run(repository, search_query_ids, day, chunk_size)
+
+            print(f'{mode:>6}: {rows} rows in {elapsed:.2f}s, {rows / elapsed:,.0f} rows/sec')
+    finally:
+        await clear_daily_stats(container, day, search_query_ids, chunk_size)
+        await delete_search_queries(container, created_search_query_ids, chunk_size)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.rows, args.chunk_size))
@@ -0,0 +1,132 @@
+"""
+Стоимость чтения и память на запись MemorySearchQueryCache.
+
+Сравнивает прежнюю реализацию (dataclass CacheObject, проверка срока
+жизни через relativedelta и datetime на каждом чтении, без ограничения
+размера) с текущей: записи со __slots__, time.monotonic, вытеснение lru
+и lfu. Память на запись считается через tracemalloc после заполнения
+кэша, чтения - случайные значения из заполненного кэша.
+
+Запуск:
+    python -m benchmarks.memory_search_query_cache --entries 1000000 --lookups 1000000
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from dateutil.relativedelta import relativedelta
+
+from domain.entities.search_query_entity import SearchQueryEntity
+from infrastructure.caches.memory_search_query_cache import (
+    CACHE_OBJECT_OVERHEAD, MemorySearchQueryCache,
+)
+
+
+@dataclass
+class LegacyCacheObject:
+    created_at: datetime
+    ttl: Optional[int] = None
+    entity: Optional[Any] = None
+
+
+class LegacyMemorySearchQueryCache:
+    """
+    Прежняя реализация MemorySearchQueryCache для сравнения.
+    """
+    def __init__(self):
+        self._query_cache_object_by_id: Dict[int, LegacyCacheObject] = {}
+        self._query_cache_object_by_value: Dict[str, LegacyCacheObject] = {}
+
+    async def get_query_by_value(self, query_value: str) -> Optional[SearchQueryEntity]:
+        cache_object = self._query_cache_object_by_value.get(query_value)
+
+        now = datetime.now(timezone.utc)
+        if (cache_object is not None
+            and cache_object.ttl is not None
+            and cache_object.created_at + relativedelta(seconds=cache_object.ttl) < now
+        ):
+            return None
+
+        return cache_object.entity if cache_object is not None else None
+
+    async def save_many(self, queries, ttl: int = None) -> None:
+        for query in queries:
+            cache_object = LegacyCacheObject(
+                created_at=datetime.now(tz=timezone.utc),
+                entity=query,
+                ttl=ttl,
+            )
+            self._query_cache_object_by_id[query.id] = cache_object
+            self._query_cache_object_by_value[query.value] = cache_object
+
+
+def generate_queries(count: int) -> list:
+    return [
+        SearchQueryEntity(id=i, value=f'поисковый запрос {i} платье')
+        for i in range(1, count + 1)
+    ]
+
+
+async def fill(cache, queries: list, ttl: int) -> None:
+    for i in range(0, len(queries), 1000):
+        await cache.save_many(queries[i:i + 1000], ttl)
+
+
+async def lookup(cache, values: list) -> float:
+    started_at = time.perf_counter()
+    for value in values:
+        await cache.get_query_by_value(value)
+
+    return time.perf_counter() - started_at
+
+
+def measure(name: str, create_cache, queries: list, lookup_values: list, ttl: int) -> None:
+    # Сами значения и сущности создаются заранее и в замер памяти не входят
+    tracemalloc.start()
+    cache = create_cache()
+    asyncio.run(fill(cache, queries, ttl))
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    elapsed = asyncio.run(lookup(cache, lookup_values))
+
+    print(
+        f'{name:>6}: {memory / len(queries):,.0f} bytes/entry, '
+        f'{elapsed / len(lookup_values) * 1e9:,.0f} ns/lookup'
+    )
+
+
+def main(entries: int, lookups: int, ttl: int) -> None:
+    queries = generate_queries(entries)
+
+    random.seed(0)
+    lookup_values = [random.choice(queries).value for _ in range(lookups)]
+
+    value_size = sum(sys.getsizeof(query.value) for query in queries) / entries
+    print(f'value: {value_size:,.0f} bytes, estimate overhead: {CACHE_OBJECT_OVERHEAD} bytes')
+
+    measure('legacy', LegacyMemorySearchQueryCache, queries, lookup_values, ttl)
+    for policy in ('lru', 'lfu'):
+        measure(
+            policy,
+            lambda: MemorySearchQueryCache(max_entries=entries, policy=policy, ttl=ttl),
+            queries,
+            lookup_values,
+            ttl,
+        )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--entries', type=int, default=1_000_000)
+    parser.add_argument('--lookups', type=int, default=1_000_000)
+    parser.add_argument('--ttl', type=int, default=3600)
+    args = parser.parse_args()
+
+    main(args.entries, args.lookups, args.ttl)
@@ -0,0 +1,78 @@
+"""
+Пропускная способность разбора отчета в зависимости от числа процессов.
+
+Генерирует синтетический gzip отчет и прогоняет его через
+ReportIngestPipeline с пустыми этапами resolve и write, так что
+измеряется только чтение, распаковка и разбор CSV.
+
+Запуск:
+    python -m benchmarks.report_parsing --rows 5000000 --processes 1 2 4 8
+
+Число процессов больше числа ядер ничего не говорит о масштабировании,
+такие замеры помечаются в выводе.
+"""
+import argparse
+import asyncio
+import csv
+import gzip
+import os
+import random
+import tempfile
+import time
+
+from infrastructure.tasks.pipeline import ReportIngestPipeline
+
+
+def generate_report(file_path: str, rows: int) -> None:
+    random.seed(0)
+
+    with gzip.open(file_path, mode='wt', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Поисковый запрос', 'Количество запросов'])
+        for i in range(rows):
+            writer.writerow([f'поисковый запрос {i} платье летнее', random.randint(1, 1_000_000)])
+
+
+async def run(file_path: str, processes: int) -> tuple:
+    async def resolve(chunk):
+        return chunk
+
+    async def write(chunk):
+        pass
+
+    pipeline = ReportIngestPipeline(parse_processes=processes)
+
+    started_at = time.perf_counter()
+    with gzip.open(file_path, mode='rt', newline='') as f:
+        stats = await pipeline.run(f, resolve=resolve, write=write)
+
+    elapsed = time.perf_counter() - started_at
+    assert stats.rows_failed == 0
+
+    return elapsed, stats.rows_processed
+
+
+def main(rows: int, processes: list) -> None:
+    with tempfile.TemporaryDirectory() as folder_path:
+        file_path = os.path.join(folder_path, 'report.csv.gz')
+        generate_report(file_path, rows)
+
+        cpu_count = os.cpu_count()
+        print(f'cpu: {cpu_count}')
+
+        elapsed, _ = asyncio.run(run(file_path, 0))
+        print(f'thread: {elapsed:.2f}s, {rows / elapsed:,.0f} rows/sec')
+
+        for n in processes:
+            elapsed, _ = asyncio.run(run(file_path, n))
+            oversubscribed = ' (more processes than cpu)' if n > cpu_count else ''
+            print(f'{n:>6}: {elapsed:.2f}s, {rows / elapsed:,.0f} rows/sec{oversubscribed}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=5_000_000)
+    parser.add_argument('--processes', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    main(args.rows, args.processes)
@@ -0,0 +1,124 @@
+"""
+Время построения и задержка поиска индекса подсказок.
+
+Генерирует синтетические запросы из случайных слов со степенным
+распределением частоты и измеряет p50/p99 поиска по случайным префиксам
+длиной от 0 до 6 символов: отдельно и в цикле событий во время
+перестроения индекса. Перестроение идет либо шагами в том же цикле, как в
+RefreshSearchQuerySuggestIndexUseCase, либо в потоке - тогда в задержку
+входит ожидание GIL, который держит поток перестроения.
+
+Запуск:
+    python -m benchmarks.suggest_index --queries 3000000 --lookups 100000
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from infrastructure.caches.memory_search_query_suggest_index import (
+    MemorySearchQuerySuggestIndex,
+)
+
+ALPHABET = 'абвгдежзийклмнопрстуфхцчшщыэюя'
+
+
+def generate_queries(count: int) -> list:
+    random.seed(0)
+
+    words = [
+        ''.join(random.choices(ALPHABET, k=random.randint(3, 10)))
+        for _ in range(50_000)
+    ]
+
+    values = set()
+    while len(values) < count:
+        values.add(' '.join(random.choices(words, k=random.randint(1, 4))))
+
+    return sorted(values, key=lambda _: random.random())
+
+
+def print_timings(name: str, timings: list) -> None:
+    timings.sort()
+    print(f'{name}: {len(timings):,} lookups', *[
+        f'p{q * 100:g} {timings[int(len(timings) * q) - 1] * 1000:.3f}ms'
+        for q in (0.5, 0.99, 0.999)
+    ], f'max {timings[-1] * 1000:.3f}ms', sep=', ')
+
+
+async def rebuild_in_steps(index: MemorySearchQuerySuggestIndex) -> None:
+    for _ in index.iter_finish_loading():
+        await asyncio.sleep(0)
+
+
+async def lookup_during_rebuild(index: MemorySearchQuerySuggestIndex, prefixes: list, limit: int, mode: str) -> list:
+    if mode == 'thread':
+        rebuild = asyncio.create_task(asyncio.to_thread(index.finish_loading))
+    else:
+        rebuild = asyncio.create_task(rebuild_in_steps(index))
+
+    timings = []
+    i = 0
+    while not rebuild.done():
+        started_at = time.perf_counter()
+        # Переключение задач цикла событий, как между запросами
+        await asyncio.sleep(0)
+        index.suggest(prefixes[i % len(prefixes)], limit)
+        timings.append(time.perf_counter() - started_at)
+        i += 1
+
+    await rebuild
+
+    return timings
+
+
+def main(queries: int, lookups: int, limit: int) -> None:
+    values = generate_queries(queries)
+
+    index = MemorySearchQuerySuggestIndex()
+
+    started_at = time.perf_counter()
+    index.load_values((value, i) for i, value in enumerate(values, 1))
+    index.load_weights((i, int(1_000_000 / i ** 0.8)) for i in random.sample(range(1, queries + 1), queries // 2))
+    index.finish_loading()
+    print(f'build: {time.perf_counter() - started_at:.2f}s, {len(index):,} queries')
+
+    # Повторная загрузка с 1% новых запросов
+    started_at = time.perf_counter()
+    index.load_values((f'{value} новинка', queries + i) for i, value in enumerate(values[:queries // 100], 1))
+    index.finish_loading()
+    print(f'refresh: {time.perf_counter() - started_at:.2f}s, {len(index):,} queries')
+
+    prefixes = [
+        value[:random.randint(0, 6)]
+        for value in random.choices(values, k=lookups)
+    ]
+
+    timings = []
+    for prefix in prefixes:
+        started_at = time.perf_counter()
+        index.suggest(prefix, limit)
+        timings.append(time.perf_counter() - started_at)
+
+    print_timings('idle', timings)
+
+    # Еще 1% новых запросов и новые частоты, поиск идет во время перестроения
+    for n, mode in enumerate(('steps', 'thread'), 2):
+        index.load_values((f'{value} хит {n}', n * queries + i) for i, value in enumerate(values[-(queries // 100):], 1))
+        index.load_weights((i, int(1_000_000 / i ** 0.7)) for i in random.sample(range(1, queries + 1), queries // 2))
+
+        started_at = time.perf_counter()
+        timings = asyncio.run(lookup_during_rebuild(index, prefixes, limit, mode))
+        print(f'refresh in {mode}: {time.perf_counter() - started_at:.2f}s')
+
+        print_timings(f'during refresh in {mode}', timings)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--queries', type=int, default=3_000_000)
+    parser.add_argument('--lookups', type=int, default=100_000)
+    parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args()
+
+    main(args.queries, args.lookups, args.limit)
@@ -24,6 +24,10 @@ class Settings(BaseSettings):
     postgres_user: str
     postgres_password: str
 
+    # Способ загрузки статистики: insert - INSERT ... ON CONFLICT пачками,
+    # copy - COPY в промежуточную UNLOGGED таблицу (только postgresql+asyncpg)
+    search_query_daily_stats_bulk_create_mode: str = 'insert'
+
     redis_driver: str = 'redis'
     redis_host: str = '127.0.0.1'
     redis_port: int = 6379
@@ -31,6 +35,35 @@ class Settings(BaseSettings):
     redis_user: str = ''
     redis_password: str = ''
 
+    # Хранение кэша запросов в Redis: keys - по два ключа на запрос,
+    # hash - поля в фиксированном числе хешей (компактнее на миллионах
+    # запросов). После смены нужен прогрев: POST /api/commands/warm_up_search_query_cache/
+    search_query_cache_backend: str = 'keys'
+    # Хранить в ключах кэша запросов md5 значения (16 байт) вместо текста
+    search_query_cache_hash_keys: bool = True
+    # Число хешей value -> id для backend hash, около 100 запросов на хеш
+    search_query_cache_buckets: int = 65536
+    # Кэш запросов в памяти процесса перед Redis: число записей
+    # (0 - отключен), предел оценки занятой памяти в байтах (0 - без
+    # предела), вытеснение lru или lfu и время жизни записи в секундах
+    search_query_cache_local_capacity: int = 200000
+    search_query_cache_local_max_bytes: int = 0
+    search_query_cache_local_policy: str = 'lru'
+    search_query_cache_local_ttl: int = 60 * 60
+    # Сколько секунд помнить, что значения нет в базе (0 - не помнить).
+    # Загрузка отчета отметки не ставит: она сразу вставляет такие значения
+    search_query_cache_missing_ttl: int = 60
+
+    # Фильтр Блума известных значений в памяти процесса загрузки отчета:
+    # новые значения, которых точно нет, не ищутся ни в Redis, ни в базе.
+    # Догружается перед каждой загрузкой, запросы с id от
+    # max_id - search_query_bloom_filter_id_window перечитываются: параллельная
+    # загрузка могла записать их позже. Размер рассчитан на capacity значений
+    search_query_bloom_filter_enabled: bool = True
+    search_query_bloom_filter_id_window: int = 100000
+    search_query_bloom_filter_capacity: int = 20_000_000
+    search_query_bloom_filter_error_rate: float = 0.01
+
     broker_driver: str = 'amqp'
     broker_username: str
     broker_password: str
@@ -41,6 +74,52 @@ class Settings(BaseSettings):
     wb_authorizev3: str = ''
     wb_wbx_validation_key: str = ''
 
+    # Способ загрузки отчета: file - скачать в /tmp/reports и затем разобрать,
+    # stream - разбирать отчет по мере скачивания
+    report_ingest_mode: str = 'file'
+    # Сохранять ли копию отчета в /tmp/reports в режиме stream
+    report_archive_enabled: bool = True
+
+    # Конвейер загрузки отчета: размер пачки, длина очередей между этапами,
+    # число параллельных resolver и writer, число повторов упавшей пачки
+    report_ingest_chunk_size: int = 1000
+    report_ingest_queue_size: int = 8
+    report_ingest_resolver_concurrency: int = 4
+    report_ingest_writer_concurrency: int = 4
+    report_ingest_max_retries: int = 3
+    # Число процессов для разбора CSV, 0 - разбор в потоке основного процесса.
+    # Ускорение от процессов на многоядерной машине не измерено: перед
+    # включением стоит прогнать benchmarks/report_parsing.py на хосте воркера
+    report_ingest_parse_processes: int = 0
+    # Отмечать загруженные пачки, чтобы перезапуск продолжал с места остановки.
+    # В режиме stream работает только с report_archive_enabled
+    report_ingest_checkpoints_enabled: bool = True
+    # Загружать словарь value -> id перед разбором отчета,
+    # известные запросы тогда разрешаются без обращений к Redis и базе
+    report_ingest_preload_search_queries: bool = True
+    # Итоги по дню: incremental - накапливаются во время загрузки отчета,
+    # rescan - пересчитываются полным проходом по секции дня
+    report_ingest_totals_mode: str = 'incremental'
+    # Уровень gzip для выгрузки статистики через COPY: 1 - быстрее, 9 - меньше
+    export_compress_level: int = 1
+
+    # Кэш ответов GET /api/queries/, сбрасывается загрузкой отчета
+    response_cache_enabled: bool = True
+    response_cache_ttl: int = 24 * 60 * 60
+    # Ответы больше этого размера в байтах не кэшируются
+    response_cache_max_size: int = 16 * 2 ** 20
+
+    # Индекс подсказок GET /api/queries/suggest/ в памяти процесса API,
+    # перестраивается после загрузки отчета (проверка версии данных раз в
+    # suggest_index_refresh_interval секунд)
+    suggest_index_enabled: bool = True
+    suggest_index_refresh_interval: int = 30
+    # Запросы с id от max_id - suggest_index_id_window перечитываются при
+    # каждом обновлении: параллельная загрузка могла записать их позже
+    suggest_index_id_window: int = 100000
+    # Наибольшее число подсказок в ответе, больший limit отклоняется с 400
+    suggest_index_top_size: int = 20
+
     @computed_field
     @property
     def postgres_url(self) -> str:
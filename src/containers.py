@@ -48,27 +48,103 @@ class Container(containers.DeclarativeContainer):
         session=sqlalchemy_session,
     )
 
+    sqlalchemy_search_query_daily_stats_copy_repository = providers.Singleton(
+        SQLAlchemySearchQueryDailyStatsCopyRepository,
+        session=sqlalchemy_session,
+    )
+
+    sqlalchemy_search_query_daily_rank_repository = providers.Singleton(
+        SQLAlchemySearchQueryDailyRankRepository,
+        session=sqlalchemy_session,
+    )
+
+    sqlalchemy_search_query_rollup_repository = providers.Singleton(
+        SQLAlchemySearchQueryRollupRepository,
+        session=sqlalchemy_session,
+    )
+
     sqlalchemy_search_query_total_by_day_repository = providers.Singleton(
         SQLAlchemySearchQueryTotalByDayRepository,
         session=sqlalchemy_session,
     )
 
-    search_query_cache = providers.Singleton(
+    sqlalchemy_report_ingest_checkpoint_repository = providers.Singleton(
+        SQLAlchemyReportIngestCheckpointRepository,
+        session=sqlalchemy_session,
+    )
+
+    redis_search_query_cache = providers.Singleton(
         RedisSearchQueryCache,
         redis_client=redis_client,
+        hash_keys=config.search_query_cache_hash_keys,
+    )
+
+    redis_hash_search_query_cache = providers.Singleton(
+        RedisHashSearchQueryCache,
+        redis_client=redis_client,
+        buckets=config.search_query_cache_buckets,
+    )
+
+    remote_search_query_cache = providers.Selector(
+        config.search_query_cache_backend,
+        keys=redis_search_query_cache,
+        hash=redis_hash_search_query_cache,
+    )
+
+    local_search_query_cache = providers.Singleton(
+        MemorySearchQueryCache,
+        max_entries=config.search_query_cache_local_capacity,
+        max_bytes=config.search_query_cache_local_max_bytes,
+        policy=config.search_query_cache_local_policy,
+        ttl=config.search_query_cache_local_ttl,
+    )
+
+    search_query_cache = providers.Singleton(
+        TwoTierSearchQueryCache,
+        local_cache=local_search_query_cache,
+        remote_cache=remote_search_query_cache,
+    )
+
+    response_cache = providers.Singleton(
+        RedisResponseCache,
+        redis_client=redis_client,
+        max_size=config.response_cache_max_size,
+    )
+
+    search_query_suggest_index = providers.Singleton(
+        MemorySearchQuerySuggestIndex,
+        top_size=config.suggest_index_top_size,
+    )
+
+    search_query_bloom_filter = providers.Singleton(
+        MemorySearchQueryBloomFilter,
+        capacity=config.search_query_bloom_filter_capacity,
+        error_rate=config.search_query_bloom_filter_error_rate,
     )
 
     search_query_repository = providers.Singleton(
         SearchQueryRepositoryCacheProxy,
         search_query_repository=sqlalchemy_search_query_repository,
         search_query_cache=search_query_cache,
+        search_query_bloom_filter=search_query_bloom_filter,
+        missing_ttl=config.search_query_cache_missing_ttl,
     )
 
-    search_query_daily_stats_repository = sqlalchemy_search_query_daily_stats_repository
+    search_query_daily_stats_repository = providers.Selector(
+        config.search_query_daily_stats_bulk_create_mode,
+        insert=sqlalchemy_search_query_daily_stats_repository,
+        copy=sqlalchemy_search_query_daily_stats_copy_repository,
+    )
+
+    search_query_daily_rank_repository = sqlalchemy_search_query_daily_rank_repository
+
+    search_query_rollup_repository = sqlalchemy_search_query_rollup_repository
 
     search_query_total_by_day_repository = sqlalchemy_search_query_total_by_day_repository
     search_query_total_number_per_day_repository = search_query_total_by_day_repository # 00000000
 
+    report_ingest_checkpoint_repository = sqlalchemy_report_ingest_checkpoint_repository
+
     task_factory = providers.Singleton(
         CeleryTaskFactory,
     )
@@ -78,6 +154,16 @@ class Container(containers.DeclarativeContainer):
         task_factory=task_factory,
     )
 
+    report_ingest_pipeline = providers.Factory(
+        ReportIngestPipeline,
+        chunk_size=config.report_ingest_chunk_size,
+        queue_size=config.report_ingest_queue_size,
+        resolver_concurrency=config.report_ingest_resolver_concurrency,
+        writer_concurrency=config.report_ingest_writer_concurrency,
+        max_retries=config.report_ingest_max_retries,
+        parse_processes=config.report_ingest_parse_processes,
+    )
+
     search_query_report_gateway = providers.Singleton(
         WildberriesSearchQueryReportGateway,
         authorizev3=config.wb_authorizev3,
@@ -93,6 +179,11 @@ class Container(containers.DeclarativeContainer):
         task_service=task_service,
     )
 
+    download_combined_search_query_report_use_case = providers.Factory(
+        DownloadCombinedSearchQueryReportUseCase,
+        task_service=task_service,
+    )
+
     bulk_create_search_queries_use_case = providers.Factory(
         BulkCreateSearchQueriesUseCase,
         search_query_repository=search_query_repository,
@@ -101,7 +192,50 @@ class Container(containers.DeclarativeContainer):
     get_search_query_by_value_use_case = providers.Factory(
         GetSearchQueryByValueUseCase,
         search_query_repository=search_query_repository,
-        search_query_cache=search_query_cache,
+    )
+
+    get_search_queries_by_values_use_case = providers.Factory(
+        GetSearchQueriesByValuesUseCase,
+        search_query_repository=search_query_repository,
+    )
+
+    load_search_query_id_index_use_case = providers.Factory(
+        LoadSearchQueryIdIndexUseCase,
+        search_query_repository=search_query_repository,
+        search_query_id_index=providers.Factory(MemorySearchQueryIdIndex),
+    )
+
+    suggest_search_queries_use_case = providers.Factory(
+        SuggestSearchQueriesUseCase,
+        search_query_suggest_index=search_query_suggest_index,
+    )
+
+    refresh_search_query_suggest_index_use_case = providers.Factory(
+        RefreshSearchQuerySuggestIndexUseCase,
+        search_query_repository=search_query_repository,
+        search_query_daily_rank_repository=search_query_daily_rank_repository,
+        search_query_suggest_index=search_query_suggest_index,
+        id_window=config.suggest_index_id_window,
+    )
+
+    warm_up_search_query_cache_use_case = providers.Factory(
+        WarmUpSearchQueryCacheUseCase,
+        search_query_repository=sqlalchemy_search_query_repository,
+        # Прогрев заполняет общий кэш в Redis мимо локального уровня: тот
+        # ограничен и заполняется при чтении в процессе загрузки отчета
+        search_query_cache=remote_search_query_cache,
+    )
+
+    run_search_query_cache_warm_up_use_case = providers.Factory(
+        RunSearchQueryCacheWarmUpUseCase,
+        task_service=task_service,
+    )
+
+    refresh_search_query_bloom_filter_use_case = providers.Factory(
+        RefreshSearchQueryBloomFilterUseCase,
+        search_query_repository=sqlalchemy_search_query_repository,
+        search_query_bloom_filter=search_query_bloom_filter,
+        id_window=config.search_query_bloom_filter_id_window,
     )
 
     find_search_queies_use_case = providers.Factory(
@@ -109,6 +243,16 @@ class Container(containers.DeclarativeContainer):
         search_query_repository=search_query_repository,
     )
 
+    find_search_queries_page_use_case = providers.Factory(
+        FindSearchQueriesPageUseCase,
+        search_query_repository=search_query_repository,
+    )
+
+    find_search_queries_with_statistics_use_case = providers.Factory(
+        FindSearchQueriesWithStatisticsUseCase,
+        search_query_repository=search_query_repository,
+    )
+
     find_search_query_daily_stats_use_case = providers.Factory(
         FindSearchQueryDailyStatsUseCase,
         search_query_daily_stats_repository
@@ -120,11 +264,41 @@ class Container(containers.DeclarativeContainer):
     )
 
     # Возможно не использовать вложенные use case
+    resolve_search_query_daily_stats_use_case = providers.Factory(
+        ResolveSearchQueryDailyStatsUseCase,
+        get_search_queries_by_values_use_case=get_search_queries_by_values_use_case,
+        bulk_create_search_queries_use_case=bulk_create_search_queries_use_case,
+    )
+
     bulk_create_search_query_daily_stats_use_case = providers.Factory(
         BulkCreateSearchQueryDailyStatsUseCase,
         search_query_daily_stats_repository=search_query_daily_stats_repository,
-        get_search_query_by_value_use_case=get_search_query_by_value_use_case,
-        bulk_create_search_queries_use_case=bulk_create_search_queries_use_case,
+    )
+
+    stage_search_query_daily_stats_use_case = providers.Factory(
+        StageSearchQueryDailyStatsUseCase,
+        search_query_daily_stats_repository=search_query_daily_stats_repository,
+    )
+
+    merge_staged_search_query_daily_stats_use_case = providers.Factory(
+        MergeStagedSearchQueryDailyStatsUseCase,
+        search_query_daily_stats_repository=search_query_daily_stats_repository,
+    )
+
+    delete_staged_search_query_daily_stats_use_case = providers.Factory(
+        DeleteStagedSearchQueryDailyStatsUseCase,
+        search_query_daily_stats_repository=search_query_daily_stats_repository,
+    )
+
+    export_search_query_daily_stats_use_case = providers.Factory(
+        ExportSearchQueryDailyStatsUseCase,
+        search_query_daily_stats_repository=search_query_daily_stats_repository,
+    )
+
+    archive_search_query_daily_stats_use_case = providers.Factory(
+        ArchiveSearchQueryDailyStatsUseCase,
+        search_query_daily_stats_repository=search_query_daily_stats_repository,
+        compress_level=config.export_compress_level,
     )
 
     calculate_total_requests_per_day_use_case = providers.Factory(
@@ -132,6 +306,76 @@ class Container(containers.DeclarativeContainer):
         search_query_total_number_per_day_repository,
     )
 
+    save_total_requests_per_day_use_case = providers.Factory(
+        SaveTotalRequestsPerDayUseCase,
+        search_query_total_by_day_repository=search_query_total_by_day_repository,
+    )
+
+    calculate_search_query_ranks_use_case = providers.Factory(
+        CalculateSearchQueryRanksUseCase,
+        search_query_daily_rank_repository=search_query_daily_rank_repository,
+    )
+
+    calculate_search_query_rollups_use_case = providers.Factory(
+        CalculateSearchQueryRollupsUseCase,
+        search_query_rollup_repository=search_query_rollup_repository,
+    )
+
+    bump_data_version_use_case = providers.Factory(
+        BumpDataVersionUseCase,
+        response_cache=response_cache,
+    )
+
+    get_data_version_use_case = providers.Factory(
+        GetDataVersionUseCase,
+        response_cache=response_cache,
+    )
+
+    get_search_query_cache_stats_use_case = providers.Factory(
+        GetSearchQueryCacheStatsUseCase,
+        search_query_cache=search_query_cache,
+    )
+
+    get_response_cache_stats_use_case = providers.Factory(
+        GetResponseCacheStatsUseCase,
+        response_cache=response_cache,
+    )
+
+    run_search_query_ranks_calculation_use_case = providers.Factory(
+        RunSearchQueryRanksCalculationUseCase,
+        task_service=task_service,
+    )
+
+    run_search_query_rollups_calculation_use_case = providers.Factory(
+        RunSearchQueryRollupsCalculationUseCase,
+        task_service=task_service,
+    )
+
+    run_search_query_daily_stats_archive_use_case = providers.Factory(
+        RunSearchQueryDailyStatsArchiveUseCase,
+        task_service=task_service,
+    )
+
+    get_committed_report_chunks_use_case = providers.Factory(
+        GetCommittedReportChunksUseCase,
+        report_ingest_checkpoint_repository=report_ingest_checkpoint_repository,
+    )
+
+    commit_report_chunk_use_case = providers.Factory(
+        CommitReportChunkUseCase,
+        report_ingest_checkpoint_repository=report_ingest_checkpoint_repository,
+    )
+
+    find_report_ingest_checkpoints_use_case = providers.Factory(
+        FindReportIngestCheckpointsUseCase,
+        report_ingest_checkpoint_repository=report_ingest_checkpoint_repository,
+    )
+
+    reset_report_ingest_checkpoints_use_case = providers.Factory(
+        ResetReportIngestCheckpointsUseCase,
+        report_ingest_checkpoint_repository=report_ingest_checkpoint_repository,
+    )
+
 
 class ContainerAlembic(containers.DeclarativeContainer):
     settings = Settings()
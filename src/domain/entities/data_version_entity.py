@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Optional
+
+
+@dataclass(kw_only=True)
+class DataVersionEntity:
+    version: int = 0
+    # День последней завершенной загрузки отчета
+    day: Optional[date] = None
+    # Время последнего увеличения версии (UTC, с точностью до секунды)
+    updated_at: Optional[datetime] = None
@@ -0,0 +1,26 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import Iterable, Optional
+
+
+@dataclass(kw_only=True)
+class RequestsTotalByDayEntity:
+    day: date
+    total_requests_per_week: int = 0
+    queries_count: int = 0
+    min_requests_per_week: Optional[int] = None
+    max_requests_per_week: Optional[int] = None
+
+    def add(self, requests_per_week: Iterable[int]) -> None:
+        for value in requests_per_week:
+            # Запрос без недельной частоты в итоги не входит
+            if value <= 0:
+                continue
+
+            self.total_requests_per_week += value
+            self.queries_count += 1
+
+            if self.min_requests_per_week is None or value < self.min_requests_per_week:
+                self.min_requests_per_week = value
+            if self.max_requests_per_week is None or value > self.max_requests_per_week:
+                self.max_requests_per_week = value
@@ -9,4 +9,6 @@ class SearchQueryDailyStatsEntity:
     day: date
     value: str
     requests_per_week: Optional[int] = None
+    requests_per_month: Optional[int] = None
+    requests_per_three_months: Optional[int] = None
     searchquery_id: int
@@ -0,0 +1,13 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from domain.entities.search_query_entity import SearchQueryEntity
+
+
+@dataclass(kw_only=True)
+class SearchQueryPageEntity:
+    items: List[SearchQueryEntity] = field(default_factory=list)
+    # Ключ сортировки последнего элемента, None - страниц больше нет
+    next_key: Optional[list] = None
+    # Непрозрачный курсор следующей страницы для клиента
+    next_cursor: Optional[str] = None
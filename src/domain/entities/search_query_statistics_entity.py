@@ -0,0 +1,39 @@
+from dataclasses import dataclass, field
+from datetime import date
+from typing import List, Optional
+
+from domain.entities.search_query_daily_stats_entity import (
+    SearchQueryDailyStatsEntity,
+)
+from domain.entities.search_query_entity import SearchQueryEntity
+
+
+@dataclass(kw_only=True)
+class SearchQueryStatisticsEntity(SearchQueryEntity):
+    # Место запроса за день сортировки и его изменение к предыдущему дню
+    rank: Optional[int] = None
+    rank_delta: Optional[int] = None
+    # Статистика хранится параллельными массивами по дням, как ее отдает
+    # база, без отдельного объекта на каждую точку
+    days: List[date] = field(default_factory=list)
+    requests_per_week: List[Optional[int]] = field(default_factory=list)
+    requests_per_month: List[Optional[int]] = field(default_factory=list)
+    requests_per_three_months: List[Optional[int]] = field(default_factory=list)
+
+    @property
+    def statistics(self) -> List[SearchQueryDailyStatsEntity]:
+        return [
+            SearchQueryDailyStatsEntity(
+                day=day,
+                value=self.value,
+                requests_per_week=requests_per_week,
+                requests_per_month=requests_per_month,
+                requests_per_three_months=requests_per_three_months,
+                searchquery_id=self.id,
+            ) for day, requests_per_week, requests_per_month, requests_per_three_months in zip(
+                self.days,
+                self.requests_per_week,
+                self.requests_per_month,
+                self.requests_per_three_months,
+            )
+        ]
@@ -0,0 +1,9 @@
+from dataclasses import dataclass
+
+
+@dataclass(kw_only=True)
+class SearchQuerySuggestionEntity:
+    id: int
+    value: str
+    # Частота за неделю в последнем загруженном дне, 0 - запроса в нем не было
+    requests_per_week: int = 0
@@ -0,0 +1,32 @@
+from datetime import date, timedelta
+from enum import Enum
+
+from dateutil.relativedelta import relativedelta
+
+
+class Granularity(Enum):
+    DAY = 'day'
+    WEEK = 'week'
+    MONTH = 'month'
+
+    def truncate(self, day: date) -> date:
+        """
+        Первый день периода, в который попадает day (как date_trunc в PostgreSQL).
+        """
+        if self == Granularity.WEEK:
+            return day - timedelta(days=day.weekday())
+        if self == Granularity.MONTH:
+            return day.replace(day=1)
+
+        return day
+
+    def end(self, day: date) -> date:
+        """
+        Последний день периода, в который попадает day.
+        """
+        if self == Granularity.WEEK:
+            return self.truncate(day) + timedelta(days=6)
+        if self == Granularity.MONTH:
+            return self.truncate(day) + relativedelta(months=1, days=-1)
+
+        return day
@@ -5,3 +5,14 @@ class ReportPeriod(Enum):
     ONE_WEEK = 'week'
     ONE_MONTH = 'month'
     THREE_MONTHS = '3month'
+
+    @property
+    def requests_field(self) -> str:
+        """
+        Поле статистики, в которое записывается число запросов за период.
+        """
+        return {
+            ReportPeriod.ONE_WEEK: 'requests_per_week',
+            ReportPeriod.ONE_MONTH: 'requests_per_month',
+            ReportPeriod.THREE_MONTHS: 'requests_per_three_months',
+        }[self]
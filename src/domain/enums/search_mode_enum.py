@@ -0,0 +1,10 @@
+from enum import Enum
+
+
+class SearchMode(Enum):
+    # Полнотекстовый поиск по searchquery.doc (словоформы, russian и english)
+    FULLTEXT = 'fulltext'
+    # Вхождение подстроки в value без учета регистра, индекс pg_trgm
+    SUBSTRING = 'substring'
+    # Нечеткое совпадение value по триграммам (оператор %), индекс pg_trgm
+    SIMILARITY = 'similarity'
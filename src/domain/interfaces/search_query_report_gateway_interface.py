@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Iterator
 
 from domain.enums.report_period_enum import ReportPeriod
 
@@ -7,3 +8,7 @@ class ISearchQueryReportGateway(ABC):
     @abstractmethod
     def download_report(self, period: ReportPeriod = ReportPeriod.ONE_WEEK):
         pass
+
+    @abstractmethod
+    def stream_report(self, period: ReportPeriod = ReportPeriod.ONE_WEEK) -> Iterator[bytes]:
+        pass
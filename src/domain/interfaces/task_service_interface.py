@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from datetime import date
+from typing import List
 
 from domain.enums.report_period_enum import ReportPeriod
 
@@ -9,6 +10,10 @@ class ITaskService(ABC):
     def download_search_query_report(self, period: ReportPeriod = ReportPeriod.ONE_WEEK) -> None:
         ...
 
+    @abstractmethod
+    def download_combined_search_query_report(self) -> None:
+        ...
+
     @abstractmethod
     def fetch_search_queries(self, report_file_path: str) -> None:
         ...
@@ -16,3 +21,19 @@ class ITaskService(ABC):
     @abstractmethod
     def calculate_total_requests_per_day(self, day: date) -> None:
         ...
+
+    @abstractmethod
+    def calculate_search_query_ranks(self, day: date) -> None:
+        ...
+
+    @abstractmethod
+    def calculate_search_query_rollups(self, days: List[date]) -> None:
+        ...
+
+    @abstractmethod
+    def warm_up_search_query_cache(self) -> None:
+        ...
+
+    @abstractmethod
+    def archive_search_query_daily_stats(self, days: List[date]) -> None:
+        ...
@@ -1,2 +1,8 @@
+from .memory_search_query_bloom_filter import MemorySearchQueryBloomFilter
 from .memory_search_query_cache import MemorySearchQueryCache
+from .memory_search_query_id_index import MemorySearchQueryIdIndex
+from .memory_search_query_suggest_index import MemorySearchQuerySuggestIndex
+from .redis_hash_search_query_cache import RedisHashSearchQueryCache
 from .redis_search_query_cache import RedisSearchQueryCache
+from .redis_response_cache import RedisResponseCache
+from .two_tier_search_query_cache import TwoTierSearchQueryCache
@@ -0,0 +1,98 @@
+import hashlib
+import math
+import threading
+from typing import Iterable, Optional, Tuple
+
+from application.interfaces.search_query_bloom_filter_interface import (
+    ISearchQueryBloomFilter,
+)
+
+HASH_MASK = 2 ** 64 - 1
+
+
+class MemorySearchQueryBloomFilter(ISearchQueryBloomFilter):
+    """
+    Фильтр Блума известных значений запросов в памяти процесса.
+
+    Размер и число хешей рассчитаны на capacity значений с долей ложных
+    срабатываний error_rate: 20 млн значений при 1% занимают около 23 МБ.
+    Позиции битов - двойное хеширование двух половин md5 значения.
+
+    Значения не удаляются, поэтому фильтр догружается новыми запросами, а
+    не строится заново. Повторное добавление значения ничего не меняет,
+    len считает только значения, добавившие хотя бы один бит (на долю
+    ложных срабатываний меньше числа значений). Пока загрузка не
+    завершена, might_contain отвечает True: неполный фильтр не должен
+    отсекать существующие значения.
+    """
+    def __init__(self, capacity: int = 20_000_000, error_rate: float = 0.01) -> None:
+        self._bits_count = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self._hashes_count = max(1, round(self._bits_count / capacity * math.log(2)))
+        # Память выделяется при первой загрузке
+        self._bits: Optional[bytearray] = None
+        self._max_id = 0
+        self._count = 0
+        self._is_ready = False
+        # Загрузка идет в потоке, добавление из bulk_create - в цикле событий
+        self._lock = threading.Lock()
+
+    @property
+    def max_id(self) -> int:
+        return self._max_id
+
+    @property
+    def is_ready(self) -> bool:
+        return self._is_ready
+
+    def load_values(self, items: Iterable[Tuple[str, int]]) -> None:
+        with self._lock:
+            for value, search_query_id in items:
+                self._add(value)
+                self._max_id = max(self._max_id, search_query_id)
+
+    def finish_loading(self) -> None:
+        self._is_ready = True
+
+    def add_many(self, values: Iterable[str]) -> None:
+        # Без начатой загрузки добавлять некуда: загрузка прочитает их из базы
+        if self._bits is None:
+            return
+
+        with self._lock:
+            for value in values:
+                self._add(value)
+
+    def might_contain(self, value: str) -> bool:
+        if not self._is_ready:
+            return True
+
+        bits = self._bits
+        for position in self._get_positions(value):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+
+        return True
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _add(self, value: str) -> None:
+        if self._bits is None:
+            self._bits = bytearray((self._bits_count + 7) // 8)
+
+        bits = self._bits
+        is_new = False
+        for position in self._get_positions(value):
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                is_new = True
+
+        self._count += is_new
+
+    def _get_positions(self, value: str) -> Iterable[int]:
+        digest = int.from_bytes(hashlib.md5(value.encode('UTF-8')).digest(), 'little')
+        h1, h2 = digest & HASH_MASK, (digest >> 64) | 1
+
+        bits_count = self._bits_count
+        return [(h1 + i * h2) % bits_count for i in range(self._hashes_count)]
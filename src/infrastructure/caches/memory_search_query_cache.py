@@ -1,77 +1,308 @@
-from dataclasses import dataclass
-from datetime import datetime, timezone
-from typing import Any, Dict, Optional
-
-from dateutil.relativedelta import relativedelta
+import sys
+import time
+from collections import OrderedDict
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 from application.interfaces.search_query_cache_interface import (
     ISearchQueryCache,
 )
-from application.utils import calendarutil
 from domain.entities.search_query_entity import SearchQueryEntity
 
+EVICTION_POLICIES = ('lru', 'lfu')
 
-@dataclass
-class CacheObject:
-    created_at: datetime
-    ttl: Optional[int] = None
-    entity: Optional[Any] = None
+# Оценка памяти записи без текста запроса: CacheObject, SearchQueryEntity
+# с id и ячейки двух словарей (см. benchmarks/memory_search_query_cache.py)
+CACHE_OBJECT_OVERHEAD = 300
 
 
-def check_ttl(func):
-    def wrapper(*args, **kwargs):
-        cache_object = func(*args, **kwargs)
+class CacheObject:
+    __slots__ = ('entity', 'expires_at', 'hits')
 
-        now = calendarutil.now()
-        if (cache_object is not None
-            and cache_object.ttl is not None
-            and cache_object.created_at + relativedelta(seconds=cache_object.ttl) < now
-        ):
-            return None
+    def __init__(self, entity: SearchQueryEntity, expires_at: float) -> None:
+        self.entity = entity
+        self.expires_at = expires_at
+        self.hits = 1
 
-        return cache_object
 
-    return wrapper
+def get_size(entity: SearchQueryEntity) -> int:
+    return sys.getsizeof(entity.value) + CACHE_OBJECT_OVERHEAD
 
 
 class MemorySearchQueryCache(ISearchQueryCache):
-    _query_cache_object_by_id: Dict[int, CacheObject]
-    _query_cache_object_by_value: Dict[str, CacheObject]
+    """
+    Кэш поисковых запросов в памяти процесса.
 
-    def __init__(self):
-        self._query_cache_object_by_id = {}
-        self._query_cache_object_by_value = {}
+    Размер ограничен числом записей max_entries и/или оценкой занятой памяти
+    max_bytes, лишние записи вытесняются по policy: lru - давно не
+    читавшиеся, lfu - реже всего читавшиеся (из равных - давнее).
+
+    Срок жизни считается по time.monotonic и не зависит от перевода часов.
+    Просроченная запись удаляется при чтении. Каждая запись в кэш, кроме
+    того, проверяет не больше sweep_size записей из начала очереди
+    вытеснения (давно не читавшиеся для lru, давно сохраненные для lfu) и
+    столько же самых давних отметок отсутствия, поэтому ее стоимость не
+    зависит от размера кэша.
+
+    Отметки отсутствия значений хранятся отдельно от записей, их тоже не
+    больше max_entries, лишние вытесняются от давних к новым.
+    """
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        policy: str = 'lru',
+        ttl: Optional[int] = None,
+        sweep_size: int = 64,
+    ) -> None:
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f'Unknown eviction policy: {policy}')
+
+        self._max_entries = max_entries
+        # 0 - без предела, как и None
+        self._max_bytes = max_bytes or None
+        self._policy = policy
+        self._ttl = ttl
+        self._sweep_size = sweep_size
+        # Порядок записей - порядок вытеснения для lru
+        self._query_cache_object_by_value: OrderedDict[str, CacheObject] = OrderedDict()
+        self._query_cache_object_by_id: Dict[int, CacheObject] = {}
+        # Для lfu: значения по числу чтений, внутри - от давних к новым
+        self._values_by_hits: Dict[int, OrderedDict[str, None]] = {}
+        # Срок жизни отметок отсутствия по значению, от давних к новым
+        self._missing_values: Dict[str, float] = {}
+        self._min_hits = 1
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
 
     async def get_query_by_id(self, query_id: int) -> Optional[SearchQueryEntity]:
-        if query_cache_object := self._get_query_cache_object_by_id(query_id):
-            return query_cache_object.entity
+        cache_object = self._query_cache_object_by_id.get(query_id)
+        if cache_object is None:
+            return None
+
+        return self._get_entity(cache_object)
+
+    async def get_query_by_value(self, query_value: str) -> Optional[SearchQueryEntity]:
+        cache_object = self._query_cache_object_by_value.get(query_value)
+        if cache_object is None:
+            self._misses += 1
+            return None
+
+        entity = self._get_entity(cache_object)
+        if entity is None:
+            self._misses += 1
+            return None
+
+        self._hits += 1
+
+        return entity
+
+    async def get_queries_by_values(self, query_values: Iterable[str]) -> Dict[str, SearchQueryEntity]:
+        get_cache_object = self._query_cache_object_by_value.get
 
-        return None
+        result = {}
+        for query_value in query_values:
+            cache_object = get_cache_object(query_value)
+            if cache_object is not None and (entity := self._get_entity(cache_object)) is not None:
+                result[query_value] = entity
+            else:
+                self._misses += 1
 
-    async def get_query_by_value(self, query_value: int) -> Optional[SearchQueryEntity]:
-        if query_cache_object := self._get_query_cache_object_by_value(query_value):
-            return query_cache_object.entity
+        self._hits += len(result)
 
-        return None
+        return result
 
     async def save_search_query(self, query: SearchQueryEntity, ttl: int = None) -> None:
-        if query is None:
+        await self.save_many([query], ttl)
+
+    async def save_many(self, queries: List[SearchQueryEntity], ttl: int = None) -> None:
+        if self._max_entries == 0:
             return
- 
-        cache_object = CacheObject(
-            created_at=datetime.now(tz=timezone.utc),
-            entity=query,
-            ttl=ttl,
+
+        self.sweep(self._sweep_size)
+
+        now = time.monotonic()
+
+        if ttl is None:
+            ttl = self._ttl
+        expires_at = now + ttl if ttl is not None else float('inf')
+
+        for query in queries:
+            if query is None:
+                continue
+
+            self._remove(query.value)
+            self._missing_values.pop(query.value, None)
+
+            # Старая запись с тем же id указывает на другое значение
+            if (cache_object := self._query_cache_object_by_id.get(query.id)) is not None:
+                self._remove(cache_object.entity.value)
+
+            cache_object = CacheObject(entity=query, expires_at=expires_at)
+            self._query_cache_object_by_value[query.value] = cache_object
+            self._query_cache_object_by_id[query.id] = cache_object
+            self._size += get_size(query)
+
+            if self._policy == 'lfu':
+                self._values_by_hits.setdefault(1, OrderedDict())[query.value] = None
+                self._min_hits = 1
+
+        self._evict()
+
+    async def get_missing_values(self, query_values: Iterable[str]) -> Set[str]:
+        now = time.monotonic()
+
+        result = set()
+        for query_value in query_values:
+            expires_at = self._missing_values.get(query_value)
+            if expires_at is None:
+                continue
+
+            if expires_at <= now:
+                del self._missing_values[query_value]
+            else:
+                result.add(query_value)
+
+        return result
+
+    async def get_queries_and_missing_values(
+        self,
+        query_values: Iterable[str],
+    ) -> Tuple[Dict[str, SearchQueryEntity], Set[str]]:
+        query_values = list(query_values)
+
+        result = await self.get_queries_by_values(query_values)
+
+        return result, await self.get_missing_values(
+            query_value for query_value in query_values if query_value not in result
         )
-        # Сохраняем ссылку на CacheObject в _query_cache_object_by_id
-        self._query_cache_object_by_id[query.id] = cache_object
-        # Сохраняем ссылку на CacheObject в _query_cache_object_by_value
-        self._query_cache_object_by_value[query.value] = cache_object
-
-    @check_ttl
-    def _get_query_cache_object_by_id(self, query_id: int) -> Optional[CacheObject]:
-        return self._query_cache_object_by_id.get(query_id)
-
-    @check_ttl
-    def _get_query_cache_object_by_value(self, query_value: int) -> Optional[CacheObject]:
-        return self._query_cache_object_by_value.get(query_value)
+
+    async def save_missing_values(self, query_values: List[str], ttl: int) -> None:
+        if self._max_entries == 0:
+            return
+
+        expires_at = time.monotonic() + ttl
+        for query_value in query_values:
+            # Повторная отметка переносится в конец очереди вытеснения
+            self._missing_values.pop(query_value, None)
+            self._missing_values[query_value] = expires_at
+
+        if self._max_entries is not None:
+            while len(self._missing_values) > self._max_entries:
+                del self._missing_values[next(iter(self._missing_values))]
+
+    async def get_stats(self) -> dict:
+        return {
+            'size': len(self),
+            'missing_values': len(self._missing_values),
+            'bytes': self._size,
+            'max_entries': self._max_entries,
+            'max_bytes': self._max_bytes,
+            'policy': self._policy,
+            'hits': self._hits,
+            'misses': self._misses,
+            'hit_ratio': self._hits / (self._hits + self._misses) if self._hits + self._misses else None,
+            'evictions': self._evictions,
+            'expirations': self._expirations,
+        }
+
+    def invalidate(self, query_values: Iterable[str]) -> None:
+        for query_value in query_values:
+            self._remove(query_value)
+            self._missing_values.pop(query_value, None)
+
+    def sweep(self, limit: Optional[int] = None) -> int:
+        """
+        Удаляет просроченные записи среди первых limit записей очереди
+        вытеснения (None - среди всех) и просроченные отметки отсутствия
+        от самых давних, не больше limit. Возвращает число удаленных записей.
+        """
+        now = time.monotonic()
+
+        expired_values = [
+            query_value
+            for query_value, cache_object in islice(self._query_cache_object_by_value.items(), limit)
+            if cache_object.expires_at <= now
+        ]
+        for query_value in expired_values:
+            self._remove(query_value)
+
+        self._expirations += len(expired_values)
+
+        # Отметки идут в порядке сохранения с одним сроком жизни, поэтому
+        # проход останавливается на первой действующей
+        for query_value, expires_at in list(islice(self._missing_values.items(), limit)):
+            if expires_at > now:
+                break
+
+            del self._missing_values[query_value]
+
+        return len(expired_values)
+
+    def __len__(self) -> int:
+        return len(self._query_cache_object_by_value)
+
+    def _get_entity(self, cache_object: CacheObject) -> Optional[SearchQueryEntity]:
+        entity = cache_object.entity
+
+        if cache_object.expires_at <= time.monotonic():
+            self._remove(entity.value)
+            self._expirations += 1
+            return None
+
+        if self._policy == 'lru':
+            self._query_cache_object_by_value.move_to_end(entity.value)
+        else:
+            self._touch_lfu(cache_object)
+
+        return entity
+
+    def _touch_lfu(self, cache_object: CacheObject) -> None:
+        query_value = cache_object.entity.value
+
+        values = self._values_by_hits[cache_object.hits]
+        del values[query_value]
+        if not values:
+            del self._values_by_hits[cache_object.hits]
+            if self._min_hits == cache_object.hits:
+                self._min_hits += 1
+
+        cache_object.hits += 1
+        self._values_by_hits.setdefault(cache_object.hits, OrderedDict())[query_value] = None
+
+    def _remove(self, query_value: str) -> None:
+        cache_object = self._query_cache_object_by_value.pop(query_value, None)
+        if cache_object is None:
+            return
+
+        if self._query_cache_object_by_id.get(cache_object.entity.id) is cache_object:
+            del self._query_cache_object_by_id[cache_object.entity.id]
+
+        self._size -= get_size(cache_object.entity)
+
+        if self._policy == 'lfu':
+            values = self._values_by_hits[cache_object.hits]
+            del values[query_value]
+            if not values:
+                del self._values_by_hits[cache_object.hits]
+
+    def _evict(self) -> None:
+        while self._query_cache_object_by_value and (
+               (self._max_entries is not None and len(self) > self._max_entries)
+            or (self._max_bytes is not None and self._size > self._max_bytes)
+        ):
+            self._remove(self._get_victim())
+            self._evictions += 1
+
+    def _get_victim(self) -> str:
+        if self._policy == 'lru':
+            return next(iter(self._query_cache_object_by_value))
+
+        # После удалений наименьшее число чтений могло устареть
+        if self._min_hits not in self._values_by_hits:
+            self._min_hits = min(self._values_by_hits)
+
+        return next(iter(self._values_by_hits[self._min_hits]))
@@ -0,0 +1,128 @@
+import hashlib
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, Set, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from application.interfaces.search_query_id_index_interface import (
+    ISearchQueryIdIndex,
+)
+
+
+def to_arrow(values: array, type: pa.DataType) -> pa.Array:
+    # Массив читается из буфера array без копирования
+    return pa.Array.from_buffers(type, len(values), [None, pa.py_buffer(values)])
+
+
+def from_arrow(values: pa.Array, typecode: str) -> array:
+    result = array(typecode)
+    if len(values):
+        result.frombytes(values.buffers()[1])
+        del result[len(values):]
+
+    return result
+
+
+class MemorySearchQueryIdIndex(ISearchQueryIdIndex):
+    """
+    Компактный индекс value -> id на время загрузки отчета.
+
+    Вместо строк хранится 96-битный отпечаток значения: 64-битный хэш, по
+    которому ищется запись, и 32-битная проверка, которая должна совпасть.
+    Загруженные записи лежат в трех отсортированных по хэшу массивах
+    (20 байт на запрос), добавленные после загрузки - в словаре по полному
+    отпечатку. Строки запросов во время загрузки не накапливаются.
+
+    Хэши, совпавшие у разных значений при загрузке, в индекс не попадают и
+    разрешаются обычным путем. Новое значение с чужим хэшем не совпадет с
+    проверкой и тоже разрешится обычным путем, ошибиться индекс может только
+    при совпадении всех 96 бит: для 10^8 запросов и 10^6 новых значений в
+    день вероятность этого около 10^-15 за день.
+
+    Сортировка при загрузке выполняется pyarrow над массивами целых, без
+    списка объектов int на каждый запрос.
+    """
+    def __init__(self) -> None:
+        self._hashes = array('q')
+        self._checks = array('i')
+        self._ids = array('q')
+        self._collisions: Set[int] = set()
+        self._added: Dict[int, int] = {}
+
+    @staticmethod
+    def _fingerprint(value: str) -> bytes:
+        return hashlib.blake2b(value.encode('UTF-8'), digest_size=12).digest()
+
+    @staticmethod
+    def _split(fingerprint: bytes) -> Tuple[int, int]:
+        return (
+            int.from_bytes(fingerprint[:8], 'little', signed=True),
+            int.from_bytes(fingerprint[8:], 'little', signed=True),
+        )
+
+    def load_batch(self, items: Iterable[Tuple[str, int]]) -> None:
+        for value, search_query_id in items:
+            value_hash, check = self._split(self._fingerprint(value))
+            self._hashes.append(value_hash)
+            self._checks.append(check)
+            self._ids.append(search_query_id)
+
+    def finish_loading(self) -> None:
+        hashes = to_arrow(self._hashes, pa.int64())
+        checks = to_arrow(self._checks, pa.int32())
+        ids = to_arrow(self._ids, pa.int64())
+
+        order = pc.sort_indices(hashes)
+        hashes, checks, ids = hashes.take(order), checks.take(order), ids.take(order)
+        del order
+
+        # Совпавший хэш исключается целиком, вместе с первым из пары значений
+        if len(hashes) > 1:
+            repeated = pc.equal(hashes.slice(1), hashes.slice(0, len(hashes) - 1))
+            self._collisions.update(pc.unique(hashes.slice(1).filter(repeated)).to_pylist())
+
+        if self._collisions:
+            keep = pc.invert(pc.is_in(hashes, value_set=pa.array(list(self._collisions), pa.int64())))
+            hashes, checks, ids = hashes.filter(keep), checks.filter(keep), ids.filter(keep)
+
+        self._hashes = from_arrow(hashes, self._hashes.typecode)
+        self._checks = from_arrow(checks, self._checks.typecode)
+        self._ids = from_arrow(ids, self._ids.typecode)
+
+    def get_ids(self, values: Iterable[str]) -> Dict[str, int]:
+        result = {}
+        for value in values:
+            fingerprint = self._fingerprint(value)
+            if (search_query_id := self._added.get(int.from_bytes(fingerprint, 'little'))) is not None:
+                result[value] = search_query_id
+                continue
+
+            value_hash, check = self._split(fingerprint)
+            if value_hash in self._collisions:
+                continue
+
+            i = bisect_left(self._hashes, value_hash)
+            if i < len(self._hashes) and self._hashes[i] == value_hash and self._checks[i] == check:
+                result[value] = self._ids[i]
+
+        return result
+
+    def add(self, value: str, search_query_id: int) -> None:
+        self._added[int.from_bytes(self._fingerprint(value), 'little')] = search_query_id
+
+    def memory_usage(self) -> int:
+        return (
+              sys.getsizeof(self._hashes)
+            + sys.getsizeof(self._checks)
+            + sys.getsizeof(self._ids)
+            + sys.getsizeof(self._collisions)
+            + sys.getsizeof(self._added)
+            # Ключи и значения словаря - отдельные объекты int
+            + len(self._added) * (sys.getsizeof(2 ** 95) + sys.getsizeof(2 ** 62))
+        )
+
+    def __len__(self) -> int:
+        return len(self._hashes) + len(self._added)
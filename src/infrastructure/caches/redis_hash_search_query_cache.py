@@ -0,0 +1,191 @@
+import hashlib
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from redis.asyncio import Redis
+
+from application.interfaces.search_query_cache_interface import (
+    ISearchQueryCache,
+)
+from domain.entities.search_query_entity import SearchQueryEntity
+
+VALUE_BUCKET_KEY_PREFIX = b'wsq:hv:'
+ID_BUCKET_KEY_PREFIX = b'wsq:hi:'
+MISSING_VALUE_KEY_PREFIX = b'wsq:hm:'
+
+
+class RedisHashSearchQueryCache(ISearchQueryCache):
+    """
+    Кэш поисковых запросов в фиксированном числе хешей Redis.
+
+    value -> id: md5 значения, первые 8 байт выбирают один из buckets
+    хешей wsq:hv:{n}, остальные 8 байт - поле, значение поля - id.
+    id -> value: хеш wsq:hi:{id // id_bucket_size}, поле - остаток от
+    деления, значение - текст запроса.
+
+    Маленькие хеши Redis хранит в listpack без накладных расходов на ключ,
+    для этого в каждом хеше должно быть не больше hash-max-listpack-entries
+    полей (128 по умолчанию): buckets берется из расчета около 100
+    запросов на хеш. Тексты длиннее hash-max-listpack-value (64 байта)
+    переводят хеш id в обычную таблицу, значение стоит поднять до 256.
+
+    Срок жизни отдельных полей хеша не поддерживается, ttl игнорируется.
+    Отметки отсутствия значений хранятся отдельными ключами wsq:hm:{md5}
+    со сроком жизни и удаляются в save_many тем же конвейером. В
+    get_queries_and_missing_values они читаются тем же конвейером, что и
+    запросы.
+    """
+    def __init__(self, redis_client: Redis, buckets: int = 65536, id_bucket_size: int = 100):
+        self._redis = redis_client
+        self._buckets = buckets
+        self._id_bucket_size = id_bucket_size
+        self._hits = 0
+        self._misses = 0
+
+    def _get_value_location(self, query_value: str) -> Tuple[bytes, bytes]:
+        digest = hashlib.md5(query_value.encode('UTF-8')).digest()
+        bucket = int.from_bytes(digest[:8], 'big') % self._buckets
+
+        return VALUE_BUCKET_KEY_PREFIX + b'%d' % bucket, digest[8:]
+
+    def _get_missing_value_key(self, query_value: str) -> bytes:
+        return MISSING_VALUE_KEY_PREFIX + hashlib.md5(query_value.encode('UTF-8')).digest()
+
+    def _get_id_location(self, query_id: int) -> Tuple[bytes, bytes]:
+        bucket, field = divmod(query_id, self._id_bucket_size)
+
+        return ID_BUCKET_KEY_PREFIX + b'%d' % bucket, b'%d' % field
+
+    async def get_query_by_id(self, query_id: int) -> Optional[SearchQueryEntity]:
+        raw_value = await self._redis.hget(*self._get_id_location(query_id))
+        if raw_value is None:
+            return None
+
+        return SearchQueryEntity(id=query_id, value=raw_value.decode('UTF-8'))
+
+    async def get_query_by_value(self, query_value: str) -> Optional[SearchQueryEntity]:
+        raw_id = await self._redis.hget(*self._get_value_location(query_value))
+        if raw_id is None:
+            self._misses += 1
+            return None
+
+        self._hits += 1
+
+        return SearchQueryEntity(id=int(raw_id), value=query_value)
+
+    async def get_queries_by_values(self, query_values: Iterable[str]) -> Dict[str, SearchQueryEntity]:
+        result, _ = await self._get_queries(query_values, with_missing_values=False)
+
+        return result
+
+    async def get_queries_and_missing_values(
+        self,
+        query_values: Iterable[str],
+    ) -> Tuple[Dict[str, SearchQueryEntity], Set[str]]:
+        return await self._get_queries(query_values, with_missing_values=True)
+
+    async def _get_queries(
+        self,
+        query_values: Iterable[str],
+        with_missing_values: bool,
+    ) -> Tuple[Dict[str, SearchQueryEntity], Set[str]]:
+        # Один HMGET на хеш, все HMGET (и MGET отметок) уходят одним конвейером
+        query_values = list(set(query_values))
+
+        fields_by_key = defaultdict(list)
+        for query_value in query_values:
+            key, field = self._get_value_location(query_value)
+            fields_by_key[key].append((field, query_value))
+
+        if not fields_by_key:
+            return {}, set()
+
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for key, items in fields_by_key.items():
+                pipe.hmget(key, [field for field, _ in items])
+
+            if with_missing_values:
+                pipe.mget([self._get_missing_value_key(query_value) for query_value in query_values])
+
+            responses = await pipe.execute()
+
+        result = {}
+        for items, raw_ids in zip(fields_by_key.values(), responses):
+            for (_, query_value), raw_id in zip(items, raw_ids):
+                if raw_id is not None:
+                    result[query_value] = SearchQueryEntity(id=int(raw_id), value=query_value)
+                else:
+                    self._misses += 1
+
+        self._hits += len(result)
+
+        missing_query_values = set()
+        if with_missing_values:
+            missing_query_values = {
+                query_value
+                for query_value, raw_value in zip(query_values, responses[-1])
+                if raw_value is not None and query_value not in result
+            }
+
+        return result, missing_query_values
+
+    async def save_search_query(self, query: SearchQueryEntity, ttl: int = None) -> None:
+        await self.save_many([query], ttl)
+
+    async def save_many(self, queries: List[SearchQueryEntity], ttl: int = None) -> None:
+        mapping_by_key = defaultdict(dict)
+        missing_value_keys = []
+        for query in queries:
+            if query is None:
+                continue
+
+            missing_value_keys.append(self._get_missing_value_key(query.value))
+
+            key, field = self._get_value_location(query.value)
+            mapping_by_key[key][field] = query.id
+
+            key, field = self._get_id_location(query.id)
+            mapping_by_key[key][field] = query.value
+
+        if not mapping_by_key:
+            return
+
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for key, mapping in mapping_by_key.items():
+                pipe.hset(key, mapping=mapping)
+            pipe.unlink(*missing_value_keys)
+
+            await pipe.execute()
+
+    async def get_missing_values(self, query_values: Iterable[str]) -> Set[str]:
+        query_values = list(query_values)
+        if not query_values:
+            return set()
+
+        raw_values = await self._redis.mget([
+            self._get_missing_value_key(query_value)
+            for query_value in query_values
+        ])
+
+        return {
+            query_value
+            for query_value, raw_value in zip(query_values, raw_values)
+            if raw_value is not None
+        }
+
+    async def save_missing_values(self, query_values: List[str], ttl: int) -> None:
+        if not query_values:
+            return
+
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for query_value in query_values:
+                pipe.set(self._get_missing_value_key(query_value), b'', ex=ttl)
+
+            await pipe.execute()
+
+    async def get_stats(self) -> dict:
+        return {
+            'hits': self._hits,
+            'misses': self._misses,
+            'hit_ratio': self._hits / (self._hits + self._misses) if self._hits + self._misses else None,
+        }
@@ -0,0 +1,97 @@
+import hashlib
+import time
+from datetime import date, datetime, timezone
+from typing import Optional, Tuple
+
+from redis.asyncio import Redis
+
+from application.interfaces.response_cache_interface import IResponseCache
+from domain.entities.data_version_entity import DataVersionEntity
+
+VERSION_KEY = 'wsq:data_version'
+VERSION_DAY_KEY = 'wsq:data_version:day'
+VERSION_UPDATED_AT_KEY = 'wsq:data_version:updated_at'
+HITS_KEY = 'wsq:response_cache:hits'
+MISSES_KEY = 'wsq:response_cache:misses'
+
+
+class RedisResponseCache(IResponseCache):
+    """
+    Кэш ответов, привязанный к версии данных.
+
+    Версия хранится вместе с ответом, поэтому версия и ответ читаются одним
+    MGET, а после загрузки отчета (увеличения версии) старые ответы просто
+    не совпадают по версии и перезаписываются при следующем промахе.
+    """
+    def __init__(self, redis_client: Redis, max_size: Optional[int] = None):
+        self._redis = redis_client
+        self._max_size = max_size
+
+    async def get(self, key: str, version: Optional[int] = None) -> Tuple[int, Optional[bytes]]:
+        if version is None:
+            raw_version, raw_value = await self._redis.mget([VERSION_KEY, self._get_key(key)])
+            version = int(raw_version or 0)
+        else:
+            raw_value = await self._redis.get(self._get_key(key))
+
+        value = None
+        if raw_value is not None:
+            cached_version, _, cached_value = raw_value.partition(b':')
+            if int(cached_version) == version:
+                value = cached_value
+
+        await self._redis.incr(HITS_KEY if value is not None else MISSES_KEY)
+
+        return version, value
+
+    async def set(self, key: str, version: int, value: bytes, ttl: Optional[int] = None) -> None:
+        if self._max_size is not None and len(value) > self._max_size:
+            return
+
+        await self._redis.set(self._get_key(key), b'%d:%s' % (version, value), ex=ttl)
+
+    async def get_version(self) -> DataVersionEntity:
+        raw_version, raw_day, raw_updated_at = await self._redis.mget([VERSION_KEY, VERSION_DAY_KEY, VERSION_UPDATED_AT_KEY])
+
+        return DataVersionEntity(
+            version=int(raw_version or 0),
+            day=date.fromisoformat(raw_day.decode('ascii')) if raw_day else None,
+            updated_at=datetime.fromtimestamp(int(raw_updated_at), timezone.utc) if raw_updated_at else None,
+        )
+
+    async def bump_version(self, day: Optional[date] = None) -> int:
+        async def bump(pipe) -> None:
+            # День и время читаются под WATCH: если параллельная загрузка
+            # изменит их до EXEC, транзакция повторится с новыми значениями
+            raw_day, raw_updated_at = await pipe.mget([VERSION_DAY_KEY, VERSION_UPDATED_AT_KEY])
+
+            # Время в секундах строго растет: Last-Modified различает две
+            # загрузки, завершившиеся в одну секунду
+            updated_at = max(int(time.time()), int(raw_updated_at or 0) + 1)
+
+            pipe.multi()
+            pipe.incr(VERSION_KEY)
+            pipe.set(VERSION_UPDATED_AT_KEY, updated_at)
+            # Пересчет за прошлый день не должен отодвигать день последней загрузки
+            if day is not None and not (raw_day and date.fromisoformat(raw_day.decode('ascii')) > day):
+                pipe.set(VERSION_DAY_KEY, day.isoformat())
+
+        version, *_ = await self._redis.transaction(bump, VERSION_DAY_KEY, VERSION_UPDATED_AT_KEY)
+
+        return version
+
+    async def get_stats(self) -> dict:
+        raw_version, raw_hits, raw_misses = await self._redis.mget([VERSION_KEY, HITS_KEY, MISSES_KEY])
+        hits, misses = int(raw_hits or 0), int(raw_misses or 0)
+
+        return {
+            'version': int(raw_version or 0),
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': hits / (hits + misses) if hits + misses else None,
+        }
+
+    def _get_key(self, key: str) -> str:
+        return 'wsq:response:{key}'.format(
+            key=hashlib.md5(key.encode('UTF-8')).hexdigest(),
+        )
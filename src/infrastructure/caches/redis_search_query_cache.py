@@ -1,6 +1,5 @@
 import hashlib
-import pickle
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 from redis.asyncio import Redis
 
@@ -9,48 +8,145 @@ from application.interfaces.search_query_cache_interface import (
 )
 from domain.entities.search_query_entity import SearchQueryEntity
 
+VALUE_KEY_PREFIX = b'wsq:qv:'
+ID_KEY_PREFIX = b'wsq:qi:'
+# id запросов начинаются с 1, 0 под ключом значения - отметка отсутствия
+MISSING_ID = b'0'
+
 
 class RedisSearchQueryCache(ISearchQueryCache):
-    def __init__(self, redis_client: Redis):
+    """
+    Кэш поисковых запросов в Redis.
+
+    Под ключом значения хранится только id числом, под ключом id - текст
+    запроса, без pickle. С hash_keys ключ значения - 16 байт md5 вместо
+    текста: короче для запросов на кириллице. Пачки читаются одним MGET
+    и пишутся одним MSET (или конвейером SET при заданном ttl).
+
+    Отсутствие значения хранится под тем же ключом как id 0 со сроком
+    жизни, запись найденного запроса перезаписывает отметку. Запросы и
+    отметки поэтому читаются одним MGET.
+    """
+    def __init__(self, redis_client: Redis, hash_keys: bool = True):
         self._redis = redis_client
+        self._hash_keys = hash_keys
+        self._hits = 0
+        self._misses = 0
+
+    def _get_value_key(self, query_value: str) -> bytes:
+        value = query_value.encode('UTF-8')
+        if self._hash_keys:
+            value = hashlib.md5(value).digest()
+
+        return VALUE_KEY_PREFIX + value
+
+    def _get_id_key(self, query_id: int) -> bytes:
+        return ID_KEY_PREFIX + b'%d' % query_id
 
     async def get_query_by_id(self, query_id: int) -> Optional[SearchQueryEntity]:
-        key = 'wsq:query_by_id:{id}'.format(
-            id=hashlib.md5(str(query_id).encode('UTF-8')).hexdigest(),
-        )
-        raw_value = await self._redis.get(key)
+        raw_value = await self._redis.get(self._get_id_key(query_id))
+        if raw_value is None:
+            return None
+
+        return SearchQueryEntity(id=query_id, value=raw_value.decode('UTF-8'))
+
+    async def get_query_by_value(self, query_value: str) -> Optional[SearchQueryEntity]:
+        raw_id = await self._redis.get(self._get_value_key(query_value))
+        if raw_id is None or raw_id == MISSING_ID:
+            self._misses += 1
+            return None
+
+        self._hits += 1
+
+        return SearchQueryEntity(id=int(raw_id), value=query_value)
+
+    async def get_queries_by_values(self, query_values: Iterable[str]) -> Dict[str, SearchQueryEntity]:
+        result, _ = await self.get_queries_and_missing_values(query_values)
+
+        return result
 
-        return self._bytes_to_entity(raw_value)
+    async def get_queries_and_missing_values(
+        self,
+        query_values: Iterable[str],
+    ) -> Tuple[Dict[str, SearchQueryEntity], Set[str]]:
+        query_values = list(query_values)
+        if not query_values:
+            return {}, set()
 
-    async def get_query_by_value(self, query_value: int) -> Optional[SearchQueryEntity]:
-        key = 'wsq:query_by_value:{value}'.format(
-            value=hashlib.md5(query_value.encode('UTF-8')).hexdigest(),
-        )
-        raw_value = await self._redis.get(key)
+        raw_ids = await self._redis.mget([
+            self._get_value_key(query_value)
+            for query_value in query_values
+        ])
 
-        return self._bytes_to_entity(raw_value)
+        result = {}
+        missing_query_values = set()
+        for query_value, raw_id in zip(query_values, raw_ids):
+            if raw_id == MISSING_ID:
+                missing_query_values.add(query_value)
+            elif raw_id is not None:
+                result[query_value] = SearchQueryEntity(id=int(raw_id), value=query_value)
+
+        self._hits += len(result)
+        self._misses += len(query_values) - len(result)
+
+        return result, missing_query_values
 
     async def save_search_query(self, query: SearchQueryEntity, ttl: int = None) -> None:
-        if query is None:
+        await self.save_many([query], ttl)
+
+    async def save_many(self, queries: List[SearchQueryEntity], ttl: int = None) -> None:
+        mapping = {}
+        for query in queries:
+            if query is None:
+                continue
+
+            mapping[self._get_value_key(query.value)] = query.id
+            mapping[self._get_id_key(query.id)] = query.value
+
+        if not mapping:
             return
 
-        raw_value = self._entity_to_bytes(query)
+        if ttl is None:
+            await self._redis.mset(mapping)
+            return
 
-        key = 'wsq:query_by_value:{value}'.format(
-            value=hashlib.md5(query.value.encode('UTF-8')).hexdigest(),
-        )
-        await self._redis.set(key, raw_value, ex=ttl)
+        # MSET не задает срок жизни, SET с ex отправляются одним конвейером
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for key, value in mapping.items():
+                pipe.set(key, value, ex=ttl)
 
-        key = 'wsq:query_by_id:{id}'.format(
-            id=hashlib.md5(str(query.id).encode('UTF-8')).hexdigest(),
-        )
-        await self._redis.set(key, raw_value, ex=ttl)
+            await pipe.execute()
+
+    async def get_missing_values(self, query_values: Iterable[str]) -> Set[str]:
+        query_values = list(query_values)
+        if not query_values:
+            return set()
+
+        raw_ids = await self._redis.mget([
+            self._get_value_key(query_value)
+            for query_value in query_values
+        ])
+
+        return {
+            query_value
+            for query_value, raw_id in zip(query_values, raw_ids)
+            if raw_id == MISSING_ID
+        }
+
+    async def save_missing_values(self, query_values: List[str], ttl: int) -> None:
+        if not query_values:
+            return
 
-    def _entity_to_bytes(self, entity: SearchQueryEntity) -> bytes:
-        return pickle.dumps(entity)
+        # NX: отметка не должна затереть запрос, сохраненный другим процессом
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for query_value in query_values:
+                pipe.set(self._get_value_key(query_value), MISSING_ID, ex=ttl, nx=True)
 
-    def _bytes_to_entity(self, value: Optional[bytes]) -> SearchQueryEntity:
-        if value is not None:
-            return pickle.loads(value)
+            await pipe.execute()
 
-        return None
+    async def get_stats(self) -> dict:
+        return {
+            'hits': self._hits,
+            'misses': self._misses,
+            'hit_ratio': self._hits / (self._hits + self._misses) if self._hits + self._misses else None,
+        }
@@ -0,0 +1,133 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from application.interfaces.search_query_cache_interface import (
+    ISearchQueryCache,
+)
+from domain.entities.search_query_entity import SearchQueryEntity
+
+from .memory_search_query_cache import MemorySearchQueryCache
+
+
+def get_hit_ratio(hits: int, requests: int) -> Optional[float]:
+    return hits / requests if requests else None
+
+
+class TwoTierSearchQueryCache(ISearchQueryCache):
+    """
+    Кэш запросов в памяти процесса перед кэшем в Redis.
+
+    Локальный уровень - ограниченный MemorySearchQueryCache. Промахи
+    читаются из remote_cache и оседают в локальном уровне. Запись идет в
+    оба уровня.
+
+    Изменения других процессов не рассылаются: сохраненный запрос не
+    меняется (id и значение постоянны), а устаревшая локальная отметка
+    отсутствия живет не дольше своего срока. Значения читает загрузка
+    отчета, для нее такая отметка стоит лишь лишней вставки: bulk_create
+    возвращает id уже существующего запроса.
+    """
+    def __init__(
+        self,
+        local_cache: MemorySearchQueryCache,
+        remote_cache: ISearchQueryCache,
+    ) -> None:
+        self._local_cache = local_cache
+        self._remote_cache = remote_cache
+        self._requests = 0
+        self._local_hits = 0
+        self._remote_hits = 0
+
+    async def get_query_by_id(self, query_id: int) -> Optional[SearchQueryEntity]:
+        return await self._remote_cache.get_query_by_id(query_id)
+
+    async def get_query_by_value(self, query_value: str) -> Optional[SearchQueryEntity]:
+        queries = await self.get_queries_by_values([query_value])
+
+        return queries.get(query_value)
+
+    async def get_queries_by_values(self, query_values: Iterable[str]) -> Dict[str, SearchQueryEntity]:
+        query_values = list(query_values)
+        self._requests += len(query_values)
+
+        result = await self._local_cache.get_queries_by_values(query_values)
+        self._local_hits += len(result)
+
+        missed_query_values = [query_value for query_value in query_values if query_value not in result]
+        if missed_query_values:
+            found_queries = await self._remote_cache.get_queries_by_values(missed_query_values)
+            self._remote_hits += len(found_queries)
+
+            await self._local_cache.save_many(list(found_queries.values()))
+            result.update(found_queries)
+
+        return result
+
+    async def get_queries_and_missing_values(
+        self,
+        query_values: Iterable[str],
+    ) -> Tuple[Dict[str, SearchQueryEntity], Set[str]]:
+        query_values = list(query_values)
+        self._requests += len(query_values)
+
+        result, missing_query_values = await self._local_cache.get_queries_and_missing_values(query_values)
+        self._local_hits += len(result)
+
+        missed_query_values = [
+            query_value for query_value in query_values
+            if query_value not in result and query_value not in missing_query_values
+        ]
+        if missed_query_values:
+            found_queries, remote_missing_query_values = (
+                await self._remote_cache.get_queries_and_missing_values(missed_query_values)
+            )
+            self._remote_hits += len(found_queries)
+
+            await self._local_cache.save_many(list(found_queries.values()))
+            result.update(found_queries)
+            missing_query_values |= remote_missing_query_values
+
+        return result, missing_query_values
+
+    async def save_search_query(self, query: SearchQueryEntity, ttl: int = None) -> None:
+        await self.save_many([query], ttl)
+
+    async def save_many(self, queries: List[SearchQueryEntity], ttl: int = None) -> None:
+        queries = [query for query in queries if query is not None]
+        if not queries:
+            return
+
+        await self._remote_cache.save_many(queries, ttl)
+        await self._local_cache.save_many(queries, ttl)
+
+    async def get_missing_values(self, query_values: Iterable[str]) -> Set[str]:
+        query_values = list(query_values)
+
+        result = await self._local_cache.get_missing_values(query_values)
+
+        remaining_query_values = [query_value for query_value in query_values if query_value not in result]
+        if remaining_query_values:
+            result |= await self._remote_cache.get_missing_values(remaining_query_values)
+
+        return result
+
+    async def save_missing_values(self, query_values: List[str], ttl: int) -> None:
+        if not query_values:
+            return
+
+        await self._remote_cache.save_missing_values(query_values, ttl)
+        await self._local_cache.save_missing_values(query_values, ttl)
+
+    async def get_stats(self) -> dict:
+        remote_requests = self._requests - self._local_hits
+
+        return {
+            'requests': self._requests,
+            'local_hits': self._local_hits,
+            'remote_hits': self._remote_hits,
+            'misses': remote_requests - self._remote_hits,
+            'local_hit_ratio': get_hit_ratio(self._local_hits, self._requests),
+            'remote_hit_ratio': get_hit_ratio(self._remote_hits, remote_requests),
+            'hit_ratio': get_hit_ratio(self._local_hits + self._remote_hits, self._requests),
+            'local': await self._local_cache.get_stats(),
+            'remote': await self._remote_cache.get_stats(),
+        }
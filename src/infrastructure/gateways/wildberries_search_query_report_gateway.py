@@ -1,6 +1,6 @@
 import io
 from base64 import b64decode
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
 import requests
 
@@ -9,6 +9,10 @@ from domain.interfaces.search_query_report_gateway_interface import (
     ISearchQueryReportGateway,
 )
 
+REPORT_FILE_URL = 'https://seller-weekly-report.wildberries.ru/ns/trending-searches/suppliers-portal-analytics/file'
+
+REPORT_FILE_FIELD = b'"file"'
+
 
 class WildberriesSearchQueryReportGateway(ISearchQueryReportGateway):
     def __init__(self, authorizev3: str, wbx_validation_key: str) -> None:
@@ -18,7 +22,7 @@ class WildberriesSearchQueryReportGateway(ISearchQueryReportGateway):
     def download_report(self, period: ReportPeriod = ReportPeriod.ONE_WEEK) -> Optional[io.BytesIO]:
         with self.get_session() as session:
             r = session.get(
-                url='https://seller-weekly-report.wildberries.ru/ns/trending-searches/suppliers-portal-analytics/file',
+                url=REPORT_FILE_URL,
                 params={
                     'period': period.value,
                 },
@@ -30,10 +34,87 @@ class WildberriesSearchQueryReportGateway(ISearchQueryReportGateway):
 
                 return io.BytesIO(b64decode(data))
             elif r.status_code in (401, 403):
-                raise Exception('Unauthorized error') 
+                raise Exception('Unauthorized error')
             else:
                 raise Exception('Failed to download report')
 
+    def stream_report(
+        self,
+        period: ReportPeriod = ReportPeriod.ONE_WEEK,
+        chunk_size: int = 64 * 1024,
+    ) -> Iterator[bytes]:
+        """
+        Отдает содержимое отчета по частям, не загружая ответ целиком.
+
+        Ответ вида {"data": {"file": "<base64>"}} читается кусками по chunk_size
+        байт, base64 декодируется по мере поступления данных.
+        """
+        with self.get_session() as session:
+            with session.get(
+                url=REPORT_FILE_URL,
+                params={
+                    'period': period.value,
+                },
+                stream=True,
+            ) as r:
+                if r.status_code == 200:
+                    yield from self._decode_report_stream(r.iter_content(chunk_size))
+                elif r.status_code in (401, 403):
+                    raise Exception('Unauthorized error')
+                else:
+                    raise Exception('Failed to download report')
+
+    def _decode_report_stream(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        chunks = iter(chunks)
+
+        # Пропускаем JSON до начала строки "file": "
+        buffer = b''
+        for chunk in chunks:
+            buffer += chunk
+
+            start = buffer.find(REPORT_FILE_FIELD)
+            if start == -1:
+                buffer = buffer[-len(REPORT_FILE_FIELD):]
+                continue
+
+            buffer = buffer[start:]
+            value_start = buffer.find(b'"', len(REPORT_FILE_FIELD))
+            if value_start != -1:
+                buffer = buffer[value_start + 1:]
+                break
+        else:
+            raise Exception('Failed to download report')
+
+        remainder = b''
+        for chunk in self._prepend(buffer, chunks):
+            value_end = chunk.find(b'"')
+            data = remainder + (chunk if value_end == -1 else chunk[:value_end])
+
+            # Экранирование JSON может разрезаться границей куска
+            if data.endswith(b'\\') and value_end == -1:
+                data, remainder = data[:-1], b'\\'
+            else:
+                remainder = b''
+            data = data.replace(b'\\/', b'/').replace(b'\\n', b'').replace(b'\\r', b'')
+
+            # base64 декодируется блоками по 4 символа
+            size = len(data) - len(data) % 4
+            if size:
+                yield b64decode(data[:size])
+            remainder = data[size:] + remainder
+
+            if value_end != -1:
+                break
+
+        if remainder:
+            yield b64decode(remainder)
+
+    @staticmethod
+    def _prepend(first: bytes, chunks: Iterator[bytes]) -> Iterator[bytes]:
+        if first:
+            yield first
+
+        yield from chunks
 
     def get_session(self) -> requests.Session:
         session = requests.Session()
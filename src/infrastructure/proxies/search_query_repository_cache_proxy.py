@@ -1,6 +1,11 @@
 from datetime import date
-from typing import List, Optional
+from typing import (
+    AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple,
+)
 
+from application.interfaces.search_query_bloom_filter_interface import (
+    ISearchQueryBloomFilter,
+)
 from application.interfaces.search_query_cache_interface import (
     ISearchQueryCache,
 )
@@ -8,21 +13,40 @@ from application.interfaces.search_query_repository_interface import (
     ISearchQueryRepository,
 )
 from domain.entities.search_query_entity import SearchQueryEntity
+from domain.entities.search_query_page_entity import SearchQueryPageEntity
+from domain.enums.granularity_enum import Granularity
+from domain.enums.search_mode_enum import SearchMode
 
 
 class SearchQueryRepositoryCacheProxy(ISearchQueryRepository):
+    """
+    Репозиторий запросов за кэшем.
+
+    Значения, которых точно нет по фильтру Блума, не ищутся ни в кэше, ни в
+    базе. Значения, не найденные в базе, отмечаются в кэше на missing_ttl
+    секунд (0 - не отмечаются) и до истечения срока в базе не ищутся.
+
+    Отметки ставит только get_query_by_value. get_queries_by_values
+    вызывает загрузка отчета, которая сразу вставляет не найденные значения:
+    отметка перед вставкой была бы лишней записью в кэш.
+    """
     def __init__(
         self,
         search_query_repository: ISearchQueryRepository,
         search_query_cache: ISearchQueryCache,
+        search_query_bloom_filter: Optional[ISearchQueryBloomFilter] = None,
+        missing_ttl: int = 0,
     ) -> None:
         self._search_query_repository = search_query_repository
         self._search_query_cache = search_query_cache
+        self._search_query_bloom_filter = search_query_bloom_filter
+        self._missing_ttl = missing_ttl
 
     async def list(
         self,
         search_query_ids: Optional[List[int]] = None,
         search: Optional[str] = None,
+        search_mode: SearchMode = SearchMode.FULLTEXT,
         target_day: Optional[date] = None,
         sort_by: str = 'day',
         sort_dir: str = 'desc',
@@ -32,6 +56,7 @@ class SearchQueryRepositoryCacheProxy(ISearchQueryRepository):
         return await self._search_query_repository.list(
             search_query_ids=search_query_ids,
             search=search,
+            search_mode=search_mode,
             target_day=target_day,
             sort_by=sort_by,
             sort_dir=sort_dir,
@@ -39,18 +64,113 @@ class SearchQueryRepositoryCacheProxy(ISearchQueryRepository):
             offset=offset,
         )
 
+    async def list_page(
+        self,
+        search_query_ids: Optional[List[int]] = None,
+        search: Optional[str] = None,
+        search_mode: SearchMode = SearchMode.FULLTEXT,
+        target_day: Optional[date] = None,
+        sort_by: str = 'day',
+        sort_dir: str = 'desc',
+        limit: int = 100,
+        after: Optional[Sequence] = None,
+    ) -> SearchQueryPageEntity:
+        return await self._search_query_repository.list_page(
+            search_query_ids=search_query_ids,
+            search=search,
+            search_mode=search_mode,
+            target_day=target_day,
+            sort_by=sort_by,
+            sort_dir=sort_dir,
+            limit=limit,
+            after=after,
+        )
+
+    async def list_page_with_statistics(
+        self,
+        from_date: date,
+        to_date: date,
+        search_query_ids: Optional[List[int]] = None,
+        search: Optional[str] = None,
+        search_mode: SearchMode = SearchMode.FULLTEXT,
+        target_day: Optional[date] = None,
+        sort_by: str = 'day',
+        sort_dir: str = 'desc',
+        limit: int = 100,
+        after: Optional[Sequence] = None,
+        granularity: Granularity = Granularity.DAY,
+    ) -> SearchQueryPageEntity:
+        return await self._search_query_repository.list_page_with_statistics(
+            from_date=from_date,
+            to_date=to_date,
+            search_query_ids=search_query_ids,
+            search=search,
+            search_mode=search_mode,
+            target_day=target_day,
+            sort_by=sort_by,
+            sort_dir=sort_dir,
+            limit=limit,
+            after=after,
+            granularity=granularity,
+        )
+
     async def get_query_by_value(self, query_value: str) -> Optional[SearchQueryEntity]:
-        if query := await self._search_query_cache.get_query_by_value(query_value):
-            return query
+        queries = await self._get_queries_by_values([query_value], save_missing_values=True)
+
+        return queries.get(query_value)
 
-        query = await self._search_query_repository.get_query_by_value(query_value)
+    async def get_queries_by_values(self, query_values: Iterable[str]) -> Dict[str, SearchQueryEntity]:
+        return await self._get_queries_by_values(query_values, save_missing_values=False)
 
-        await self._search_query_cache.save_search_query(query)
+    async def _get_queries_by_values(
+        self,
+        query_values: Iterable[str],
+        save_missing_values: bool,
+    ) -> Dict[str, SearchQueryEntity]:
+        query_values = list(set(query_values))
+
+        if self._search_query_bloom_filter is not None:
+            might_contain = self._search_query_bloom_filter.might_contain
+            query_values = [value for value in query_values if might_contain(value)]
+
+        if not query_values:
+            return {}
+
+        # Отметки отсутствия читаются вместе с запросами, без второго обращения к кэшу
+        if self._missing_ttl:
+            queries, missing_query_values = await self._search_query_cache.get_queries_and_missing_values(query_values)
+        else:
+            queries, missing_query_values = await self._search_query_cache.get_queries_by_values(query_values), set()
+
+        missed_query_values = [
+            value for value in query_values
+            if value not in queries and value not in missing_query_values
+        ]
+
+        if missed_query_values:
+            found_queries = await self._search_query_repository.get_queries_by_values(missed_query_values)
+
+            await self._search_query_cache.save_many(list(found_queries.values()))
+
+            if self._missing_ttl and save_missing_values:
+                await self._search_query_cache.save_missing_values(
+                    [value for value in missed_query_values if value not in found_queries],
+                    self._missing_ttl,
+                )
+
+            queries.update(found_queries)
+
+        return queries
+
+    async def iter_values(self, batch_size: int = 10000, min_id: int = 0) -> AsyncIterator[Tuple[str, int]]:
+        async for item in self._search_query_repository.iter_values(batch_size, min_id):
+            yield item
 
-        return query
-    
     async def bulk_create(self, values_list: List[SearchQueryEntity]) -> None:
+        # До вставки: значение в базе без бита в фильтре было бы потеряно для чтения
+        if self._search_query_bloom_filter is not None:
+            self._search_query_bloom_filter.add_many(query.value for query in values_list)
+
         await self._search_query_repository.bulk_create(values_list)
 
-        for search_query in values_list:
-            await self._search_query_cache.save_search_query(search_query)
+        await self._search_query_cache.save_many(values_list)
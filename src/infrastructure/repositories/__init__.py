@@ -1,8 +1,20 @@
 from .memory_search_query_repository import MemorySearchQueryRepository
+from .sqlalchemy_report_ingest_checkpoint_repository import (
+    SQLAlchemyReportIngestCheckpointRepository,
+)
+from .sqlalchemy_search_query_daily_rank_repository import (
+    SQLAlchemySearchQueryDailyRankRepository,
+)
+from .sqlalchemy_search_query_daily_stats_copy_repository import (
+    SQLAlchemySearchQueryDailyStatsCopyRepository,
+)
 from .sqlalchemy_search_query_daily_stats_repository import (
     SQLAlchemySearchQueryDailyStatsRepository,
 )
 from .sqlalchemy_search_query_repository import SQLAlchemySearchQueryRepository
+from .sqlalchemy_search_query_rollup_repository import (
+    SQLAlchemySearchQueryRollupRepository,
+)
 from .sqlalchemy_search_query_total_by_day_repository import (
     SQLAlchemySearchQueryTotalByDayRepository,
 )
@@ -1,9 +1,16 @@
-from typing import List, Optional
+from datetime import date
+from typing import (
+    AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple,
+)
 
 from application.interfaces.search_query_repository_interface import (
     ISearchQueryRepository,
 )
 from domain.entities.search_query_entity import SearchQueryEntity
+from domain.entities.search_query_page_entity import SearchQueryPageEntity
+from domain.entities.search_query_statistics_entity import (
+    SearchQueryStatisticsEntity,
+)
 
 
 class MemorySearchQueryRepository(ISearchQueryRepository):
@@ -17,9 +24,57 @@ class MemorySearchQueryRepository(ISearchQueryRepository):
     async def list(self) -> List[SearchQueryEntity]:
         return sorted(self._storage.values(), key=lambda x: x.id)
 
+    async def list_page(
+        self,
+        limit: int = 100,
+        after: Optional[Sequence] = None,
+        **kwargs,
+    ) -> SearchQueryPageEntity:
+        queries = sorted(self._storage.values(), key=lambda x: (x.value, x.id))
+        if after is not None:
+            queries = [query for query in queries if (query.value, query.id) > tuple(after)]
+
+        page = SearchQueryPageEntity(items=queries[:limit])
+        if len(queries) > limit:
+            page.next_key = [page.items[-1].value, page.items[-1].id]
+
+        return page
+
+    async def list_page_with_statistics(
+        self,
+        from_date: date,
+        to_date: date,
+        limit: int = 100,
+        after: Optional[Sequence] = None,
+        **kwargs,
+    ) -> SearchQueryPageEntity:
+        page = await self.list_page(limit=limit, after=after)
+        page.items = [
+            SearchQueryStatisticsEntity(
+                id=query.id,
+                value=query.value,
+            ) for query in page.items
+        ]
+
+        return page
+
     async def get_query_by_value(self, query_value: str) -> Optional[SearchQueryEntity]:
         for query in self._storage.values():
             if query.value == query_value:
                 return query
 
         return None
+
+    async def get_queries_by_values(self, query_values: Iterable[str]) -> Dict[str, SearchQueryEntity]:
+        query_values = set(query_values)
+
+        return {
+            query.value: query
+            for query in self._storage.values()
+            if query.value in query_values
+        }
+
+    async def iter_values(self, batch_size: int = 10000, min_id: int = 0) -> AsyncIterator[Tuple[str, int]]:
+        for query in list(self._storage.values()):
+            if query.id > min_id:
+                yield query.value, query.id
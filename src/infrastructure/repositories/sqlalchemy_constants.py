@@ -1,5 +1,10 @@
 SEARCH_QUERY_TABLE_NAME = 'searchquery'
 SEARCH_QUERY_TABLE_UNIQUE_KEY_NAME = 'searchquery_value_key'
+# Выражение searchquery.doc, {value} - текст запроса (value или NEW.value в триггере)
+SEARCH_QUERY_DOC_EXPRESSION_TPL = (
+    "to_tsvector('russian'::regconfig, coalesce({value}, '')) || "
+    "to_tsvector('english'::regconfig, coalesce({value}, ''))"
+)
 
 SEARCH_QUERY_DAILY_STATS_TABLE_NAME = 'searchquerydailystat'
 SEARCH_QUERY_DAILY_STAT_TABLE_UNIQUE_KEY = 'day_searchquery_id_ukey'
@@ -7,6 +12,17 @@ SEARCH_QUERY_DAILY_STAT_TABLE_UNIQUE_KEY = 'day_searchquery_id_ukey'
 SEARCH_QUERY_DAILY_STATS_TPL_TABLE_NAME = 'searchquerydailystat_tpl'
 SEARCH_QUERY_DAILY_STATS_TPL_TABLE_UNIQUE_KEY = 'day_searchquery_id_ukey'
 
+SEARCH_QUERY_DAILY_STATS_STAGING_TABLE_NAME = 'searchquerydailystat_staging'
+
+SEARCH_QUERY_DAILY_RANK_TABLE_NAME = 'searchquerydailyrank'
+SEARCH_QUERY_DAILY_RANK_TABLE_UNIQUE_KEY_NAME = 'searchquerydailyrank_day_searchquery_id_ukey'
+
+SEARCH_QUERY_WEEKLY_STATS_TABLE_NAME = 'searchqueryweeklystat'
+SEARCH_QUERY_MONTHLY_STATS_TABLE_NAME = 'searchquerymonthlystat'
+
 
 REQUESTS_TOTAL_BY_DAY_TABLE_NAME = 'requeststotalbyday'
 REQUESTS_TOTAL_BY_DAY_TABLE_UNIQUE_KEY_NAME = 'requeststotalbyday_day_ukey'
+
+REPORT_INGEST_CHECKPOINT_TABLE_NAME = 'reportingestcheckpoint'
+REPORT_INGEST_CHECKPOINT_TABLE_UNIQUE_KEY_NAME = 'reportingestcheckpoint_chunk_ukey'
@@ -0,0 +1,107 @@
+"""0012
+
+Revision ID: 5b9e3d72c6a1
+Revises: 8a2c5e47f1d9
+Create Date: 2026-10-18 20:41:17.502318
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from infrastructure.repositories.sqlalchemy_constants import (
+    SEARCH_QUERY_DOC_EXPRESSION_TPL,
+)
+
+# revision identifiers, used by Alembic.
+revision: str = '5b9e3d72c6a1'
+down_revision: Union[str, None] = '8a2c5e47f1d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Строк searchquery в одной транзакции заполнения doc
+BACKFILL_BATCH_SIZE = 10000
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    # doc заполнялся только значением по умолчанию. Генерируемый столбец
+    # потребовал бы переписать searchquery целиком под ACCESS EXCLUSIVE,
+    # поэтому doc остается обычным столбцом: новые строки заполняют
+    # триггеры, существующие - пачками ниже.
+    #
+    # bulk_create вставляет через ON CONFLICT DO UPDATE SET value = value:
+    # строчный BEFORE INSERT сработал бы для каждой предложенной строки, в
+    # том числе уже существующей. Поэтому вставленные строки заполняются
+    # одним UPDATE после оператора по таблице переходов (в нее попадают
+    # только действительно вставленные строки), а изменение value - только
+    # если значение в самом деле поменялось
+    op.execute(f'''
+        CREATE FUNCTION searchquery_doc_insert() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE searchquery
+            SET doc = {SEARCH_QUERY_DOC_EXPRESSION_TPL.format(value='inserted.value')}
+            FROM inserted
+            WHERE searchquery.id = inserted.id;
+            RETURN NULL;
+        END
+        $$
+    ''')
+    op.execute('''
+        CREATE TRIGGER searchquery_doc_insert_trigger
+        AFTER INSERT ON searchquery
+        REFERENCING NEW TABLE AS inserted
+        FOR EACH STATEMENT EXECUTE FUNCTION searchquery_doc_insert()
+    ''')
+    op.execute(f'''
+        CREATE FUNCTION searchquery_doc_update() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.doc := {SEARCH_QUERY_DOC_EXPRESSION_TPL.format(value='NEW.value')};
+            RETURN NEW;
+        END
+        $$
+    ''')
+    op.execute('''
+        CREATE TRIGGER searchquery_doc_update_trigger
+        BEFORE UPDATE OF value ON searchquery
+        FOR EACH ROW
+        WHEN (OLD.value IS DISTINCT FROM NEW.value)
+        EXECUTE FUNCTION searchquery_doc_update()
+    ''')
+    op.alter_column('searchquery', 'doc', server_default=None)
+
+    # Каждая пачка и построение индексов - в отдельной транзакции: таблица
+    # остается доступной на чтение и запись
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+
+        # Поиск по пустому doc индекс не ускорял, без него пачки пишутся быстрее
+        op.drop_index('searchquery_doc_idx', table_name='searchquery', postgresql_using='gin', postgresql_concurrently=True)
+
+        # Строки, вставленные после чтения max(id), заполнил триггер
+        max_id = bind.execute(sa.text('SELECT max(id) FROM searchquery')).scalar() or 0
+        for lo in range(0, max_id + 1, BACKFILL_BATCH_SIZE):
+            bind.execute(
+                sa.text(f'''
+                    UPDATE searchquery
+                    SET doc = {SEARCH_QUERY_DOC_EXPRESSION_TPL.format(value='value')}
+                    WHERE id >= :lo AND id < :hi
+                '''),
+                {'lo': lo, 'hi': lo + BACKFILL_BATCH_SIZE},
+            )
+
+        op.create_index('searchquery_doc_idx', 'searchquery', ['doc'], unique=False, postgresql_using='gin', postgresql_concurrently=True)
+        op.create_index('searchquery_value_trgm_idx', 'searchquery', ['value'], unique=False, postgresql_using='gin', postgresql_ops={'value': 'gin_trgm_ops'}, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('searchquery_value_trgm_idx', table_name='searchquery', postgresql_using='gin', postgresql_concurrently=True)
+
+    op.execute('DROP TRIGGER searchquery_doc_update_trigger ON searchquery')
+    op.execute('DROP FUNCTION searchquery_doc_update()')
+    op.execute('DROP TRIGGER searchquery_doc_insert_trigger ON searchquery')
+    op.execute('DROP FUNCTION searchquery_doc_insert()')
+    op.alter_column('searchquery', 'doc', server_default=sa.text("''::tsvector"))
@@ -0,0 +1,112 @@
+"""0013
+
+Revision ID: d3f81a6c94e2
+Revises: 5b9e3d72c6a1
+Create Date: 2026-10-18 21:36:52.118406
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from infrastructure.repositories.sqlalchemy_constants import (
+    SEARCH_QUERY_DAILY_STATS_TABLE_NAME, SEARCH_QUERY_MONTHLY_STATS_TABLE_NAME,
+    SEARCH_QUERY_WEEKLY_STATS_TABLE_NAME,
+)
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3f81a6c94e2'
+down_revision: Union[str, None] = '5b9e3d72c6a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Недельных строк в 4 раза больше месячных, поэтому секции меньше
+PARTITION_INTERVALS = {
+    SEARCH_QUERY_WEEKLY_STATS_TABLE_NAME: '1 month',
+    SEARCH_QUERY_MONTHLY_STATS_TABLE_NAME: '1 year',
+}
+
+# Период свертки для date_trunc, как в Granularity.truncate
+PERIODS = {
+    SEARCH_QUERY_WEEKLY_STATS_TABLE_NAME: 'week',
+    SEARCH_QUERY_MONTHLY_STATS_TABLE_NAME: 'month',
+}
+
+# Диапазон searchquery_id в одной транзакции заполнения сверток
+BACKFILL_BATCH_SIZE = 100000
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    last_days = {}
+    for table_name, partition_interval in PARTITION_INTERVALS.items():
+        period = PERIODS[table_name]
+
+        op.create_table(table_name,
+            sa.Column('day', sa.Date(), nullable=False),
+            sa.Column('last_day', sa.Date(), nullable=False),
+            sa.Column('requests_per_week', sa.Integer(), server_default=sa.text("'0'::int"), nullable=False),
+            sa.Column('requests_per_month', sa.Integer(), server_default=sa.text("'0'::int"), nullable=False),
+            sa.Column('requests_per_three_months', sa.Integer(), server_default=sa.text("'0'::int"), nullable=False),
+            sa.Column('searchquery_id', sa.BigInteger(), nullable=False),
+            sa.ForeignKeyConstraint(['searchquery_id'], ['searchquery.id'], name=f'{table_name}_searchquery_id_fkey'),
+            sa.PrimaryKeyConstraint('searchquery_id', 'day', name=f'{table_name}_pkey'),
+            postgresql_partition_by='RANGE (day)'
+        )
+        op.create_index(f'{table_name}_day_idx', table_name, ['day'], unique=False)
+
+        # Последний загруженный день каждого периода
+        last_days[table_name] = bind.execute(sa.text(
+            f"SELECT date_trunc('{period}', day)::date AS day, max(day) AS last_day "
+            f"FROM {SEARCH_QUERY_DAILY_STATS_TABLE_NAME} GROUP BY 1 ORDER BY 1"
+        )).all()
+        days = [day for day, _ in last_days[table_name]]
+
+        # Секции создаются с первого периода статистики, иначе свертки
+        # прошлых периодов попадут в секцию по умолчанию
+        start_partition = f"   , p_start_partition := '{days[0].isoformat()}' " if days else ""
+
+        op.execute(
+            f"SELECT partman.create_parent( "
+            f"     p_parent_table := 'public.{table_name}' "
+            f"   , p_control := 'day' "
+            f"   , p_interval := '{partition_interval}' "
+            f"{start_partition}"
+            f");"
+        )
+
+    # Свертки за уже загруженные дни, как в calculate_rollups: период
+    # строится по своему последнему загруженному дню. Каждая пачка - в
+    # отдельной транзакции, статистика остается доступной на запись
+    with op.get_context().autocommit_block():
+        max_id = bind.execute(sa.text('SELECT max(id) FROM searchquery')).scalar() or 0
+
+        for table_name, period_last_days in last_days.items():
+            for day, last_day in period_last_days:
+                for lo in range(0, max_id + 1, BACKFILL_BATCH_SIZE):
+                    bind.execute(
+                        sa.text(
+                            f"INSERT INTO {table_name} "
+                            f"    (day, last_day, searchquery_id, requests_per_week, requests_per_month, requests_per_three_months) "
+                            f"SELECT CAST(:day AS date), day, searchquery_id, "
+                            f"       requests_per_week, requests_per_month, requests_per_three_months "
+                            f"FROM {SEARCH_QUERY_DAILY_STATS_TABLE_NAME} "
+                            f"WHERE day = :last_day AND searchquery_id >= :lo AND searchquery_id < :hi "
+                            # Строки, уже посчитанные calculate_rollups, не старее этих
+                            f"ON CONFLICT (searchquery_id, day) DO NOTHING"
+                        ),
+                        {'day': day, 'last_day': last_day, 'lo': lo, 'hi': lo + BACKFILL_BATCH_SIZE},
+                    )
+
+
+def downgrade() -> None:
+    for table_name in PARTITION_INTERVALS:
+        op.execute(
+            f"DELETE FROM partman.part_config "
+            f"WHERE parent_table = 'public.{table_name}';"
+        )
+
+        op.drop_index(f'{table_name}_day_idx', table_name=table_name)
+        op.drop_table(table_name)
@@ -24,12 +24,16 @@ def create_search_query_table() -> Table:
         mapper_registry.metadata,
         Column('id', BigIntegerType(), primary_key=True, autoincrement=True),
         Column('value', TextType(), default='', server_default=sa.text('\'\'::character varying')),
-        Column('doc', TSVectorType(), default='', server_default=sa.text('\'\'::tsvector')),
+        # Заполняется триггерами (миграция 0012) после вставки и при
+        # изменении value, bulk_create передает только value
+        Column('doc', TSVectorType()),
         PrimaryKeyConstraint('id', name='searchquery_pkey'),
         UniqueConstraint('value', name=SEARCH_QUERY_TABLE_UNIQUE_KEY_NAME),
         Index('searchquery_id_idx', asc('id').nulls_last()),
         Index('searchquery_id_value_idx', 'id', 'value', postgresql_using='gist'),
         Index('searchquery_doc_idx', 'doc', postgresql_using='gin'),
+        Index('searchquery_value_id_idx', 'value', 'id'),
+        Index('searchquery_value_trgm_idx', 'value', postgresql_using='gin', postgresql_ops={'value': 'gin_trgm_ops'}),
     )
     table.UNIQUE_KEY_NAME = SEARCH_QUERY_TABLE_UNIQUE_KEY_NAME
 
@@ -43,12 +47,15 @@ def create_search_query_daily_stat_table() -> Table:
         Column('id', BigIntegerType(), primary_key=True, autoincrement=True),
         Column('day', DateType(), primary_key=True, default=calendarutil.now, server_default=sa.text('date_trunc(\'day\', now())::date'), nullable=False),
         Column('requests_per_week', IntegerType(), default=0, server_default=sa.text('\'0\'::int'), nullable=False),
+        Column('requests_per_month', IntegerType(), default=0, server_default=sa.text('\'0\'::int'), nullable=False),
+        Column('requests_per_three_months', IntegerType(), default=0, server_default=sa.text('\'0\'::int'), nullable=False),
         Column('searchquery_id', ForeignKey('searchquery.id', name='searchquerydailystat_searchquery_id_fkey'), nullable=False),
         PrimaryKeyConstraint('id', 'day', name=f'searchquerydailystat_pkey'),
         UniqueConstraint('day', 'searchquery_id', name=SEARCH_QUERY_DAILY_STATS_TABLE_NAME),
         Index('searchquerydailystat_id_idx', asc('id').nulls_last()),
         Index('searchquerydailystat_day_idx', asc('day').nulls_last()),
         Index('searchquerydailystat_requests_per_week_day_idx', desc('requests_per_week').nulls_first(), asc('day').nulls_last()),
+        Index('searchquerydailystat_day_requests_per_week_searchquery_id_idx', 'day', 'requests_per_week', 'searchquery_id'),
         postgresql_partition_by='RANGE (day)',
     )
     table.UNIQUE_KEY_NAME = SEARCH_QUERY_DAILY_STATS_TABLE_NAME
@@ -63,12 +70,15 @@ def create_search_query_daily_stat_tpl_table() -> Table:
         Column('id', BigIntegerType(), primary_key=True, autoincrement=True),
         Column('day', DateType(), primary_key=True, default=calendarutil.now, server_default=sa.text('date_trunc(\'day\', now())::date'), nullable=False),
         Column('requests_per_week', IntegerType(), default=0, server_default=sa.text('\'0\'::int'), nullable=False),
+        Column('requests_per_month', IntegerType(), default=0, server_default=sa.text('\'0\'::int'), nullable=False),
+        Column('requests_per_three_months', IntegerType(), default=0, server_default=sa.text('\'0\'::int'), nullable=False),
         Column('searchquery_id', ForeignKey('searchquery.id', name='searchquerydailystat_tpl_searchquery_id_fkey'), nullable=False),
         PrimaryKeyConstraint('id', 'day', name='searchquerydailystat_tpl_pkey'),
         UniqueConstraint('day', 'searchquery_id', name=SEARCH_QUERY_DAILY_STATS_TPL_TABLE_UNIQUE_KEY),
         Index('searchquerydailystat_tpl_id_idx', asc('id').nulls_last()),
         Index('searchquerydailystat_tpl_day_idx', asc('day').nulls_last()),
         Index('searchquerydailystat_tpl_requests_per_week_day_idx', desc('requests_per_week').nulls_first(), asc('day').nulls_last()),
+        Index('searchquerydailystat_tpl_day_requests_per_week_searchquery_id_idx', 'day', 'requests_per_week', 'searchquery_id'),
         postgresql_partition_by='RANGE (day)',
     )
     table.UNIQUE_KEY_NAME = SEARCH_QUERY_DAILY_STATS_TPL_TABLE_UNIQUE_KEY
@@ -76,13 +86,75 @@ def create_search_query_daily_stat_tpl_table() -> Table:
     return table
 
 
+def create_search_query_daily_stat_staging_table() -> Table:
+    # Промежуточная таблица для COPY загрузки, данные из нее переносятся
+    # в searchquerydailystat и удаляются в рамках одной транзакции
+    table = Table(
+        SEARCH_QUERY_DAILY_STATS_STAGING_TABLE_NAME,
+        mapper_registry.metadata,
+        Column('batch_id', UUIDType(as_uuid=True), nullable=False),
+        Column('day', DateType(), nullable=False),
+        Column('requests_per_week', IntegerType(), nullable=True),
+        Column('requests_per_month', IntegerType(), nullable=True),
+        Column('requests_per_three_months', IntegerType(), nullable=True),
+        Column('searchquery_id', BigIntegerType(), nullable=False),
+        Index('searchquerydailystat_staging_batch_id_day_idx', 'batch_id', 'day'),
+        prefixes=['UNLOGGED'],
+    )
+
+    return table
+
+
+def create_search_query_daily_rank_table() -> Table:
+    table = Table(
+        SEARCH_QUERY_DAILY_RANK_TABLE_NAME,
+        mapper_registry.metadata,
+        Column('day', DateType(), nullable=False),
+        Column('rank', IntegerType(), nullable=False),
+        Column('searchquery_id', ForeignKey('searchquery.id', name='searchquerydailyrank_searchquery_id_fkey'), nullable=False),
+        Column('requests_per_week', IntegerType(), default=0, server_default=sa.text('\'0\'::int'), nullable=False),
+        Column('rank_delta', IntegerType(), nullable=True),
+        PrimaryKeyConstraint('day', 'rank', name='searchquerydailyrank_pkey'),
+        UniqueConstraint('day', 'searchquery_id', name=SEARCH_QUERY_DAILY_RANK_TABLE_UNIQUE_KEY_NAME),
+        postgresql_partition_by='RANGE (day)',
+    )
+    table.UNIQUE_KEY_NAME = SEARCH_QUERY_DAILY_RANK_TABLE_UNIQUE_KEY_NAME
+
+    return table
+
+
+def create_search_query_rollup_stat_table(name: str) -> Table:
+    # day - первый день недели или месяца, last_day - день, значения
+    # которого записаны: последний загруженный день периода
+    table = Table(
+        name,
+        mapper_registry.metadata,
+        Column('day', DateType(), nullable=False),
+        Column('last_day', DateType(), nullable=False),
+        Column('requests_per_week', IntegerType(), default=0, server_default=sa.text('\'0\'::int'), nullable=False),
+        Column('requests_per_month', IntegerType(), default=0, server_default=sa.text('\'0\'::int'), nullable=False),
+        Column('requests_per_three_months', IntegerType(), default=0, server_default=sa.text('\'0\'::int'), nullable=False),
+        Column('searchquery_id', ForeignKey('searchquery.id', name=f'{name}_searchquery_id_fkey'), nullable=False),
+        # Ряд одного запроса читается диапазоном ключа без просмотра других запросов
+        PrimaryKeyConstraint('searchquery_id', 'day', name=f'{name}_pkey'),
+        Index(f'{name}_day_idx', 'day'),
+        postgresql_partition_by='RANGE (day)',
+    )
+    table.UNIQUE_KEY_NAME = f'{name}_pkey'
+
+    return table
+
+
 def create_requests_total_by_day_table() -> Table:
     table = Table(
         REQUESTS_TOTAL_BY_DAY_TABLE_NAME,
         mapper_registry.metadata,
         Column('id', BigIntegerType(), primary_key=True, autoincrement=True),
         Column('day', DateType(), default=calendarutil.now, server_default=sa.text('date_trunc(\'day\', now())::date'), nullable=False),
-        Column('total_requests_per_week', IntegerType(), default=0, server_default=sa.text('\'0\'::int'), nullable=False),
+        Column('total_requests_per_week', BigIntegerType(), default=0, server_default=sa.text('\'0\'::bigint'), nullable=False),
+        Column('queries_count', IntegerType(), default=0, server_default=sa.text('\'0\'::int'), nullable=False),
+        Column('min_requests_per_week', IntegerType(), nullable=True),
+        Column('max_requests_per_week', IntegerType(), nullable=True),
         PrimaryKeyConstraint('id', name='requeststotalbyday_pkey'),
         UniqueConstraint('day', name=REQUESTS_TOTAL_BY_DAY_TABLE_UNIQUE_KEY_NAME),
         Index('requeststotalbyday_id_idx', asc('id').nulls_last()),
@@ -93,6 +165,24 @@ def create_requests_total_by_day_table() -> Table:
     return table
 
 
+def create_report_ingest_checkpoint_table() -> Table:
+    table = Table(
+        REPORT_INGEST_CHECKPOINT_TABLE_NAME,
+        mapper_registry.metadata,
+        Column('id', BigIntegerType(), primary_key=True, autoincrement=True),
+        Column('report_file_path', TextType(), nullable=False),
+        Column('period', TextType(), nullable=False),
+        Column('chunk_size', IntegerType(), nullable=False),
+        Column('chunk_index', IntegerType(), nullable=False),
+        Column('created_at', DateTimeType(timezone=True), default=calendarutil.now, server_default=sa.text('now()'), nullable=False),
+        PrimaryKeyConstraint('id', name='reportingestcheckpoint_pkey'),
+        UniqueConstraint('report_file_path', 'period', 'chunk_size', 'chunk_index', name=REPORT_INGEST_CHECKPOINT_TABLE_UNIQUE_KEY_NAME),
+    )
+    table.UNIQUE_KEY_NAME = REPORT_INGEST_CHECKPOINT_TABLE_UNIQUE_KEY_NAME
+
+    return table
+
+
 class TableFactory:
     def create_table(self, name: str) -> Optional[Table]:
         if name in mapper_registry.metadata.tables:
@@ -104,8 +194,16 @@ class TableFactory:
             return create_search_query_daily_stat_table()
         if name == SEARCH_QUERY_DAILY_STATS_TPL_TABLE_NAME:
             return create_search_query_daily_stat_tpl_table()
+        if name == SEARCH_QUERY_DAILY_STATS_STAGING_TABLE_NAME:
+            return create_search_query_daily_stat_staging_table()
+        if name == SEARCH_QUERY_DAILY_RANK_TABLE_NAME:
+            return create_search_query_daily_rank_table()
+        if name in (SEARCH_QUERY_WEEKLY_STATS_TABLE_NAME, SEARCH_QUERY_MONTHLY_STATS_TABLE_NAME):
+            return create_search_query_rollup_stat_table(name)
         if name == REQUESTS_TOTAL_BY_DAY_TABLE_NAME:
             return create_requests_total_by_day_table()
+        if name == REPORT_INGEST_CHECKPOINT_TABLE_NAME:
+            return create_report_ingest_checkpoint_table()
 
 
 def init_default_tables():
@@ -113,7 +211,12 @@ def init_default_tables():
     table_factory.create_table(SEARCH_QUERY_TABLE_NAME)
     table_factory.create_table(SEARCH_QUERY_DAILY_STATS_TABLE_NAME)
     table_factory.create_table(SEARCH_QUERY_DAILY_STATS_TPL_TABLE_NAME)
+    table_factory.create_table(SEARCH_QUERY_DAILY_STATS_STAGING_TABLE_NAME)
+    table_factory.create_table(SEARCH_QUERY_DAILY_RANK_TABLE_NAME)
+    table_factory.create_table(SEARCH_QUERY_WEEKLY_STATS_TABLE_NAME)
+    table_factory.create_table(SEARCH_QUERY_MONTHLY_STATS_TABLE_NAME)
     table_factory.create_table(REQUESTS_TOTAL_BY_DAY_TABLE_NAME)
+    table_factory.create_table(REPORT_INGEST_CHECKPOINT_TABLE_NAME)
 
 
 '''
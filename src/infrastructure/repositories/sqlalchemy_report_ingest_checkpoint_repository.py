@@ -0,0 +1,129 @@
+from typing import List, Optional, Set
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.sql.expression import asc, delete, func, select
+
+from application.interfaces.report_ingest_checkpoint_repository_interface import (
+    IReportIngestCheckpointRepository,
+)
+from domain.enums.report_period_enum import ReportPeriod
+
+from .sqlalchemy_constants import REPORT_INGEST_CHECKPOINT_TABLE_NAME
+from .sqlalchemy_orm import TableFactory
+
+
+class SQLAlchemyReportIngestCheckpointRepository(IReportIngestCheckpointRepository):
+    def __init__(self, session):
+        self._table_factory = TableFactory()
+        self.session = session
+
+    async def list(
+        self,
+        report_file_path: Optional[str] = None,
+        period: Optional[ReportPeriod] = None,
+    ) -> List[dict]:
+        table = self._table_factory.create_table(REPORT_INGEST_CHECKPOINT_TABLE_NAME)
+
+        query = (
+            select(
+                table.c.report_file_path,
+                table.c.period,
+                table.c.chunk_size,
+                func.count(table.c.id).label('chunks_committed'),
+                func.max(table.c.chunk_index).label('last_chunk_index'),
+                func.max(table.c.created_at).label('updated_at'),
+            )
+            .select_from(table)
+            .group_by(
+                table.c.report_file_path,
+                table.c.period,
+                table.c.chunk_size,
+            )
+            .order_by(asc(table.c.report_file_path))
+        )
+        query = self._filter(query, table, report_file_path, period)
+
+        async with self.session() as session:
+            return [{
+                'report_file_path': row.report_file_path,
+                'period': row.period,
+                'chunk_size': row.chunk_size,
+                'chunks_committed': row.chunks_committed,
+                'last_chunk_index': row.last_chunk_index,
+                'updated_at': row.updated_at,
+            } for row in await session.execute(query)]
+
+    async def get_committed_chunks(
+        self,
+        report_file_path: str,
+        period: ReportPeriod,
+        chunk_size: int,
+    ) -> Set[int]:
+        table = self._table_factory.create_table(REPORT_INGEST_CHECKPOINT_TABLE_NAME)
+
+        query = (
+            select(
+                table.c.chunk_index,
+            )
+            .select_from(table)
+            .where(
+                  (table.c.report_file_path == report_file_path)
+                & (table.c.period == period.value)
+                & (table.c.chunk_size == chunk_size)
+            )
+        )
+
+        async with self.session() as session:
+            return {row[0] for row in await session.execute(query)}
+
+    async def create(
+        self,
+        report_file_path: str,
+        period: ReportPeriod,
+        chunk_size: int,
+        chunk_index: int,
+    ) -> None:
+        table = self._table_factory.create_table(REPORT_INGEST_CHECKPOINT_TABLE_NAME)
+
+        stmt = (
+            insert(table)
+            .values({
+                'report_file_path': report_file_path,
+                'period': period.value,
+                'chunk_size': chunk_size,
+                'chunk_index': chunk_index,
+            })
+            .on_conflict_do_nothing(
+                constraint=table.UNIQUE_KEY_NAME,
+            )
+        )
+        async with self.session() as session:
+            await session.execute(stmt)
+            await session.commit()
+
+    async def delete(
+        self,
+        report_file_path: Optional[str] = None,
+        period: Optional[ReportPeriod] = None,
+    ) -> int:
+        table = self._table_factory.create_table(REPORT_INGEST_CHECKPOINT_TABLE_NAME)
+
+        stmt = self._filter(delete(table), table, report_file_path, period)
+
+        async with self.session() as session:
+            result = await session.execute(stmt)
+            await session.commit()
+
+        return result.rowcount
+
+    def _filter(self, query, table, report_file_path: Optional[str], period: Optional[ReportPeriod]):
+        if report_file_path is not None:
+            query = query.where(
+                (table.c.report_file_path == report_file_path)
+            )
+        if period is not None:
+            query = query.where(
+                (table.c.period == period.value)
+            )
+
+        return query
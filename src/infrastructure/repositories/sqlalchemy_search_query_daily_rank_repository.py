@@ -0,0 +1,119 @@
+from datetime import date, timedelta
+from typing import AsyncIterator, Optional, Tuple
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.sql.expression import delete, desc, func, select
+
+from application.interfaces.search_query_daily_rank_repository_interface import (
+    ISearchQueryDailyRankRepository,
+)
+
+from .sqlalchemy_constants import (
+    SEARCH_QUERY_DAILY_RANK_TABLE_NAME, SEARCH_QUERY_DAILY_STATS_TABLE_NAME,
+)
+from .sqlalchemy_orm import TableFactory
+
+
+class SQLAlchemySearchQueryDailyRankRepository(ISearchQueryDailyRankRepository):
+    def __init__(self, session):
+        self._table_factory = TableFactory()
+        self.session = session
+
+    async def calculate_ranks(self, day: date) -> None:
+        search_query_daily_rank_table = self._table_factory.create_table(SEARCH_QUERY_DAILY_RANK_TABLE_NAME)
+        search_query_daily_stat_table = self._table_factory.create_table(SEARCH_QUERY_DAILY_STATS_TABLE_NAME)
+
+        # Места без пропусков: при равной частоте выше запрос с большим id,
+        # как и при сортировке по searchquerydailystat
+        ranked = (
+            select(
+                search_query_daily_stat_table.c.day,
+                func.row_number().over(
+                    order_by=(
+                        desc(search_query_daily_stat_table.c.requests_per_week),
+                        desc(search_query_daily_stat_table.c.searchquery_id),
+                    ),
+                ).label('rank'),
+                search_query_daily_stat_table.c.searchquery_id,
+                search_query_daily_stat_table.c.requests_per_week,
+            )
+            .select_from(search_query_daily_stat_table)
+            .where(
+                (search_query_daily_stat_table.c.day == day)
+            )
+            .subquery('ranked')
+        )
+
+        previous_rank_table = search_query_daily_rank_table.alias('previous')
+
+        # rank_delta > 0 - запрос поднялся относительно предыдущего дня,
+        # NULL - накануне запроса не было
+        select_stmt = (
+            select(
+                ranked.c.day,
+                ranked.c.rank,
+                ranked.c.searchquery_id,
+                ranked.c.requests_per_week,
+                previous_rank_table.c.rank - ranked.c.rank,
+            )
+            .select_from(ranked)
+            .outerjoin(
+                previous_rank_table,
+                  (previous_rank_table.c.day == day - timedelta(days=1))
+                & (previous_rank_table.c.searchquery_id == ranked.c.searchquery_id)
+            )
+        )
+
+        async with self.session() as session:
+            await session.execute(
+                delete(search_query_daily_rank_table)
+                .where(
+                    (search_query_daily_rank_table.c.day == day)
+                )
+            )
+            await session.execute(
+                insert(search_query_daily_rank_table)
+                .from_select(
+                    ['day', 'rank', 'searchquery_id', 'requests_per_week', 'rank_delta'],
+                    select_stmt,
+                )
+            )
+            await session.commit()
+
+    async def get_last_day(self) -> Optional[date]:
+        search_query_daily_rank_table = self._table_factory.create_table(SEARCH_QUERY_DAILY_RANK_TABLE_NAME)
+
+        query = (
+            select(
+                func.max(search_query_daily_rank_table.c.day),
+            )
+            .select_from(search_query_daily_rank_table)
+        )
+
+        async with self.session() as session:
+            return await session.scalar(query)
+
+    async def iter_requests(
+        self,
+        day: date,
+        batch_size: int = 10000,
+    ) -> AsyncIterator[Tuple[int, int]]:
+        search_query_daily_rank_table = self._table_factory.create_table(SEARCH_QUERY_DAILY_RANK_TABLE_NAME)
+
+        query = (
+            select(
+                search_query_daily_rank_table.c.searchquery_id,
+                search_query_daily_rank_table.c.requests_per_week,
+            )
+            .select_from(search_query_daily_rank_table)
+            .where(
+                (search_query_daily_rank_table.c.day == day)
+            )
+            .execution_options(yield_per=batch_size)
+        )
+
+        # Серверный курсор: в памяти одновременно не больше batch_size строк
+        async with self.session() as session:
+            result = await session.stream(query)
+            async for row in result:
+                yield row[0], row[1]
@@ -0,0 +1,61 @@
+import uuid
+from typing import List
+from uuid import UUID
+
+from .sqlalchemy_constants import SEARCH_QUERY_DAILY_STATS_STAGING_TABLE_NAME
+from .sqlalchemy_search_query_daily_stats_repository import (
+    REQUESTS_COLUMNS, SQLAlchemySearchQueryDailyStatsRepository,
+)
+
+
+class SQLAlchemySearchQueryDailyStatsCopyRepository(SQLAlchemySearchQueryDailyStatsRepository):
+    """
+    Репозиторий статистики с загрузкой через COPY.
+
+    Строки пачки передаются в UNLOGGED таблицу searchquerydailystat_staging
+    через asyncpg copy_records_to_table, после чего переносятся в
+    секционированную таблицу searchquerydailystat одним INSERT ... SELECT
+    на каждый день. Требует драйвер postgresql+asyncpg.
+    """
+    STAGING_COLUMNS = ('batch_id', 'day', 'searchquery_id', *REQUESTS_COLUMNS)
+
+    async def bulk_create(self, insert_obj_list: List[dict]) -> None:
+        if not insert_obj_list:
+            return
+
+        batch_id = uuid.uuid4()
+
+        # Обновляются только переданные поля, данные других периодов сохраняются
+        first_insert_obj = insert_obj_list[0]
+        columns = [
+            column
+            for column in REQUESTS_COLUMNS
+            if first_insert_obj.get(column) is not None
+        ]
+
+        async with self._session() as session:
+            await self._stage(session, batch_id, insert_obj_list)
+            await self._merge_staged(
+                session,
+                batch_id,
+                (insert_obj['day'] for insert_obj in insert_obj_list),
+                columns,
+            )
+            await session.commit()
+
+    async def _stage(self, session, batch_id: UUID, insert_obj_list: List[dict]) -> None:
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+
+        await raw_connection.driver_connection.copy_records_to_table(
+            SEARCH_QUERY_DAILY_STATS_STAGING_TABLE_NAME,
+            records=[
+                (
+                    batch_id,
+                    insert_obj['day'],
+                    insert_obj['searchquery_id'],
+                    *[insert_obj.get(column) for column in REQUESTS_COLUMNS],
+                ) for insert_obj in insert_obj_list
+            ],
+            columns=self.STAGING_COLUMNS,
+        )
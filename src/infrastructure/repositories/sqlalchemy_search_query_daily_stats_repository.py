@@ -1,8 +1,13 @@
 from datetime import date
-from typing import List
+from typing import (
+    AsyncIterator, Awaitable, Callable, Iterable, List, Optional,
+)
+from uuid import UUID
 
 from sqlalchemy.dialects.postgresql import insert
-from sqlalchemy.sql.expression import asc, between, select
+from sqlalchemy.sql.expression import (
+    asc, between, delete, func, null, select,
+)
 
 from application.interfaces.search_query_daily_stats_repository_interface import (
     ISearchQueryDailyStatsRepository,
@@ -10,12 +15,27 @@ from application.interfaces.search_query_daily_stats_repository_interface import
 from domain.entities.search_query_daily_stats_entity import (
     SearchQueryDailyStatsEntity,
 )
+from domain.enums.granularity_enum import Granularity
 
 from .sqlalchemy_constants import (
-    SEARCH_QUERY_DAILY_STATS_TABLE_NAME, SEARCH_QUERY_TABLE_NAME,
+    SEARCH_QUERY_DAILY_STATS_STAGING_TABLE_NAME,
+    SEARCH_QUERY_DAILY_STATS_TABLE_NAME, SEARCH_QUERY_MONTHLY_STATS_TABLE_NAME,
+    SEARCH_QUERY_TABLE_NAME, SEARCH_QUERY_WEEKLY_STATS_TABLE_NAME,
 )
 from .sqlalchemy_orm import TableFactory
 
+REQUESTS_COLUMNS = (
+    'requests_per_week',
+    'requests_per_month',
+    'requests_per_three_months',
+)
+
+STATS_TABLE_NAMES = {
+    Granularity.DAY: SEARCH_QUERY_DAILY_STATS_TABLE_NAME,
+    Granularity.WEEK: SEARCH_QUERY_WEEKLY_STATS_TABLE_NAME,
+    Granularity.MONTH: SEARCH_QUERY_MONTHLY_STATS_TABLE_NAME,
+}
+
 
 class SQLAlchemySearchQueryDailyStatsRepository(ISearchQueryDailyStatsRepository):
     def __init__(self, session):
@@ -27,37 +47,126 @@ class SQLAlchemySearchQueryDailyStatsRepository(ISearchQueryDailyStatsRepository
         search_query_ids: List[int],
         from_date: date,
         to_date: date,
+        granularity: Granularity = Granularity.DAY,
     ) -> List[SearchQueryDailyStatsEntity]:
+        search_query_table = self._table_factory.create_table(SEARCH_QUERY_TABLE_NAME)
+        stats_table = self._table_factory.create_table(STATS_TABLE_NAMES[granularity])
+
+        # В свертках day - первый день периода, период from_date входит целиком
+        query = (
+            select(
+                stats_table.c.id if granularity == Granularity.DAY else null(),
+                stats_table.c.day,
+                search_query_table.c.value,
+                stats_table.c.requests_per_week,
+                stats_table.c.requests_per_month,
+                stats_table.c.requests_per_three_months,
+                search_query_table.c.id,
+            )
+            .select_from(stats_table)
+            .join(search_query_table, search_query_table.c.id == stats_table.c.searchquery_id)
+            .where(
+                  (stats_table.c.searchquery_id.in_(search_query_ids))
+                & (between(stats_table.c.day, granularity.truncate(from_date), to_date))
+            )
+            .order_by(asc(stats_table.c.day))
+        )
+
+        async with self._session() as session:
+            return [
+                SearchQueryDailyStatsEntity(
+                    id=row[0],
+                    day=row[1],
+                    value=row[2],
+                    requests_per_week=row[3],
+                    requests_per_month=row[4],
+                    requests_per_three_months=row[5],
+                    searchquery_id=row[6],
+                ) for row in await session.execute(query)
+            ]
+
+    async def iter_day(
+        self,
+        day: date,
+        batch_size: int = 10000,
+    ) -> AsyncIterator[SearchQueryDailyStatsEntity]:
         search_query_table = self._table_factory.create_table(SEARCH_QUERY_TABLE_NAME)
         search_query_daily_stat_table = self._table_factory.create_table(SEARCH_QUERY_DAILY_STATS_TABLE_NAME)
 
+        # Без ORDER BY: строки отдаются по мере чтения секции, а не после сортировки
         query = (
             select(
                 search_query_daily_stat_table.c.id,
                 search_query_daily_stat_table.c.day,
                 search_query_table.c.value,
                 search_query_daily_stat_table.c.requests_per_week,
+                search_query_daily_stat_table.c.requests_per_month,
+                search_query_daily_stat_table.c.requests_per_three_months,
                 search_query_table.c.id,
             )
             .select_from(search_query_daily_stat_table)
             .join(search_query_table, search_query_table.c.id == search_query_daily_stat_table.c.searchquery_id)
             .where(
-                  (search_query_daily_stat_table.c.searchquery_id.in_(search_query_ids))
-                & (between(search_query_daily_stat_table.c.day, from_date, to_date))
+                (search_query_daily_stat_table.c.day == day)
             )
-            .order_by(asc(search_query_daily_stat_table.c.day))
+            .execution_options(yield_per=batch_size)
         )
 
+        # Серверный курсор: в памяти одновременно не больше batch_size строк
         async with self._session() as session:
-            return [
-                SearchQueryDailyStatsEntity(
+            result = await session.stream(query)
+            async for row in result:
+                yield SearchQueryDailyStatsEntity(
                     id=row[0],
                     day=row[1],
                     value=row[2],
                     requests_per_week=row[3],
-                    searchquery_id=row[4],
-                ) for row in await session.execute(query)
-            ]
+                    requests_per_month=row[4],
+                    requests_per_three_months=row[5],
+                    searchquery_id=row[6],
+                )
+
+    async def copy_days(
+        self,
+        days: Iterable[date],
+        output: Callable[[bytes], Awaitable[None]],
+    ) -> None:
+        """
+        Выгружает статистику за дни в CSV через COPY (SELECT ...) TO STDOUT.
+
+        Куски CSV передаются в output по мере получения от сервера, без
+        разбора строк в Python. Требует драйвер postgresql+asyncpg.
+        """
+        search_query_table = self._table_factory.create_table(SEARCH_QUERY_TABLE_NAME)
+        search_query_daily_stat_table = self._table_factory.create_table(SEARCH_QUERY_DAILY_STATS_TABLE_NAME)
+
+        query = (
+            select(
+                search_query_daily_stat_table.c.searchquery_id.label('id'),
+                search_query_table.c.value.label('text'),
+                search_query_daily_stat_table.c.day.label('date'),
+                *[search_query_daily_stat_table.c[column] for column in REQUESTS_COLUMNS],
+            )
+            .select_from(search_query_daily_stat_table)
+            .join(search_query_table, search_query_table.c.id == search_query_daily_stat_table.c.searchquery_id)
+            .where(
+                (search_query_daily_stat_table.c.day.in_(sorted(set(days))))
+            )
+        )
+
+        async with self._session() as session:
+            connection = await session.connection()
+            raw_connection = await connection.get_raw_connection()
+
+            # COPY не принимает параметры, значения дат подставляются в текст запроса
+            sql = str(query.compile(dialect=connection.dialect, compile_kwargs={'literal_binds': True}))
+
+            await raw_connection.driver_connection.copy_from_query(
+                sql,
+                output=output,
+                format='csv',
+                header=True,
+            )
 
     async def bulk_create(self, insert_obj_list: List[dict]) -> None:
         table = self._table_factory.create_table(SEARCH_QUERY_DAILY_STATS_TABLE_NAME)
@@ -65,20 +174,132 @@ class SQLAlchemySearchQueryDailyStatsRepository(ISearchQueryDailyStatsRepository
         if not insert_obj_list:
             return
 
-        update_columns = {}
+        stmt = insert(table).values(insert_obj_list)
 
+        # Обновляются только переданные поля, данные других периодов сохраняются
         first_insert_obj = insert_obj_list[0]
-        if first_insert_obj['requests_per_week'] is not None:
-            update_columns['requests_per_week'] = table.c.requests_per_week
+        update_columns = {
+            column: stmt.excluded[column]
+            for column in REQUESTS_COLUMNS
+            if first_insert_obj.get(column) is not None
+        }
 
-        stmt = (
-            insert(table)
-            .values(insert_obj_list)
-            .on_conflict_do_update(
-                constraint=table.UNIQUE_KEY_NAME,
+        if update_columns:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['day', 'searchquery_id'],
                 set_=update_columns,
             )
-        )
+        else:
+            stmt = stmt.on_conflict_do_nothing(
+                index_elements=['day', 'searchquery_id'],
+            )
+
         async with self._session() as session:
             await session.execute(stmt)
             await session.commit()
+
+    async def stage(self, batch_id: UUID, insert_obj_list: List[dict]) -> None:
+        if not insert_obj_list:
+            return
+
+        async with self._session() as session:
+            await self._stage(session, batch_id, insert_obj_list)
+            await session.commit()
+
+    async def merge_staged(
+        self,
+        batch_id: UUID,
+        days: Iterable[date],
+        columns: Optional[Iterable[str]] = None,
+    ) -> None:
+        if columns is None:
+            columns = REQUESTS_COLUMNS
+
+        async with self._session() as session:
+            await self._merge_staged(session, batch_id, days, columns)
+            await session.commit()
+
+    async def delete_staged(self, batch_id: UUID) -> None:
+        async with self._session() as session:
+            await self._delete_staged(session, batch_id)
+            await session.commit()
+
+    async def _stage(self, session, batch_id: UUID, insert_obj_list: List[dict]) -> None:
+        staging_table = self._table_factory.create_table(SEARCH_QUERY_DAILY_STATS_STAGING_TABLE_NAME)
+
+        await session.execute(
+            insert(staging_table),
+            [{
+                'batch_id': batch_id,
+                'day': insert_obj['day'],
+                'searchquery_id': insert_obj['searchquery_id'],
+                **{column: insert_obj.get(column) for column in REQUESTS_COLUMNS},
+            } for insert_obj in insert_obj_list],
+        )
+
+    async def _merge_staged(self, session, batch_id: UUID, days: Iterable[date], columns: Iterable[str]) -> None:
+        table = self._table_factory.create_table(SEARCH_QUERY_DAILY_STATS_TABLE_NAME)
+        staging_table = self._table_factory.create_table(SEARCH_QUERY_DAILY_STATS_STAGING_TABLE_NAME)
+
+        columns = list(columns)
+
+        # Одна операция INSERT ... SELECT на каждый день
+        for day in sorted(set(days)):
+            await session.execute(self._get_merge_stmt(table, staging_table, batch_id, day, columns))
+
+        await self._delete_staged(session, batch_id)
+
+    async def _delete_staged(self, session, batch_id: UUID) -> None:
+        staging_table = self._table_factory.create_table(SEARCH_QUERY_DAILY_STATS_STAGING_TABLE_NAME)
+
+        await session.execute(
+            delete(staging_table)
+            .where(
+                (staging_table.c.batch_id == batch_id)
+            )
+        )
+
+    def _get_merge_stmt(self, table, staging_table, batch_id: UUID, day: date, columns: List[str]):
+        # GROUP BY объединяет строки одного запроса из разных отчетов и
+        # защищает от повторов, иначе ON CONFLICT DO UPDATE упадет
+        # на повторном изменении строки
+        select_stmt = (
+            select(
+                staging_table.c.day,
+                staging_table.c.searchquery_id,
+                *[
+                    func.coalesce(func.max(staging_table.c[column]), 0)
+                    for column in REQUESTS_COLUMNS
+                ],
+            )
+            .select_from(staging_table)
+            .where(
+                  (staging_table.c.batch_id == batch_id)
+                & (staging_table.c.day == day)
+            )
+            .group_by(
+                staging_table.c.day,
+                staging_table.c.searchquery_id,
+            )
+        )
+
+        stmt = (
+            insert(table)
+            .from_select(
+                ['day', 'searchquery_id', *REQUESTS_COLUMNS],
+                select_stmt,
+            )
+        )
+
+        if not columns:
+            return stmt.on_conflict_do_nothing(
+                index_elements=['day', 'searchquery_id'],
+            )
+
+        return stmt.on_conflict_do_update(
+            index_elements=['day', 'searchquery_id'],
+            set_={
+                column: stmt.excluded[column]
+                for column in columns
+            },
+        )
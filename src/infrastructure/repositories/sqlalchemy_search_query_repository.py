@@ -1,18 +1,34 @@
 from datetime import date
-from typing import List, Optional
+from typing import (
+    AsyncIterator, Callable, Dict, Iterable, List, Optional, Sequence, Tuple,
+)
 
-from sqlalchemy.dialects.postgresql import insert
-from sqlalchemy.sql.expression import asc, desc, select
+from sqlalchemy.dialects.postgresql import (
+    REGCONFIG, aggregate_order_by, insert,
+)
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.expression import (
+    any_, asc, between, bindparam, cast, desc, func, null, select, true,
+    tuple_,
+)
 
 from application.interfaces.search_query_repository_interface import (
     ISearchQueryRepository,
 )
 from domain.entities.search_query_entity import SearchQueryEntity
+from domain.entities.search_query_page_entity import SearchQueryPageEntity
+from domain.entities.search_query_statistics_entity import (
+    SearchQueryStatisticsEntity,
+)
+from domain.enums.granularity_enum import Granularity
+from domain.enums.search_mode_enum import SearchMode
 
 from .sqlalchemy_constants import (
-    SEARCH_QUERY_DAILY_STATS_TABLE_NAME, SEARCH_QUERY_TABLE_NAME,
+    SEARCH_QUERY_DAILY_RANK_TABLE_NAME, SEARCH_QUERY_TABLE_NAME,
 )
 from .sqlalchemy_orm import TableFactory
+from .sqlalchemy_search_query_daily_stats_repository import STATS_TABLE_NAMES
+from .sqlalchemy_types import ArrayType, TextType
 
 
 class SQLAlchemySearchQueryRepository(ISearchQueryRepository):
@@ -51,55 +67,249 @@ class SQLAlchemySearchQueryRepository(ISearchQueryRepository):
             search_query.id = search_query_id
 
     async def get_query_by_value(self, value: str) -> Optional[SearchQueryEntity]:
-        return None
+        search_queries = await self.get_queries_by_values([value])
+
+        return search_queries.get(value)
+
+    async def get_queries_by_values(self, values: Iterable[str]) -> Dict[str, SearchQueryEntity]:
+        table = self._table_factory.create_table(SEARCH_QUERY_TABLE_NAME)
+
+        values = list(set(values))
+        if not values:
+            return {}
+
+        # Массив передается одним параметром: value = ANY(:values)
+        query = (
+            select(
+                table.c.id,
+                table.c.value,
+            )
+            .select_from(table)
+            .where(
+                (table.c.value == any_(bindparam('values', values, type_=ArrayType(TextType()))))
+            )
+        )
+
+        async with self.session() as session:
+            return {
+                row[1]: SearchQueryEntity(
+                    id=row[0],
+                    value=row[1],
+                ) for row in await session.execute(query)
+            }
+
+    async def iter_values(self, batch_size: int = 10000, min_id: int = 0) -> AsyncIterator[Tuple[str, int]]:
+        table = self._table_factory.create_table(SEARCH_QUERY_TABLE_NAME)
+
+        query = (
+            select(
+                table.c.value,
+                table.c.id,
+            )
+            .select_from(table)
+            .execution_options(yield_per=batch_size)
+        )
+
+        # Только запросы, добавленные после уже загруженных
+        if min_id:
+            query = query.where(table.c.id > min_id)
+
+        # Серверный курсор: в памяти одновременно не больше batch_size строк
+        async with self.session() as session:
+            result = await session.stream(query)
+            async for row in result:
+                yield row[0], row[1]
 
     async def list(
         self,
         search_query_ids: Optional[List[int]] = None,
         search: Optional[str] = None,
+        search_mode: SearchMode = SearchMode.FULLTEXT,
         target_day: Optional[date] = None,
         sort_by: str = 'day',
         sort_dir: str = 'desc',
         limit: int = 100,
         offset: int = 0,
     ) -> List[SearchQueryEntity]:
-        search_query_table = self._table_factory.create_table(SEARCH_QUERY_TABLE_NAME)
-        search_query_daily_stat_table = self._table_factory.create_table(SEARCH_QUERY_DAILY_STATS_TABLE_NAME)
+        page = await self.list_page(
+            search_query_ids=search_query_ids,
+            search=search,
+            search_mode=search_mode,
+            target_day=target_day,
+            sort_by=sort_by,
+            sort_dir=sort_dir,
+            limit=limit,
+        )
+
+        return page.items
+
+    async def list_page(
+        self,
+        search_query_ids: Optional[List[int]] = None,
+        search: Optional[str] = None,
+        search_mode: SearchMode = SearchMode.FULLTEXT,
+        target_day: Optional[date] = None,
+        sort_by: str = 'day',
+        sort_dir: str = 'desc',
+        limit: int = 100,
+        after: Optional[Sequence] = None,
+    ) -> SearchQueryPageEntity:
+        query, _ = self._get_page_query(search_query_ids, search, search_mode, target_day, sort_by, sort_dir, after)
+
+        async with self.session() as session:
+            rows = (await session.execute(query.limit(limit))).all()
+
+        return self._get_page(rows, limit, lambda row: SearchQueryEntity(
+            id=row.id,
+            value=row.value,
+        ))
+
+    async def list_page_with_statistics(
+        self,
+        from_date: date,
+        to_date: date,
+        search_query_ids: Optional[List[int]] = None,
+        search: Optional[str] = None,
+        search_mode: SearchMode = SearchMode.FULLTEXT,
+        target_day: Optional[date] = None,
+        sort_by: str = 'day',
+        sort_dir: str = 'desc',
+        limit: int = 100,
+        after: Optional[Sequence] = None,
+        granularity: Granularity = Granularity.DAY,
+    ) -> SearchQueryPageEntity:
+        stats_table = self._table_factory.create_table(STATS_TABLE_NAMES[granularity])
+
+        query, order_by = self._get_page_query(search_query_ids, search, search_mode, target_day, sort_by, sort_dir, after)
+        page = query.limit(limit).subquery('page')
+
+        sort_columns = [page.c.sort_key] if sort_by == 'day' else [page.c.sort_key, page.c.id]
+
+        def array_agg(column):
+            return func.array_agg(aggregate_order_by(column, stats_table.c.day))
+
+        # Статистика страницы собирается в массивы по дням тем же запросом,
+        # LATERAL выполняется для каждого из limit запросов страницы.
+        # Для недель и месяцев читается свертка: точка на период
+        statistics = (
+            select(
+                array_agg(stats_table.c.day).label('days'),
+                array_agg(stats_table.c.requests_per_week).label('requests_per_week'),
+                array_agg(stats_table.c.requests_per_month).label('requests_per_month'),
+                array_agg(stats_table.c.requests_per_three_months).label('requests_per_three_months'),
+            )
+            .select_from(stats_table)
+            .where(
+                  (stats_table.c.searchquery_id == page.c.id)
+                & (between(stats_table.c.day, granularity.truncate(from_date), to_date))
+            )
+            .lateral('statistics')
+        )
 
         query = (
             select(
-                search_query_table.c.id,
-                search_query_table.c.value,
+                page.c.id,
+                page.c.value,
+                page.c.sort_key,
+                page.c.rank,
+                page.c.rank_delta,
+                statistics.c.days,
+                statistics.c.requests_per_week,
+                statistics.c.requests_per_month,
+                statistics.c.requests_per_three_months,
             )
-            .select_from(search_query_table)
-            .limit(limit)
+            .select_from(page.outerjoin(statistics, true()))
+            .order_by(*[order_by(column) for column in sort_columns])
         )
 
+        async with self.session() as session:
+            rows = (await session.execute(query)).all()
+
+        return self._get_page(rows, limit, lambda row: SearchQueryStatisticsEntity(
+            id=row.id,
+            value=row.value,
+            rank=row.rank,
+            rank_delta=row.rank_delta,
+            days=row.days or [],
+            requests_per_week=row.requests_per_week or [],
+            requests_per_month=row.requests_per_month or [],
+            requests_per_three_months=row.requests_per_three_months or [],
+        ))
+
+    def _get_page_query(
+        self,
+        search_query_ids: Optional[List[int]],
+        search: Optional[str],
+        search_mode: SearchMode,
+        target_day: Optional[date],
+        sort_by: str,
+        sort_dir: str,
+        after: Optional[Sequence],
+    ) -> Tuple[Select, Callable]:
+        search_query_table = self._table_factory.create_table(SEARCH_QUERY_TABLE_NAME)
+        search_query_daily_rank_table = self._table_factory.create_table(SEARCH_QUERY_DAILY_RANK_TABLE_NAME)
+
+        # Keyset пагинация: страница начинается сразу после ключа (sort_key, id)
+        # последней строки предыдущей страницы, поэтому ее стоимость не зависит
+        # от глубины, в отличие от OFFSET
         if sort_by == 'day':
             if target_day is None:
                 raise Exception('target_day is not None')
 
+            # Место уникально в пределах дня, страница читается диапазоном
+            # первичного ключа (day, rank) без сортировки всей секции.
+            # Первое место - самый частый запрос, поэтому desc это rank ASC
+            sort_columns = [
+                search_query_daily_rank_table.c.rank,
+            ]
+            sort_dir = 'asc' if sort_dir != 'asc' else 'desc'
+
             query = (
-                query
-                .join(search_query_daily_stat_table, search_query_daily_stat_table.c.searchquery_id == search_query_table.c.id)
+                select(
+                    search_query_table.c.id,
+                    search_query_table.c.value,
+                    search_query_daily_rank_table.c.rank.label('sort_key'),
+                    search_query_daily_rank_table.c.rank,
+                    search_query_daily_rank_table.c.rank_delta,
+                )
+                .select_from(search_query_daily_rank_table)
+                .join(search_query_table, search_query_table.c.id == search_query_daily_rank_table.c.searchquery_id)
                 .where(
-                    (search_query_daily_stat_table.c.day == target_day)
+                    (search_query_daily_rank_table.c.day == target_day)
                 )
             )
-
-            if sort_dir == 'asc':
-                query = (
-                    query.order_by(asc(search_query_daily_stat_table.c.requests_per_week))
-                )
-            else:
-                query = (
-                    query.order_by(desc(search_query_daily_stat_table.c.requests_per_week))
-                )
         else:
+            sort_columns = [
+                search_query_table.c.value,
+                search_query_table.c.id,
+            ]
+            sort_dir = 'asc'
+
             query = (
-                query
-                .order_by(asc(search_query_table.c.value))
+                select(
+                    search_query_table.c.id,
+                    search_query_table.c.value,
+                    search_query_table.c.value.label('sort_key'),
+                    null().label('rank'),
+                    null().label('rank_delta'),
+                )
+                .select_from(search_query_table)
             )
+
+        if after is not None:
+            after = after[:len(sort_columns)]
+
+        if sort_dir == 'asc':
+            order_by = asc
+            if after is not None:
+                query = query.where(tuple_(*sort_columns) > tuple_(*after))
+        else:
+            order_by = desc
+            if after is not None:
+                query = query.where(tuple_(*sort_columns) < tuple_(*after))
+
+        query = query.order_by(*[order_by(column) for column in sort_columns])
+
         if search_query_ids:
             query = (
                 query.where(
@@ -109,15 +319,35 @@ class SQLAlchemySearchQueryRepository(ISearchQueryRepository):
         if search:
             query = (
                 query.where(
-                      (search_query_table.c.doc.match(search, postgresql_regconfig='russian'))
-                    | (search_query_table.c.doc.match(search, postgresql_regconfig='english'))
+                    self._get_search_clause(search_query_table, search, search_mode)
                 )
             )
 
-        async with self.session() as session:
-            return [
-                SearchQueryEntity(
-                    id=row[0],
-                    value=row[1],
-                ) for row in await session.execute(query)
-            ]
+        return query, order_by
+
+    def _get_search_clause(self, search_query_table, search: str, search_mode: SearchMode):
+        if search_mode == SearchMode.SUBSTRING:
+            # ILIKE '%...%' читается по GIN индексу pg_trgm, если в подстроке
+            # есть хотя бы одна триграмма (от 3 символов)
+            return search_query_table.c.value.icontains(search, autoescape=True)
+
+        if search_mode == SearchMode.SIMILARITY:
+            # Порог задает pg_trgm.similarity_threshold (0.3 по умолчанию)
+            return search_query_table.c.value.op('%')(search)
+
+        # websearch_to_tsquery принимает произвольный ввод пользователя,
+        # to_tsquery падал бы на пробелах и спецсимволах
+        return (
+              (search_query_table.c.doc.op('@@')(func.websearch_to_tsquery(cast('russian', REGCONFIG), search)))
+            | (search_query_table.c.doc.op('@@')(func.websearch_to_tsquery(cast('english', REGCONFIG), search)))
+        )
+
+    def _get_page(self, rows: list, limit: int, create_item: Callable) -> SearchQueryPageEntity:
+        page = SearchQueryPageEntity(
+            items=[create_item(row) for row in rows],
+        )
+
+        if rows and len(rows) == limit:
+            page.next_key = [rows[-1].sort_key, rows[-1].id]
+
+        return page
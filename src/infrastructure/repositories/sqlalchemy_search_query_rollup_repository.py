@@ -0,0 +1,99 @@
+from datetime import date
+
+from sqlalchemy import delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.sql.expression import between, literal, select
+
+from application.interfaces.search_query_rollup_repository_interface import (
+    ISearchQueryRollupRepository,
+)
+from domain.enums.granularity_enum import Granularity
+
+from .sqlalchemy_constants import SEARCH_QUERY_DAILY_STATS_TABLE_NAME
+from .sqlalchemy_orm import TableFactory
+from .sqlalchemy_search_query_daily_stats_repository import (
+    REQUESTS_COLUMNS, STATS_TABLE_NAMES,
+)
+from .sqlalchemy_types import DateType
+
+ROLLUP_TABLE_NAMES = {
+    granularity: table_name
+    for granularity, table_name in STATS_TABLE_NAMES.items()
+    if granularity != Granularity.DAY
+}
+
+
+class SQLAlchemySearchQueryRollupRepository(ISearchQueryRollupRepository):
+    """
+    Недельные и месячные свертки статистики.
+
+    Частоты отчета - скользящие суммы, поэтому значение за последний
+    день недели (месяца) и есть итог периода. Свертка периода целиком
+    строится по последнему загруженному дню периода: строки запросов,
+    которых в этом дне нет, удаляются, и итоги периода не смешивают дни.
+    Пересчет любого дня периода дает тот же результат.
+    """
+    def __init__(self, session):
+        self._table_factory = TableFactory()
+        self.session = session
+
+    async def calculate_rollups(self, day: date) -> None:
+        search_query_daily_stat_table = self._table_factory.create_table(SEARCH_QUERY_DAILY_STATS_TABLE_NAME)
+
+        async with self.session() as session:
+            for granularity, table_name in ROLLUP_TABLE_NAMES.items():
+                table = self._table_factory.create_table(table_name)
+                period_day = granularity.truncate(day)
+
+                last_day = (await session.execute(
+                    select(func.max(search_query_daily_stat_table.c.day))
+                    .where(
+                        (between(search_query_daily_stat_table.c.day, period_day, granularity.end(day)))
+                    )
+                )).scalar()
+
+                if last_day is None:
+                    continue
+
+                await session.execute(
+                    delete(table)
+                    .where(
+                          (table.c.day == period_day)
+                        & (table.c.last_day < last_day)
+                    )
+                )
+
+                select_stmt = (
+                    select(
+                        literal(period_day, DateType()),
+                        search_query_daily_stat_table.c.day,
+                        search_query_daily_stat_table.c.searchquery_id,
+                        *[search_query_daily_stat_table.c[column] for column in REQUESTS_COLUMNS],
+                    )
+                    .select_from(search_query_daily_stat_table)
+                    .where(
+                        (search_query_daily_stat_table.c.day == last_day)
+                    )
+                )
+
+                stmt = (
+                    insert(table)
+                    .from_select(
+                        ['day', 'last_day', 'searchquery_id', *REQUESTS_COLUMNS],
+                        select_stmt,
+                    )
+                )
+
+                # Параллельный пересчет не затирает значения более позднего дня
+                await session.execute(
+                    stmt.on_conflict_do_update(
+                        constraint=table.UNIQUE_KEY_NAME,
+                        set_={
+                            column: stmt.excluded[column]
+                            for column in ('last_day', *REQUESTS_COLUMNS)
+                        },
+                        where=(table.c.last_day <= stmt.excluded.last_day),
+                    )
+                )
+
+            await session.commit()
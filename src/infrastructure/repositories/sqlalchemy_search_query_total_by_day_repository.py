@@ -1,17 +1,23 @@
 from datetime import date
 from typing import List
 
+import sqlalchemy as sa
 from sqlalchemy.dialects.postgresql import insert
-from sqlalchemy.sql.expression import asc, between, func, select
+from sqlalchemy.sql.expression import asc, between, desc, func, select
 
 from application.interfaces.search_query_total_by_day_repository_interface import (
     ISearchQueryTotalByDayRepository,
 )
+from domain.entities.requests_total_by_day_entity import (
+    RequestsTotalByDayEntity,
+)
+from domain.enums.granularity_enum import Granularity
 
 from .sqlalchemy_constants import (
     REQUESTS_TOTAL_BY_DAY_TABLE_NAME, SEARCH_QUERY_DAILY_STATS_TABLE_NAME,
 )
 from .sqlalchemy_orm import TableFactory
+from .sqlalchemy_types import DateType
 
 
 class SQLAlchemySearchQueryTotalByDayRepository(ISearchQueryTotalByDayRepository):
@@ -23,54 +29,100 @@ class SQLAlchemySearchQueryTotalByDayRepository(ISearchQueryTotalByDayRepository
         self,
         from_date: date,
         to_date: date,
+        granularity: Granularity = Granularity.DAY,
     ) -> List[dict]:
         search_query_total_by_day_table = self._table_factory.create_table(REQUESTS_TOTAL_BY_DAY_TABLE_NAME)
 
+        if granularity == Granularity.DAY:
+            period = search_query_total_by_day_table.c.day
+        else:
+            period = sa.cast(func.date_trunc(granularity.value, search_query_total_by_day_table.c.day), DateType())
+
+        # Итоги недели (месяца) - значения последнего дня периода: частота
+        # отчета скользящая. В таблице строка на день, поэтому свертка
+        # считается при чтении через DISTINCT ON
         query = (
             select(
-                search_query_total_by_day_table.c.day,
+                period.label('period'),
                 search_query_total_by_day_table.c.total_requests_per_week,
+                search_query_total_by_day_table.c.queries_count,
+                search_query_total_by_day_table.c.min_requests_per_week,
+                search_query_total_by_day_table.c.max_requests_per_week,
             )
+            .distinct(period)
             .where(
-                (between(search_query_total_by_day_table.c.day, from_date, to_date))
+                (between(search_query_total_by_day_table.c.day, granularity.truncate(from_date), to_date))
             )
             .select_from(search_query_total_by_day_table)
-            .order_by(asc(search_query_total_by_day_table.c.day))
+            .order_by(asc(period), desc(search_query_total_by_day_table.c.day))
         )
 
         async with self.session() as session:
             return [{
-                'day': row.day,
+                'day': row.period,
                 'total_number_per_week': row.total_requests_per_week,
+                'queries_count': row.queries_count,
+                'min_number_per_week': row.min_requests_per_week,
+                'max_number_per_week': row.max_requests_per_week,
             } for row in await session.execute(query)]
 
+    async def save(self, total: RequestsTotalByDayEntity) -> None:
+        requests_total_by_day_table = self._table_factory.create_table(REQUESTS_TOTAL_BY_DAY_TABLE_NAME)
+
+        stmt = insert(requests_total_by_day_table).values({
+            'day': total.day,
+            'total_requests_per_week': total.total_requests_per_week,
+            'queries_count': total.queries_count,
+            'min_requests_per_week': total.min_requests_per_week,
+            'max_requests_per_week': total.max_requests_per_week,
+        })
+
+        async with self.session() as session:
+            await session.execute(self._on_conflict_update(stmt))
+            await session.commit()
 
     async def calculate_total_requests_per_day(self, day: date) -> None:
         requests_total_by_day_table = self._table_factory.create_table(REQUESTS_TOTAL_BY_DAY_TABLE_NAME)
         search_query_daily_stat_table = self._table_factory.create_table(SEARCH_QUERY_DAILY_STATS_TABLE_NAME)
 
-        query = (
+        # Полный пересчет по секции дня, используется для сверки с
+        # итогами, накопленными во время загрузки отчета. Как и там,
+        # учитываются только строки с недельной частотой: строки только из
+        # месячного или трехмесячного отчета хранят requests_per_week = 0
+        select_stmt = (
+            select(
+                sa.literal(day, DateType()),
+                func.coalesce(func.sum(search_query_daily_stat_table.c.requests_per_week), 0),
+                func.count(),
+                func.min(search_query_daily_stat_table.c.requests_per_week),
+                func.max(search_query_daily_stat_table.c.requests_per_week),
+            )
+            .select_from(search_query_daily_stat_table)
+            .where(
+                  (search_query_daily_stat_table.c.day == day)
+                & (search_query_daily_stat_table.c.requests_per_week > 0)
+            )
+        )
+
+        stmt = (
             insert(requests_total_by_day_table)
-            .values({
-                'day': day,
-                'total_requests_per_week': (
-                    select(
-                        func.sum(search_query_daily_stat_table.c.requests_per_week)
-                    )
-                    .select_from(search_query_daily_stat_table)
-                    .where(
-                        (search_query_daily_stat_table.c.day == day)
-                    )
-                    .scalar_subquery()
-                ),
-            })
-            .on_conflict_do_update(
-                constraint=requests_total_by_day_table.UNIQUE_KEY_NAME,
-                set_={
-                    'day': requests_total_by_day_table.c.day,
-                },
+            .from_select(
+                ['day', 'total_requests_per_week', 'queries_count', 'min_requests_per_week', 'max_requests_per_week'],
+                select_stmt,
             )
         )
+
         async with self.session() as session:
-            await session.execute(query)
+            await session.execute(self._on_conflict_update(stmt))
             await session.commit()
+
+    def _on_conflict_update(self, stmt):
+        return stmt.on_conflict_do_update(
+            constraint=stmt.table.UNIQUE_KEY_NAME,
+            set_={
+                'total_requests_per_week': stmt.excluded.total_requests_per_week,
+                'queries_count': stmt.excluded.queries_count,
+                'min_requests_per_week': stmt.excluded.min_requests_per_week,
+                'max_requests_per_week': stmt.excluded.max_requests_per_week,
+            },
+        )
@@ -1,2 +1,3 @@
 from .celery_implementation import CeleryTaskFactory
 from .sync_implementation import SyncTaskFactory
+from .pipeline import ReportIngestPipeline
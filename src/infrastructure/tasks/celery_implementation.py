@@ -1,6 +1,6 @@
 import asyncio
 from datetime import date
-from typing import Optional
+from typing import List, Optional
 
 from celery import shared_task
 from dependency_injector.wiring import Provide, inject
@@ -15,8 +15,11 @@ from domain.interfaces.task_interface import ITask
 from domain.interfaces.task_service_interface import ITaskService
 
 from .utils import (
-    calculate_total_requests_per_day, download_report_file,
-    process_report_file,
+    archive_search_query_daily_stats, calculate_search_query_ranks,
+    calculate_search_query_rollups, calculate_total_requests_per_day,
+    download_report_file, get_report_file_path, get_report_opener,
+    process_combined_reports, process_report_file, process_report_stream,
+    warm_up_search_query_cache,
 )
 
 __all__ = [
@@ -24,6 +27,18 @@ __all__ = [
 ]
 
 
+def stream_search_queries(
+    search_query_report_gateway: ISearchQueryReportGateway,
+    period: ReportPeriod,
+    archive_file_path: Optional[str],
+):
+    day = calendarutil.now().date()
+
+    asyncio.run(
+        process_report_stream(search_query_report_gateway, day, period, archive_file_path)
+    )
+
+
 @shared_task(bind=True, max_retries=14)
 @inject
 def download_report_task(
@@ -31,7 +46,17 @@ def download_report_task(
     period: ReportPeriod,
     task_service: ITaskService = Provide['task_service'],
     search_query_report_gateway: ISearchQueryReportGateway = Provide['search_query_report_gateway'],
+    report_ingest_mode: str = Provide['config.report_ingest_mode'],
+    report_archive_enabled: bool = Provide['config.report_archive_enabled'],
 ):
+    if report_ingest_mode == 'stream':
+        stream_search_queries(
+            search_query_report_gateway=search_query_report_gateway,
+            period=period,
+            archive_file_path=get_report_file_path(period) if report_archive_enabled else None,
+        )
+        return
+
     report_file_path = download_report_file(search_query_report_gateway, period)
 
     task_service.fetch_search_queries(
@@ -40,6 +65,23 @@ def download_report_task(
     )
 
 
+@shared_task(bind=True, max_retries=14)
+@inject
+def download_combined_report_task(
+    self,
+    search_query_report_gateway: ISearchQueryReportGateway = Provide['search_query_report_gateway'],
+    report_ingest_mode: str = Provide['config.report_ingest_mode'],
+    report_archive_enabled: bool = Provide['config.report_archive_enabled'],
+):
+    day = calendarutil.now().date()
+
+    open_report = get_report_opener(search_query_report_gateway, report_ingest_mode, report_archive_enabled)
+
+    asyncio.run(
+        process_combined_reports(open_report, day)
+    )
+
+
 @shared_task(bind=True)
 @inject
 def fetch_search_queries_task(
@@ -55,8 +97,6 @@ def fetch_search_queries_task(
         process_report_file(report_file_path, day, period)
     )
 
-    task_service.calculate_total_requests_per_day(day=day)
-
 
 @shared_task(bind=True, max_retries=14)
 def calculate_total_requests_per_day_task(
@@ -68,6 +108,45 @@ def calculate_total_requests_per_day_task(
     )
 
 
+@shared_task(bind=True, max_retries=14)
+def calculate_search_query_ranks_task(
+    self,
+    day: date,
+):
+    asyncio.run(
+        calculate_search_query_ranks(day)
+    )
+
+
+@shared_task(bind=True, max_retries=14)
+def calculate_search_query_rollups_task(
+    self,
+    days: List[date],
+):
+    asyncio.run(
+        calculate_search_query_rollups(days)
+    )
+
+
+@shared_task(bind=True)
+def warm_up_search_query_cache_task(
+    self,
+):
+    asyncio.run(
+        warm_up_search_query_cache()
+    )
+
+
+@shared_task(bind=True)
+def archive_search_query_daily_stats_task(
+    self,
+    days: List[date],
+):
+    asyncio.run(
+        archive_search_query_daily_stats(days)
+    )
+
+
 class CeleryFetchSearchQueriesTask(ITask):
     def execute(self, report_file_path: str, period: ReportPeriod) -> None:
         fetch_search_queries_task.delay(report_file_path, period)
@@ -81,22 +160,57 @@ class CeleryDownloadReportTask(ITask):
         download_report_task.delay(self._period)
 
 
+class CeleryDownloadCombinedReportTask(ITask):
+    def execute(self):
+        download_combined_report_task.delay()
+
+
 class CeleryCalculateTotalRequestsPerDayTask(ITask):
     def execute(self, day: date):
         calculate_total_requests_per_day_task.delay(day=day)
 
 
+class CeleryCalculateSearchQueryRanksTask(ITask):
+    def execute(self, day: date):
+        calculate_search_query_ranks_task.delay(day=day)
+
+
+class CeleryCalculateSearchQueryRollupsTask(ITask):
+    def execute(self, days: List[date]):
+        calculate_search_query_rollups_task.delay(days=days)
+
+
+class CeleryWarmUpSearchQueryCacheTask(ITask):
+    def execute(self):
+        warm_up_search_query_cache_task.delay()
+
+
+class CeleryArchiveSearchQueryDailyStatsTask(ITask):
+    def execute(self, days: List[date]):
+        archive_search_query_daily_stats_task.delay(days=days)
+
+
 class CeleryTaskFactory(ITaskFactory):
     def create_task(self, task_name: str) -> Optional[ITask]:
         if task_name == 'download_one_week_report':
             return CeleryDownloadReportTask(ReportPeriod.ONE_WEEK)
         if task_name == 'download_one_month_report':
             return CeleryDownloadReportTask(ReportPeriod.ONE_MONTH)
-        if task_name == 'download_three_month_report':
+        if task_name == 'download_three_months_report':
             return CeleryDownloadReportTask(ReportPeriod.THREE_MONTHS)
+        if task_name == 'download_combined_report':
+            return CeleryDownloadCombinedReportTask()
         if task_name == 'fetch_search_queries':
             return CeleryFetchSearchQueriesTask()
         if task_name == 'calculate_total_requests_per_day':
             return CeleryCalculateTotalRequestsPerDayTask()
+        if task_name == 'calculate_search_query_ranks':
+            return CeleryCalculateSearchQueryRanksTask()
+        if task_name == 'calculate_search_query_rollups':
+            return CeleryCalculateSearchQueryRollupsTask()
+        if task_name == 'warm_up_search_query_cache':
+            return CeleryWarmUpSearchQueryCacheTask()
+        if task_name == 'archive_search_query_daily_stats':
+            return CeleryArchiveSearchQueryDailyStatsTask()
 
         return
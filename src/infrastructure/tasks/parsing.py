@@ -0,0 +1,77 @@
+import csv
+import io
+from array import array
+from dataclasses import dataclass
+from itertools import islice
+from typing import Iterable, List, TextIO
+
+__all__ = [
+    'ReportChunk',
+    'parse_report_block',
+    'read_report_block',
+]
+
+
+@dataclass(slots=True)
+class ReportChunk:
+    """
+    Пачка строк отчета в виде параллельных массивов запросов и их частоты.
+    rows_rejected - пропущенные при разборе строки (заголовок отчета тоже).
+    """
+    values: List[str]
+    counts: array
+    rows_rejected: int = 0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+def read_report_block(f: TextIO, size: int) -> str:
+    """
+    Читает из отчета не меньше size строк так, чтобы блок не обрывался
+    внутри значения в кавычках.
+    """
+    text = ''.join(islice(f, size))
+
+    # Нечетное число кавычек - перевод строки внутри значения
+    while text.count('"') % 2:
+        line = f.readline()
+        if not line:
+            break
+        text += line
+
+    return text
+
+
+def parse_report_rows(rows: Iterable[list]) -> ReportChunk:
+    values, counts = [], array('q')
+    rows_rejected = 0
+
+    for row in rows:
+        # Пустая строка - не ошибка
+        if not row:
+            continue
+
+        if len(row) < 2:
+            rows_rejected += 1
+            continue
+
+        try:
+            count = int(row[1])
+        except ValueError:
+            # Заголовок или поврежденная строка
+            rows_rejected += 1
+            continue
+
+        values.append(row[0])
+        counts.append(count)
+
+    return ReportChunk(values=values, counts=counts, rows_rejected=rows_rejected)
+
+
+def parse_report_block(text: str) -> ReportChunk:
+    """
+    Разбирает блок CSV отчета. Функция выполняется в дочерних процессах,
+    поэтому не зависит от контейнера и цикла событий.
+    """
+    return parse_report_rows(csv.reader(io.StringIO(text, newline='')))
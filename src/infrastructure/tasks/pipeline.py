@@ -0,0 +1,204 @@
+import asyncio
+import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import (
+    AbstractSet, Any, Awaitable, Callable, Optional, TextIO, Tuple,
+)
+
+from .parsing import ReportChunk, parse_report_block, read_report_block
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    'ReportIngestPipeline',
+    'ReportIngestStats',
+]
+
+
+@dataclass
+class ReportIngestStats:
+    rows_processed: int = 0
+    rows_failed: int = 0
+    rows_retried: int = 0
+    rows_skipped: int = 0
+    # Строки, которые не удалось разобрать, включая заголовок отчета
+    rows_rejected: int = 0
+
+
+class ReportIngestPipeline:
+    """
+    Конвейер загрузки отчета: reader -> resolver -> writer.
+
+    Этапы связаны ограниченными очередями, поэтому чтение отчета
+    приостанавливается, пока resolver и writer не освободятся.
+    Пачка, на которой этап упал, повторяется до max_retries раз,
+    после чего ее строки учитываются как rows_failed.
+
+    Пачки с номерами из committed_chunks пропускаются без обработки,
+    после записи каждой пачки вызывается commit(номер пачки).
+
+    При parse_processes > 0 разбор CSV выполняется в пуле процессов,
+    чтение и распаковка отчета остаются в потоке основного процесса.
+    """
+    _STOP = object()
+
+    def __init__(
+        self,
+        chunk_size: int = 1000,
+        queue_size: int = 8,
+        resolver_concurrency: int = 4,
+        writer_concurrency: int = 4,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
+        parse_processes: int = 0,
+    ) -> None:
+        self._chunk_size = chunk_size
+        self._queue_size = queue_size
+        self._resolver_concurrency = resolver_concurrency
+        self._writer_concurrency = writer_concurrency
+        self._max_retries = max_retries
+        self._retry_delay = retry_delay
+        self._parse_processes = parse_processes
+
+    @property
+    def chunk_size(self) -> int:
+        return self._chunk_size
+
+    async def run(
+        self,
+        f: TextIO,
+        resolve: Callable[[ReportChunk], Awaitable[Any]],
+        write: Callable[[Any], Awaitable[None]],
+        committed_chunks: AbstractSet[int] = frozenset(),
+        commit: Optional[Callable[[int], Awaitable[None]]] = None,
+    ) -> ReportIngestStats:
+        stats = ReportIngestStats()
+
+        resolve_queue = asyncio.Queue(maxsize=self._queue_size)
+        write_queue = asyncio.Queue(maxsize=self._queue_size)
+
+        async def emit(chunk_index: int, chunk: ReportChunk):
+            stats.rows_rejected += chunk.rows_rejected
+
+            if chunk_index in committed_chunks:
+                stats.rows_skipped += len(chunk)
+            else:
+                await resolve_queue.put((chunk_index, chunk))
+
+        async def reader():
+            chunk_index = 0
+
+            if not self._parse_processes:
+                while True:
+                    # Чтение и разбор выполняются в потоке, чтобы не блокировать цикл событий
+                    chunk = await asyncio.to_thread(self._read_chunk, f)
+                    if chunk is None:
+                        break
+
+                    await emit(chunk_index, chunk)
+                    chunk_index += 1
+            else:
+                loop = asyncio.get_running_loop()
+
+                # Порядок пачек сохраняется, в работе не больше двух блоков на процесс
+                pending = deque()
+                executor = ProcessPoolExecutor(max_workers=self._parse_processes)
+                try:
+                    while True:
+                        text = await asyncio.to_thread(read_report_block, f, self._chunk_size)
+                        if text:
+                            pending.append(loop.run_in_executor(executor, parse_report_block, text))
+
+                        if pending and (not text or len(pending) >= self._parse_processes * 2):
+                            await emit(chunk_index, await pending.popleft())
+                            chunk_index += 1
+
+                        if not text and not pending:
+                            break
+                except BaseException:
+                    # При отмене или ошибке не ждем процессы в цикле событий:
+                    # блоки в очереди пула отменяются, начатые дорабатывают сами
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise
+                else:
+                    await asyncio.to_thread(executor.shutdown)
+
+            for _ in range(self._resolver_concurrency):
+                await resolve_queue.put(self._STOP)
+
+        async def resolver():
+            while (item := await resolve_queue.get()) is not self._STOP:
+                chunk_index, chunk = item
+
+                ok, resolved = await self._call_with_retries(resolve, chunk, len(chunk), stats)
+                if ok:
+                    await write_queue.put((chunk_index, resolved, len(chunk)))
+
+        async def writer():
+            while (item := await write_queue.get()) is not self._STOP:
+                chunk_index, resolved, rows_count = item
+
+                ok, _ = await self._call_with_retries(write, resolved, rows_count, stats)
+                if not ok:
+                    continue
+
+                stats.rows_processed += rows_count
+
+                if commit is not None:
+                    try:
+                        await commit(chunk_index)
+                    except Exception:
+                        # Без отметки пачка будет повторно загружена при перезапуске
+                        logger.exception('Failed to commit report ingest chunk %s', chunk_index)
+
+        async def resolvers():
+            async with asyncio.TaskGroup() as tg:
+                for _ in range(self._resolver_concurrency):
+                    tg.create_task(resolver())
+
+            for _ in range(self._writer_concurrency):
+                await write_queue.put(self._STOP)
+
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(reader())
+            tg.create_task(resolvers())
+            for _ in range(self._writer_concurrency):
+                tg.create_task(writer())
+
+        logger.info(
+            'Report ingest finished: %s rows processed, %s failed, %s retried, %s skipped, %s rejected',
+            stats.rows_processed, stats.rows_failed, stats.rows_retried, stats.rows_skipped, stats.rows_rejected,
+        )
+
+        return stats
+
+    def _read_chunk(self, f: TextIO) -> Optional[ReportChunk]:
+        if text := read_report_block(f, self._chunk_size):
+            return parse_report_block(text)
+
+        return None
+
+    async def _call_with_retries(
+        self,
+        func: Callable[[Any], Awaitable[Any]],
+        argument: Any,
+        rows_count: int,
+        stats: ReportIngestStats,
+    ) -> Tuple[bool, Any]:
+        for attempt in range(self._max_retries + 1):
+            if attempt:
+                stats.rows_retried += rows_count
+                await asyncio.sleep(self._retry_delay * 2 ** (attempt - 1))
+
+            try:
+                result = await func(argument)
+            except Exception:
+                logger.exception('Report ingest chunk failed, attempt %s', attempt + 1)
+            else:
+                return True, result
+
+        stats.rows_failed += rows_count
+
+        return False, None
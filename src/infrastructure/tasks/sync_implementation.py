@@ -1,7 +1,7 @@
 import asyncio
 import time
 from datetime import date
-from typing import Optional
+from typing import List, Optional
 
 from dependency_injector.wiring import Provide, inject
 
@@ -15,8 +15,11 @@ from domain.interfaces.task_interface import ITask
 from domain.interfaces.task_service_interface import ITaskService
 
 from .utils import (
-    calculate_total_requests_per_day, download_report_file,
-    process_report_file,
+    archive_search_query_daily_stats, calculate_search_query_ranks,
+    calculate_search_query_rollups, calculate_total_requests_per_day,
+    download_report_file, get_report_file_path, get_report_opener,
+    process_combined_reports, process_report_file, process_report_stream,
+    warm_up_search_query_cache,
 )
 
 __all__ = [
@@ -24,12 +27,35 @@ __all__ = [
 ]
 
 
+def stream_search_queries(
+    search_query_report_gateway: ISearchQueryReportGateway,
+    period: ReportPeriod,
+    archive_file_path: Optional[str],
+):
+    day = calendarutil.now().date()
+
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(
+        process_report_stream(search_query_report_gateway, day, period, archive_file_path)
+    )
+
+
 @inject
 def download_report_task(
     period: ReportPeriod,
     task_service: ITaskService = Provide['task_service'],
     search_query_report_gateway: ISearchQueryReportGateway = Provide['search_query_report_gateway'],
+    report_ingest_mode: str = Provide['config.report_ingest_mode'],
+    report_archive_enabled: bool = Provide['config.report_archive_enabled'],
 ):
+    if report_ingest_mode == 'stream':
+        stream_search_queries(
+            search_query_report_gateway=search_query_report_gateway,
+            period=period,
+            archive_file_path=get_report_file_path(period) if report_archive_enabled else None,
+        )
+        return
+
     report_file_path = download_report_file(search_query_report_gateway, period)
 
     task_service.fetch_search_queries(
@@ -38,6 +64,22 @@ def download_report_task(
     )
 
 
+@inject
+def download_combined_report_task(
+    search_query_report_gateway: ISearchQueryReportGateway = Provide['search_query_report_gateway'],
+    report_ingest_mode: str = Provide['config.report_ingest_mode'],
+    report_archive_enabled: bool = Provide['config.report_archive_enabled'],
+):
+    day = calendarutil.now().date()
+
+    open_report = get_report_opener(search_query_report_gateway, report_ingest_mode, report_archive_enabled)
+
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(
+        process_combined_reports(open_report, day)
+    )
+
+
 @inject
 def fetch_search_queries_task(
     report_file_path: str,
@@ -51,8 +93,6 @@ def fetch_search_queries_task(
         process_report_file(report_file_path, day, period)
     ))
 
-    # task_service.calculate_total_requests_per_day(day=day)
-
 
 def calculate_total_requests_per_day_task(
     day: date,
@@ -65,6 +105,48 @@ def calculate_total_requests_per_day_task(
     )
 
 
+def calculate_search_query_ranks_task(
+    day: date,
+):
+    loop = asyncio.get_event_loop()
+    task = loop.create_task(calculate_search_query_ranks(day))
+
+    loop.run_until_complete(
+        task
+    )
+
+
+def calculate_search_query_rollups_task(
+    days: List[date],
+):
+    loop = asyncio.get_event_loop()
+    task = loop.create_task(calculate_search_query_rollups(days))
+
+    loop.run_until_complete(
+        task
+    )
+
+
+def warm_up_search_query_cache_task():
+    loop = asyncio.get_event_loop()
+    task = loop.create_task(warm_up_search_query_cache())
+
+    loop.run_until_complete(
+        task
+    )
+
+
+def archive_search_query_daily_stats_task(
+    days: List[date],
+):
+    loop = asyncio.get_event_loop()
+    task = loop.create_task(archive_search_query_daily_stats(days))
+
+    loop.run_until_complete(
+        task
+    )
+
+
 class SyncFetchSearchQueriesTask(ITask):
     def execute(self, report_file_path: str, period: ReportPeriod) -> None:
         fetch_search_queries_task(report_file_path, period)
@@ -78,22 +160,57 @@ class SyncDownloadReportTask(ITask):
         download_report_task(self._period)
 
 
+class SyncDownloadCombinedReportTask(ITask):
+    def execute(self):
+        download_combined_report_task()
+
+
 class SyncCalculateTotalRequestsPerDayTask(ITask):
     def execute(self, day: date):
         calculate_total_requests_per_day_task(day=day)
 
 
+class SyncCalculateSearchQueryRanksTask(ITask):
+    def execute(self, day: date):
+        calculate_search_query_ranks_task(day=day)
+
+
+class SyncCalculateSearchQueryRollupsTask(ITask):
+    def execute(self, days: List[date]):
+        calculate_search_query_rollups_task(days=days)
+
+
+class SyncWarmUpSearchQueryCacheTask(ITask):
+    def execute(self):
+        warm_up_search_query_cache_task()
+
+
+class SyncArchiveSearchQueryDailyStatsTask(ITask):
+    def execute(self, days: List[date]):
+        archive_search_query_daily_stats_task(days=days)
+
+
 class SyncTaskFactory(ITaskFactory):
     def create_task(self, task_name: str) -> Optional[ITask]:
         if task_name == 'download_one_week_report':
             return SyncDownloadReportTask(ReportPeriod.ONE_WEEK)
         if task_name == 'download_one_month_report':
             return SyncDownloadReportTask(ReportPeriod.ONE_MONTH)
-        if task_name == 'download_three_month_report':
+        if task_name == 'download_three_months_report':
             return SyncDownloadReportTask(ReportPeriod.THREE_MONTHS)
+        if task_name == 'download_combined_report':
+            return SyncDownloadCombinedReportTask()
         if task_name == 'fetch_search_queries':
             return SyncFetchSearchQueriesTask()
         if task_name == 'calculate_total_requests_per_day':
             return SyncCalculateTotalRequestsPerDayTask()
+        if task_name == 'calculate_search_query_ranks':
+            return SyncCalculateSearchQueryRanksTask()
+        if task_name == 'calculate_search_query_rollups':
+            return SyncCalculateSearchQueryRollupsTask()
+        if task_name == 'warm_up_search_query_cache':
+            return SyncWarmUpSearchQueryCacheTask()
+        if task_name == 'archive_search_query_daily_stats':
+            return SyncArchiveSearchQueryDailyStatsTask()
 
         return
\ No newline at end of file
@@ -1,31 +1,72 @@
-import asyncio
-import csv
 import gzip
+import io
+import logging
 import os
 import shutil
+import uuid
+from contextlib import contextmanager
 from datetime import date
-from itertools import islice
-from typing import List
+from typing import (
+    Callable, ContextManager, Dict, Iterable, Iterator, List, Optional, TextIO,
+)
 
 from dependency_injector.wiring import Provide, inject
 
 from application.utils import calendarutil
+from domain.entities.requests_total_by_day_entity import (
+    RequestsTotalByDayEntity,
+)
 from domain.enums.report_period_enum import ReportPeriod
 from domain.interfaces.search_query_report_gateway_interface import (
     ISearchQueryReportGateway,
 )
 
+from .parsing import ReportChunk
+from .pipeline import ReportIngestStats
+
+logger = logging.getLogger(__name__)
+
+
+class IterStream(io.RawIOBase):
+    """
+    Файловый объект поверх итератора байтовых кусков.
+    """
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._buffer = b''
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._buffer:
+            self._buffer = next(self._chunks, None)
+            if self._buffer is None:
+                self._buffer = b''
+                return 0
+
+        size = min(len(b), len(self._buffer))
+        b[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+
+        return size
+
+
+def get_report_file_path(period: ReportPeriod) -> str:
+    now = calendarutil.now()
+    report_folder_path = now.strftime(f'/tmp/reports/%Y/%m')
+
+    return now.strftime(f'{report_folder_path}/%Y-%m-%d_{period.name.lower()}_report.csv.gz')
+
 
 def download_report_file(
     search_query_report_gateway: ISearchQueryReportGateway,
     period: ReportPeriod,
 ) -> str:
-    now = calendarutil.now()
-    report_folder_path = now.strftime(f'/tmp/reports/%Y/%m')
-    report_file_path = now.strftime(f'{report_folder_path}/%Y-%m-%d_{period.name.lower()}_report.csv.gz')
+    report_file_path = get_report_file_path(period)
 
     if not os.path.exists(report_file_path):
-        os.makedirs(report_folder_path, exist_ok=True)
+        os.makedirs(os.path.dirname(report_file_path), exist_ok=True)
 
         file = search_query_report_gateway.download_report(period)
 
@@ -35,72 +76,349 @@ def download_report_file(
     return report_file_path
 
 
-@inject
+def iter_report_stream(
+    search_query_report_gateway: ISearchQueryReportGateway,
+    period: ReportPeriod,
+    archive_file_path: Optional[str] = None,
+) -> Iterator[bytes]:
+    """
+    Отдает отчет по частям, при указании archive_file_path параллельно
+    сохраняет его в gzip архив.
+    """
+    chunks = search_query_report_gateway.stream_report(period)
+
+    if archive_file_path is None:
+        yield from chunks
+        return
+
+    os.makedirs(os.path.dirname(archive_file_path), exist_ok=True)
+
+    # Недописанный архив не должен выглядеть как готовый отчет
+    partial_file_path = f'{archive_file_path}.part'
+    try:
+        with gzip.open(partial_file_path, mode='wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+
+                yield chunk
+    except BaseException:
+        # В том числе GeneratorExit: отчет дочитан не до конца
+        remove_partial_file(partial_file_path)
+        raise
+
+    os.replace(partial_file_path, archive_file_path)
+
+
+def remove_partial_file(partial_file_path: str) -> None:
+    try:
+        os.remove(partial_file_path)
+    except FileNotFoundError:
+        pass
+
+
+def get_archive_file_path(days: List[date]) -> str:
+    first_day, last_day = min(days), max(days)
+    report_folder_path = first_day.strftime('/tmp/reports/%Y/%m')
+
+    if first_day == last_day:
+        return first_day.strftime(f'{report_folder_path}/%Y-%m-%d_daily_stats.csv.gz')
+
+    return f'{report_folder_path}/{first_day.isoformat()}_{last_day.isoformat()}_daily_stats.csv.gz'
+
+
+@contextmanager
+def open_report_file(report_file_path: str) -> Iterator[TextIO]:
+    with gzip.open(report_file_path, mode='rt', newline='') as f:
+        yield f
+
+
+@contextmanager
+def open_report_stream(
+    search_query_report_gateway: ISearchQueryReportGateway,
+    period: ReportPeriod,
+    archive_file_path: Optional[str] = None,
+) -> Iterator[TextIO]:
+    chunks = iter_report_stream(search_query_report_gateway, period, archive_file_path)
+
+    with io.TextIOWrapper(io.BufferedReader(IterStream(chunks)), encoding='utf-8', newline='') as f:
+        yield f
+
+
+def get_report_opener(
+    search_query_report_gateway: ISearchQueryReportGateway,
+    report_ingest_mode: str,
+    report_archive_enabled: bool,
+) -> Callable[[ReportPeriod], ContextManager[TextIO]]:
+    """
+    Возвращает функцию, открывающую отчет за период: скачанный файл
+    в режиме file или поток в режиме stream.
+    """
+    def open_report(period: ReportPeriod) -> ContextManager[TextIO]:
+        if report_ingest_mode == 'stream':
+            archive_file_path = get_report_file_path(period) if report_archive_enabled else None
+
+            return open_report_stream(search_query_report_gateway, period, archive_file_path)
+
+        return open_report_file(download_report_file(search_query_report_gateway, period))
+
+    return open_report
+
+
 async def process_report_file(
     report_file_path: str,
     day: date,
     period: ReportPeriod,
+):
+    with open_report_file(report_file_path) as f:
+        return await process_report_rows(f, day, period, report_file_path)
+
+
+@inject
+async def process_report_stream(
+    search_query_report_gateway: ISearchQueryReportGateway,
+    day: date,
+    period: ReportPeriod,
+    archive_file_path: Optional[str] = None,
+    reset_report_ingest_checkpoints_use_case = Provide['reset_report_ingest_checkpoints_use_case'],
+):
+    """
+    Загружает отчет из потока.
+
+    Поток скачивается заново при каждом запуске и может отличаться от
+    прежнего, поэтому контрольные точки привязаны к архиву отчета: если
+    архив уже дописан, повторный запуск читает его с контрольными точками,
+    иначе старые точки архива сбрасываются и поток читается заново.
+    Без архива контрольные точки не ведутся.
+    """
+    if archive_file_path is not None and os.path.exists(archive_file_path):
+        return await process_report_file(archive_file_path, day, period)
+
+    if archive_file_path is not None:
+        await reset_report_ingest_checkpoints_use_case.execute(
+            report_file_path=archive_file_path,
+            period=period,
+        )
+
+    with open_report_stream(search_query_report_gateway, period, archive_file_path) as f:
+        return await process_report_rows(f, day, period, archive_file_path)
+
+
+@inject
+async def load_search_query_id_index(
+    load_search_query_id_index_use_case = Provide['load_search_query_id_index_use_case'],
+    report_ingest_preload_search_queries: bool = Provide['config.report_ingest_preload_search_queries'],
+):
+    if not report_ingest_preload_search_queries:
+        return None
+
+    search_query_id_index = await load_search_query_id_index_use_case.execute()
+
+    logger.info(
+        'Search query index loaded: %s queries, %.1f MB',
+        len(search_query_id_index), search_query_id_index.memory_usage() / 2 ** 20,
+    )
+
+    return search_query_id_index
+
+
+@inject
+async def refresh_search_query_bloom_filter(
+    refresh_search_query_bloom_filter_use_case = Provide['refresh_search_query_bloom_filter_use_case'],
+    search_query_bloom_filter_enabled: bool = Provide['config.search_query_bloom_filter_enabled'],
+) -> None:
+    # Пока фильтр не загружен, прокси репозитория его не использует
+    if not search_query_bloom_filter_enabled:
+        return
+
+    bloom_filter = await refresh_search_query_bloom_filter_use_case.execute()
+
+    logger.info('Search query bloom filter refreshed: %s queries', len(bloom_filter))
+
+
+@inject
+async def log_search_query_cache_stats(
+    get_search_query_cache_stats_use_case = Provide['get_search_query_cache_stats_use_case'],
+) -> None:
+    # Кэш запросов читает только загрузка отчета, счетчики - с запуска процесса
+    stats = await get_search_query_cache_stats_use_case.execute()
+
+    logger.info('Search query cache stats: %s', stats)
+
+
+@inject
+async def process_report_rows(
+    f: TextIO,
+    day: date,
+    period: ReportPeriod,
+    report_file_path: Optional[str],
+    report_ingest_pipeline = Provide['report_ingest_pipeline'],
+    resolve_search_query_daily_stats_use_case = Provide['resolve_search_query_daily_stats_use_case'],
     bulk_create_search_query_daily_stats_use_case = Provide['bulk_create_search_query_daily_stats_use_case'],
+    get_committed_report_chunks_use_case = Provide['get_committed_report_chunks_use_case'],
+    commit_report_chunk_use_case = Provide['commit_report_chunk_use_case'],
+    reset_report_ingest_checkpoints_use_case = Provide['reset_report_ingest_checkpoints_use_case'],
+    calculate_search_query_ranks_use_case = Provide['calculate_search_query_ranks_use_case'],
+    calculate_search_query_rollups_use_case = Provide['calculate_search_query_rollups_use_case'],
+    report_ingest_checkpoints_enabled: bool = Provide['config.report_ingest_checkpoints_enabled'],
 ):
-    tasks_in_processing, lock = 0, asyncio.Lock() 
-
-    semaphore = asyncio.BoundedSemaphore(8)
-
-    async def report_file_reader(file_path: str):
-        with gzip.open(file_path, mode='rt') as f:
-            while True:
-                chunk = list(islice(csv.reader(f), 1000))
-                if not chunk:
-                    break
-
-                async with semaphore:
-                    yield chunk
-                # Переключаемся на выполнение задач
-                await asyncio.sleep(0)
-
-    async def report_processor(generator):
-        nonlocal tasks_in_processing
-
-        async for values_list in generator:
-            try:
-                asyncio.create_task(
-                    bulk_create_task(
-                        values_list=values_list,
-                        day=day,
-                        period=period,
-                    )
-                )
-            finally:
-                async with lock:
-                    tasks_in_processing += 1
-
-        # Ожидаем завершения всех bulk_create_task
-        while tasks_in_processing:
-            await asyncio.sleep(1) 
-
-    async def bulk_create_task(
-        values_list: List[tuple],
-        day: date,
-        period: ReportPeriod,
-    ):
-        nonlocal tasks_in_processing
-
-        try:
-            async with semaphore:
-                await bulk_create_search_query_daily_stats_use_case.execute(
-                    values=values_list,
+    """
+    Загружает строки отчета за период.
+
+    Контрольные точки ведутся по report_file_path и удаляются после
+    успешной загрузки, без report_file_path не ведутся.
+    """
+    search_query_id_index = await load_search_query_id_index()
+    await refresh_search_query_bloom_filter()
+
+    checkpoints_enabled = report_ingest_checkpoints_enabled and report_file_path is not None
+
+    total = RequestsTotalByDayEntity(day=day)
+
+    async def resolve(chunk: ReportChunk) -> List[dict]:
+        return await resolve_search_query_daily_stats_use_case.execute(
+            values=chunk.values,
+            counts=chunk.counts,
+            day=day,
+            period=period,
+            search_query_id_index=search_query_id_index,
+        )
+
+    async def write(daily_stats: List[dict]) -> None:
+        await bulk_create_search_query_daily_stats_use_case.execute(daily_stats)
+
+        if period == ReportPeriod.ONE_WEEK:
+            total.add(daily_stat['requests_per_week'] for daily_stat in daily_stats)
+
+    async def commit(chunk_index: int) -> None:
+        await commit_report_chunk_use_case.execute(
+            report_file_path=report_file_path,
+            period=period,
+            chunk_size=report_ingest_pipeline.chunk_size,
+            chunk_index=chunk_index,
+        )
+
+    if not checkpoints_enabled:
+        stats = await report_ingest_pipeline.run(f, resolve=resolve, write=write)
+    else:
+        committed_chunks = await get_committed_report_chunks_use_case.execute(
+            report_file_path=report_file_path,
+            period=period,
+            chunk_size=report_ingest_pipeline.chunk_size,
+        )
+
+        stats = await report_ingest_pipeline.run(
+            f,
+            resolve=resolve,
+            write=write,
+            committed_chunks=committed_chunks,
+            commit=commit,
+        )
+
+    # Итоги и места считаются по недельной частоте, другие периоды их не меняют
+    if period == ReportPeriod.ONE_WEEK:
+        await save_total_requests_per_day(total, stats)
+        await calculate_search_query_ranks_use_case.execute(day)
+
+    # Свертки хранят все три частоты дня и обновляются после любого отчета
+    await calculate_search_query_rollups_use_case.execute(day)
+
+    await bump_data_version(day)
+    await log_search_query_cache_stats()
+
+    if checkpoints_enabled:
+        await reset_report_ingest_checkpoints_use_case.execute(
+            report_file_path=report_file_path,
+            period=period,
+        )
+
+    return stats
+
+
+@inject
+async def process_combined_reports(
+    open_report: Callable[[ReportPeriod], ContextManager[TextIO]],
+    day: date,
+    report_ingest_pipeline = Provide['report_ingest_pipeline'],
+    resolve_search_query_daily_stats_use_case = Provide['resolve_search_query_daily_stats_use_case'],
+    stage_search_query_daily_stats_use_case = Provide['stage_search_query_daily_stats_use_case'],
+    merge_staged_search_query_daily_stats_use_case = Provide['merge_staged_search_query_daily_stats_use_case'],
+    delete_staged_search_query_daily_stats_use_case = Provide['delete_staged_search_query_daily_stats_use_case'],
+    calculate_search_query_ranks_use_case = Provide['calculate_search_query_ranks_use_case'],
+    calculate_search_query_rollups_use_case = Provide['calculate_search_query_rollups_use_case'],
+) -> Dict[ReportPeriod, ReportIngestStats]:
+    """
+    Загружает отчеты за неделю, месяц и три месяца в одну строку на день.
+
+    Строки всех отчетов накапливаются в промежуточной таблице и переносятся
+    в searchquerydailystat одним INSERT ... SELECT ... GROUP BY, поэтому
+    каждая строка (day, searchquery_id) записывается один раз.
+    Контрольные точки в этом режиме не используются: промежуточная
+    таблица UNLOGGED и не переживает сбой базы. Строки неудавшегося
+    запуска удаляются из нее, повтор начинает с новой пачки.
+    """
+    search_query_id_index = await load_search_query_id_index()
+    await refresh_search_query_bloom_filter()
+
+    batch_id = uuid.uuid4()
+
+    total = RequestsTotalByDayEntity(day=day)
+
+    stats = {}
+    try:
+        for period in ReportPeriod:
+            async def resolve(chunk: ReportChunk) -> List[dict]:
+                return await resolve_search_query_daily_stats_use_case.execute(
+                    values=chunk.values,
+                    counts=chunk.counts,
                     day=day,
                     period=period,
+                    search_query_id_index=search_query_id_index,
                 )
-        except Exception as e:
-            pass
-        finally:
-            async with lock:
-                tasks_in_processing -= 1
 
-    generator = report_file_reader(report_file_path)
+            async def write(daily_stats: List[dict]) -> None:
+                await stage_search_query_daily_stats_use_case.execute(batch_id, daily_stats)
+
+                if period == ReportPeriod.ONE_WEEK:
+                    total.add(daily_stat['requests_per_week'] for daily_stat in daily_stats)
+
+            with open_report(period) as f:
+                stats[period] = await report_ingest_pipeline.run(f, resolve=resolve, write=write)
+
+        await merge_staged_search_query_daily_stats_use_case.execute(batch_id, [day])
+    finally:
+        # После переноса строк пачки уже нет, удаление ничего не делает
+        await delete_staged_search_query_daily_stats_use_case.execute(batch_id)
+
+    await save_total_requests_per_day(total, stats[ReportPeriod.ONE_WEEK])
+    await calculate_search_query_ranks_use_case.execute(day)
+    await calculate_search_query_rollups_use_case.execute(day)
+
+    await bump_data_version(day)
+    await log_search_query_cache_stats()
+
+    return stats
+
+
+@inject
+async def save_total_requests_per_day(
+    total: RequestsTotalByDayEntity,
+    stats: ReportIngestStats,
+    save_total_requests_per_day_use_case = Provide['save_total_requests_per_day_use_case'],
+    calculate_total_requests_per_day_use_case = Provide['calculate_total_requests_per_day_use_case'],
+    report_ingest_totals_mode: str = Provide['config.report_ingest_totals_mode'],
+):
+    """
+    Сохраняет итоги, накопленные за время загрузки отчета.
 
-    await report_processor(generator)
+    Накопленные итоги учитывают только строки этого запуска: если часть
+    пачек пропущена по контрольным точкам, итоги пересчитываются полным
+    проходом по секции дня. Полный проход также используется в режиме rescan.
+    """
+    if report_ingest_totals_mode == 'incremental' and not stats.rows_skipped:
+        await save_total_requests_per_day_use_case.execute(total)
+        return
+
+    await calculate_total_requests_per_day_use_case.execute(total.day)
 
 
 @inject
@@ -109,3 +427,76 @@ async def calculate_total_requests_per_day(
     calculate_total_requests_per_day_use_case = Provide['calculate_total_requests_per_day_use_case'],
 ):
     await calculate_total_requests_per_day_use_case.execute(day)
+
+    await bump_data_version(day)
+
+
+@inject
+async def calculate_search_query_ranks(
+    day: date,
+    calculate_search_query_ranks_use_case = Provide['calculate_search_query_ranks_use_case'],
+):
+    await calculate_search_query_ranks_use_case.execute(day)
+
+    await bump_data_version(day)
+
+
+@inject
+async def calculate_search_query_rollups(
+    days: List[date],
+    calculate_search_query_rollups_use_case = Provide['calculate_search_query_rollups_use_case'],
+):
+    # По возрастанию: строка периода остается за последним днем
+    for day in sorted(set(days)):
+        await calculate_search_query_rollups_use_case.execute(day)
+
+    await bump_data_version(max(days))
+
+
+@inject
+async def warm_up_search_query_cache(
+    warm_up_search_query_cache_use_case = Provide['warm_up_search_query_cache_use_case'],
+):
+    count = await warm_up_search_query_cache_use_case.execute()
+
+    logger.info('Search query cache warmed up with %s queries', count)
+
+
+@inject
+async def bump_data_version(
+    day: date,
+    bump_data_version_use_case = Provide['bump_data_version_use_case'],
+):
+    """
+    Сбрасывает кэш ответов и ETag после записи данных за день.
+    """
+    version = await bump_data_version_use_case.execute(day)
+
+    logger.info('Data version bumped to %s', version)
+
+
+@inject
+async def archive_search_query_daily_stats(
+    days: List[date],
+    archive_search_query_daily_stats_use_case = Provide['archive_search_query_daily_stats_use_case'],
+) -> str:
+    archive_file_path = get_archive_file_path(days)
+    os.makedirs(os.path.dirname(archive_file_path), exist_ok=True)
+
+    # Недописанный архив не должен выглядеть как готовый
+    partial_file_path = f'{archive_file_path}.part'
+    try:
+        with open(partial_file_path, mode='wb') as f:
+            async def write(chunk: bytes) -> None:
+                f.write(chunk)
+
+            await archive_search_query_daily_stats_use_case.execute(days, write)
+    except BaseException:
+        remove_partial_file(partial_file_path)
+        raise
+
+    os.replace(partial_file_path, archive_file_path)
+
+    logger.info('Daily stats archived to %s', archive_file_path)
+
+    return archive_file_path
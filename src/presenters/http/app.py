@@ -4,7 +4,14 @@ from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 
 from . import dependencies
-from .routers import command_router, search_query_router
+from .background import (
+    SearchQuerySuggestIndexRefresher,
+)
+from .middlewares import ETagMiddleware, ResponseCacheMiddleware
+from .routers import (
+    command_router, export_router, report_ingest_checkpoint_router,
+    response_cache_router, search_query_router,
+)
 
 
 def create_app(callbacks: Optional[List[Callable[..., Any]]] = None) -> FastAPI:
@@ -22,6 +29,37 @@ def create_app(callbacks: Optional[List[Callable[..., Any]]] = None) -> FastAPI:
 
     app.include_router(command_router.router, prefix='/api/commands')
     app.include_router(search_query_router.router, prefix='/api/queries')
+    app.include_router(report_ingest_checkpoint_router.router, prefix='/api/checkpoints')
+    app.include_router(response_cache_router.router, prefix='/api/cache')
+    # Выгрузка вне /api/queries/: кэш ответов буферизовал бы весь поток
+    app.include_router(export_router.router, prefix='/api/export')
+
+    # Подсказки отдаются из памяти процесса быстрее, чем из Redis
+    if container.config.response_cache_enabled():
+        app.add_middleware(
+            middleware_class=ResponseCacheMiddleware,
+            paths=['/api/queries/'],
+            exclude_paths=['/api/queries/suggest/'],
+            ttl=container.config.response_cache_ttl(),
+            max_size=container.config.response_cache_max_size(),
+        )
+
+    # Добавляется после кэша, чтобы 304 отдавался до обращения к кэшу ответов.
+    # Покрывает все GET, ответы которых меняет только загрузка отчета. Индекс
+    # подсказок догружается с задержкой после новой версии, контрольные
+    # точки и статистика кэша меняются без нее
+    app.add_middleware(
+        middleware_class=ETagMiddleware,
+        paths=['/api/'],
+        exclude_paths=['/api/queries/suggest/', '/api/checkpoints/', '/api/cache/'],
+    )
+
+    if container.config.suggest_index_enabled():
+        suggest_index_refresher = SearchQuerySuggestIndexRefresher(
+            interval=container.config.suggest_index_refresh_interval(),
+        )
+        app.add_event_handler('startup', suggest_index_refresher.start)
+        app.add_event_handler('shutdown', suggest_index_refresher.stop)
 
     app.add_middleware(
         middleware_class=CORSMiddleware,
@@ -0,0 +1,54 @@
+import asyncio
+import contextlib
+import logging
+from typing import Optional
+
+from . import dependencies
+
+logger = logging.getLogger(__name__)
+
+
+class SearchQuerySuggestIndexRefresher:
+    """
+    Фоновая задача процесса API: раз в interval секунд сверяет версию данных,
+    которую увеличивает загрузка отчета, и при изменении догружает индекс
+    подсказок. Первое построение - при старте приложения.
+    """
+    def __init__(self, interval: int) -> None:
+        self._interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+
+    async def _run(self) -> None:
+        version = None
+
+        while True:
+            try:
+                version = await self._refresh(version)
+            except Exception:
+                logger.warning('Search query suggest index refresh failed', exc_info=True)
+
+            await asyncio.sleep(self._interval)
+
+    async def _refresh(self, version: Optional[int]) -> Optional[int]:
+        get_data_version_use_case = await dependencies.provide_get_data_version_use_case()
+        data_version = await get_data_version_use_case.execute()
+
+        if data_version.version == version:
+            return version
+
+        refresh_search_query_suggest_index_use_case = await dependencies.provide_refresh_search_query_suggest_index_use_case()
+        index = await refresh_search_query_suggest_index_use_case.execute()
+        logger.info('Search query suggest index refreshed: %d queries, data version %d', len(index), data_version.version)
+
+        return data_version.version
@@ -1,15 +1,32 @@
 from dependency_injector.wiring import Provide, inject
 
 from application.use_cases import (
-    FindSearchQueriesUseCase, FindSearchQueryDailyStatsUseCase,
+    FindSearchQueriesPageUseCase, FindSearchQueriesUseCase,
+    FindSearchQueriesWithStatisticsUseCase, FindSearchQueryDailyStatsUseCase,
 )
 from containers import Container
 
 __all__ = [
     'provide_download_search_query_report_use_case',
+    'provide_download_combined_search_query_report_use_case',
     'provide_find_search_queies_use_case',
+    'provide_find_search_queries_page_use_case',
+    'provide_find_search_queries_with_statistics_use_case',
     'provide_find_search_query_daily_stats_use_case',
     'provide_find_total_requests_per_day_use_case',
+    'provide_find_report_ingest_checkpoints_use_case',
+    'provide_reset_report_ingest_checkpoints_use_case',
+    'provide_run_search_query_ranks_calculation_use_case',
+    'provide_run_search_query_rollups_calculation_use_case',
+    'provide_run_search_query_cache_warm_up_use_case',
+    'provide_get_response_cache_stats_use_case',
+    'provide_response_cache',
+    'provide_get_data_version_use_case',
+    'provide_export_search_query_daily_stats_use_case',
+    'provide_archive_search_query_daily_stats_use_case',
+    'provide_run_search_query_daily_stats_archive_use_case',
+    'provide_suggest_search_queries_use_case',
+    'provide_refresh_search_query_suggest_index_use_case',
 ]
 
 
@@ -20,6 +37,13 @@ async def provide_download_search_query_report_use_case(
     return download_search_query_report_use_case
 
 
+@inject
+async def provide_download_combined_search_query_report_use_case(
+    download_combined_search_query_report_use_case = Provide[Container.download_combined_search_query_report_use_case],
+):
+    return download_combined_search_query_report_use_case
+
+
 @inject
 async def provide_find_search_queies_use_case(
     find_search_queies_use_case = Provide[Container.find_search_queies_use_case],
@@ -27,6 +51,20 @@ async def provide_find_search_queies_use_case(
     return find_search_queies_use_case
 
 
+@inject
+async def provide_find_search_queries_page_use_case(
+    find_search_queries_page_use_case = Provide[Container.find_search_queries_page_use_case],
+) -> FindSearchQueriesPageUseCase:
+    return find_search_queries_page_use_case
+
+
+@inject
+async def provide_find_search_queries_with_statistics_use_case(
+    find_search_queries_with_statistics_use_case = Provide[Container.find_search_queries_with_statistics_use_case],
+) -> FindSearchQueriesWithStatisticsUseCase:
+    return find_search_queries_with_statistics_use_case
+
+
 @inject
 async def provide_find_search_query_daily_stats_use_case(
     find_search_query_daily_stats_use_case = Provide[Container.find_search_query_daily_stats_use_case],
@@ -39,3 +77,94 @@ async def provide_find_total_requests_per_day_use_case(
     find_total_requests_per_day_use_case = Provide[Container.find_total_requests_per_day_use_case],
 ):
     return find_total_requests_per_day_use_case
+
+
+@inject
+async def provide_find_report_ingest_checkpoints_use_case(
+    find_report_ingest_checkpoints_use_case = Provide[Container.find_report_ingest_checkpoints_use_case],
+):
+    return find_report_ingest_checkpoints_use_case
+
+
+@inject
+async def provide_reset_report_ingest_checkpoints_use_case(
+    reset_report_ingest_checkpoints_use_case = Provide[Container.reset_report_ingest_checkpoints_use_case],
+):
+    return reset_report_ingest_checkpoints_use_case
+
+
+@inject
+async def provide_run_search_query_ranks_calculation_use_case(
+    run_search_query_ranks_calculation_use_case = Provide[Container.run_search_query_ranks_calculation_use_case],
+):
+    return run_search_query_ranks_calculation_use_case
+
+
+@inject
+async def provide_run_search_query_rollups_calculation_use_case(
+    run_search_query_rollups_calculation_use_case = Provide[Container.run_search_query_rollups_calculation_use_case],
+):
+    return run_search_query_rollups_calculation_use_case
+
+
+@inject
+async def provide_run_search_query_cache_warm_up_use_case(
+    run_search_query_cache_warm_up_use_case = Provide[Container.run_search_query_cache_warm_up_use_case],
+):
+    return run_search_query_cache_warm_up_use_case
+
+
+@inject
+async def provide_get_response_cache_stats_use_case(
+    get_response_cache_stats_use_case = Provide[Container.get_response_cache_stats_use_case],
+):
+    return get_response_cache_stats_use_case
+
+
+@inject
+async def provide_response_cache(
+    response_cache = Provide[Container.response_cache],
+):
+    return response_cache
+
+
+@inject
+async def provide_get_data_version_use_case(
+    get_data_version_use_case = Provide[Container.get_data_version_use_case],
+):
+    return get_data_version_use_case
+
+
+@inject
+async def provide_export_search_query_daily_stats_use_case(
+    export_search_query_daily_stats_use_case = Provide[Container.export_search_query_daily_stats_use_case],
+):
+    return export_search_query_daily_stats_use_case
+
+
+@inject
+async def provide_archive_search_query_daily_stats_use_case(
+    archive_search_query_daily_stats_use_case = Provide[Container.archive_search_query_daily_stats_use_case],
+):
+    return archive_search_query_daily_stats_use_case
+
+
+@inject
+async def provide_run_search_query_daily_stats_archive_use_case(
+    run_search_query_daily_stats_archive_use_case = Provide[Container.run_search_query_daily_stats_archive_use_case],
+):
+    return run_search_query_daily_stats_archive_use_case
+
+
+@inject
+async def provide_suggest_search_queries_use_case(
+    suggest_search_queries_use_case = Provide[Container.suggest_search_queries_use_case],
+):
+    return suggest_search_queries_use_case
+
+
+@inject
+async def provide_refresh_search_query_suggest_index_use_case(
+    refresh_search_query_suggest_index_use_case = Provide[Container.refresh_search_query_suggest_index_use_case],
+):
+    return refresh_search_query_suggest_index_use_case
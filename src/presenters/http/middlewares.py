@@ -0,0 +1,262 @@
+import hashlib
+import logging
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
+from urllib.parse import urlencode
+
+import orjson
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+
+from application.utils import calendarutil
+
+from . import dependencies
+
+logger = logging.getLogger(__name__)
+
+
+def get_request_cache_key(request: Request) -> str:
+    """
+    Нормализованный ключ запроса: путь, отсортированные параметры, Accept
+    и текущий день. Незаданные даты use case отсчитывают от текущего дня,
+    поэтому после полуночи тот же запрос возвращает другой период.
+    """
+    query_string = urlencode(sorted(request.query_params.multi_items()))
+    accept = request.headers.get('accept', '')
+    today = calendarutil.now().date()
+
+    return f'{request.url.path}?{query_string}#{accept}@{today.isoformat()}'
+
+
+def is_path_matched(path: str, paths: Tuple[str, ...], exclude_paths: Tuple[str, ...]) -> bool:
+    return path.startswith(paths) and not path.startswith(exclude_paths)
+
+
+def dump_cached_response(raw_headers: List[Tuple[bytes, bytes]], content: bytes) -> bytes:
+    headers = [
+        [name.decode('latin-1'), value.decode('latin-1')]
+        for name, value in raw_headers
+        if name != b'content-length'
+    ]
+
+    # orjson экранирует перевод строки, первая строка - всегда заголовки
+    return orjson.dumps(headers) + b'\n' + content
+
+
+def load_cached_response(value: bytes) -> Optional[Tuple[List[Tuple[bytes, bytes]], bytes]]:
+    raw_headers, _, content = value.partition(b'\n')
+
+    # Ответы прежнего формата (только тип содержимого) считаются промахом
+    try:
+        headers = orjson.loads(raw_headers)
+    except orjson.JSONDecodeError:
+        return None
+
+    return [(name.encode('latin-1'), value.encode('latin-1')) for name, value in headers], content
+
+
+def set_headers(response: Response, raw_headers: List[Tuple[bytes, bytes]], cache_status: str) -> Response:
+    # content-length уже посчитан для нового тела (или не нужен для потока)
+    response.raw_headers.extend((name, value) for name, value in raw_headers if name != b'content-length')
+    response.headers['X-Cache'] = cache_status
+
+    return response
+
+
+class ResponseCacheMiddleware(BaseHTTPMiddleware):
+    """
+    Кэширует успешные ответы GET запросов к путям paths.
+
+    Ответ сохраняется вместе с версией данных, которую увеличивают задачи
+    загрузки отчета, поэтому после загрузки кэш устаревает целиком.
+    Если версию уже прочитал ETagMiddleware, используется она: ETag и
+    ответ из кэша относятся к одной версии.
+    Заголовок Cache-Control: no-cache отключает чтение из кэша.
+
+    Заголовки ответа (Vary, Content-Disposition и другие) сохраняются
+    вместе с телом, попадание отдает их без изменений. Ответ длиннее
+    max_size байт не кэшируется и не читается в память целиком: прочитанное
+    начало отдается перед остатком потока.
+    """
+    def __init__(
+        self,
+        app,
+        paths: Sequence[str],
+        ttl: int,
+        exclude_paths: Sequence[str] = (),
+        max_size: Optional[int] = None,
+    ) -> None:
+        super().__init__(app)
+        self._paths = tuple(paths)
+        self._exclude_paths = tuple(exclude_paths)
+        self._ttl = ttl
+        self._max_size = max_size
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        if request.method != 'GET' or not is_path_matched(request.url.path, self._paths, self._exclude_paths):
+            return await call_next(request)
+
+        if 'no-cache' in request.headers.get('cache-control', ''):
+            response = await call_next(request)
+            response.headers['X-Cache'] = 'BYPASS'
+
+            return response
+
+        key = get_request_cache_key(request)
+        data_version = getattr(request.state, 'data_version', None)
+
+        try:
+            response_cache = await dependencies.provide_response_cache()
+            version, content = await response_cache.get(
+                key,
+                data_version.version if data_version is not None else None,
+            )
+        except Exception:
+            logger.warning('Response cache is unavailable', exc_info=True)
+
+            return await call_next(request)
+
+        cached_response = load_cached_response(content) if content is not None else None
+        if cached_response is not None:
+            raw_headers, content = cached_response
+
+            return set_headers(Response(content=content), raw_headers, 'HIT')
+
+        response = await call_next(request)
+        if response.status_code != 200:
+            return response
+
+        content_length = response.headers.get('content-length')
+        if self._max_size is not None and content_length is not None and int(content_length) > self._max_size:
+            response.headers['X-Cache'] = 'MISS'
+
+            return response
+
+        chunks = []
+        size = 0
+        async for chunk in response.body_iterator:
+            chunks.append(chunk)
+            size += len(chunk)
+
+            if self._max_size is not None and size > self._max_size:
+                return set_headers(
+                    StreamingResponse(self._iter_body(chunks, response.body_iterator), status_code=response.status_code),
+                    response.raw_headers,
+                    'MISS',
+                )
+
+        content = b''.join(chunks)
+
+        try:
+            await response_cache.set(key, version, dump_cached_response(response.raw_headers, content), ttl=self._ttl)
+        except Exception:
+            logger.warning('Response cache is unavailable', exc_info=True)
+
+        return set_headers(Response(content=content, status_code=response.status_code), response.raw_headers, 'MISS')
+
+    async def _iter_body(self, chunks: List[bytes], body_iterator: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        for chunk in chunks:
+            yield chunk
+
+        async for chunk in body_iterator:
+            yield chunk
+
+
+class ETagMiddleware(BaseHTTPMiddleware):
+    """
+    Проставляет строгий ETag по версии данных и параметрам запроса и
+    Last-Modified по времени завершения последней загрузки отчета.
+
+    При совпадении If-None-Match отвечает 304 без вызова обработчика,
+    то есть без обращений к use case и базе. Без If-None-Match так же
+    проверяется If-Modified-Since. Прочитанная версия передается в
+    request.state для ResponseCacheMiddleware.
+    """
+    def __init__(self, app, paths: Sequence[str], exclude_paths: Sequence[str] = ()) -> None:
+        super().__init__(app)
+        self._paths = tuple(paths)
+        self._exclude_paths = tuple(exclude_paths)
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        if request.method != 'GET' or not is_path_matched(request.url.path, self._paths, self._exclude_paths):
+            return await call_next(request)
+
+        try:
+            get_data_version_use_case = await dependencies.provide_get_data_version_use_case()
+            data_version = await get_data_version_use_case.execute()
+        except Exception:
+            logger.warning('Data version is unavailable', exc_info=True)
+
+            return await call_next(request)
+
+        request.state.data_version = data_version
+
+        # Ключ запроса включает текущий день: ответы без дат после полуночи
+        # меняются и без новой версии данных
+        etag_value = hashlib.sha1(
+            f'{data_version.version}:{get_request_cache_key(request)}'.encode('UTF-8'),
+        ).hexdigest()
+
+        headers = {'ETag': f'"{etag_value}"'}
+
+        last_modified = self._get_last_modified(data_version.updated_at)
+        if last_modified is not None:
+            headers['Last-Modified'] = format_datetime(last_modified, usegmt=True)
+
+        # If-Modified-Since учитывается только без If-None-Match (RFC 9110)
+        if_none_match = request.headers.get('if-none-match')
+        if if_none_match:
+            is_not_modified = self._is_not_modified(if_none_match, etag_value)
+        else:
+            is_not_modified = self._is_not_modified_since(request.headers.get('if-modified-since'), last_modified)
+
+        if is_not_modified:
+            return Response(status_code=304, headers=headers)
+
+        response = await call_next(request)
+        if response.status_code == 200:
+            response.headers.update(headers)
+
+        return response
+
+    def _get_last_modified(self, updated_at: Optional[datetime]) -> Optional[datetime]:
+        if updated_at is None:
+            return None
+
+        # Ответы без дат меняются в полночь и без новой версии данных
+        now = calendarutil.now()
+        start_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        if start_of_day.tzinfo is None:
+            start_of_day = start_of_day.astimezone()
+
+        return max(updated_at, start_of_day.astimezone(timezone.utc))
+
+    def _is_not_modified_since(self, if_modified_since: Optional[str], last_modified: Optional[datetime]) -> bool:
+        if not if_modified_since or last_modified is None:
+            return False
+
+        try:
+            modified_since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+
+        # Дата без зоны в заголовке недопустима, такой заголовок не учитывается
+        if modified_since.tzinfo is None:
+            return False
+
+        return last_modified <= modified_since
+
+    def _is_not_modified(self, if_none_match: str, etag_value: str) -> bool:
+        if not if_none_match:
+            return False
+
+        if if_none_match.strip() == '*':
+            return True
+
+        # Сравнение слабое (RFC 9110): W/"x" совпадает с "x"
+        return any(
+            tag.strip().removeprefix('W/').strip('"') == etag_value
+            for tag in if_none_match.split(',')
+        )
@@ -0,0 +1,149 @@
+from datetime import date
+from typing import List, Optional
+
+import msgpack
+import orjson
+import pyarrow as pa
+from starlette.responses import Response
+
+from domain.entities.search_query_page_entity import SearchQueryPageEntity
+
+JSON_MEDIA_TYPE = 'application/json'
+MSGPACK_MEDIA_TYPE = 'application/msgpack'
+ARROW_MEDIA_TYPE = 'application/vnd.apache.arrow.stream'
+
+# Порядок задает выбор при равном q, первый тип - ответ по умолчанию
+MEDIA_TYPES = {
+    JSON_MEDIA_TYPE: JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE: MSGPACK_MEDIA_TYPE,
+    'application/x-msgpack': MSGPACK_MEDIA_TYPE,
+    ARROW_MEDIA_TYPE: ARROW_MEDIA_TYPE,
+}
+
+REQUESTS_FIELDS = (
+    'requests_per_week',
+    'requests_per_month',
+    'requests_per_three_months',
+)
+
+
+def negotiate_media_type(accept: Optional[str]) -> str:
+    """
+    Выбирает формат ответа по заголовку Accept с учетом q. Если ни один
+    поддерживаемый тип не указан, отвечает JSON.
+    """
+    best_media_type, best_quality = JSON_MEDIA_TYPE, 0.0
+
+    for item in (accept or '').split(','):
+        media_range, *params = [part.strip() for part in item.split(';')]
+
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+
+        media_type = MEDIA_TYPES.get(media_range.lower())
+        if media_type is not None and quality > best_quality:
+            best_media_type, best_quality = media_type, quality
+
+    return best_media_type
+
+
+def get_rows_payload(page: SearchQueryPageEntity) -> dict:
+    return {
+        'result': [{
+            'id': search_query.id,
+            'text': search_query.value,
+            'rank': search_query.rank,
+            'rank_delta': search_query.rank_delta,
+            'statistics': [{
+                'date': day,
+                'requests_per_week': requests_per_week,
+                'requests_per_month': requests_per_month,
+                'requests_per_three_months': requests_per_three_months,
+            } for day, requests_per_week, requests_per_month, requests_per_three_months in zip(
+                search_query.days,
+                search_query.requests_per_week,
+                search_query.requests_per_month,
+                search_query.requests_per_three_months,
+            )],
+        } for search_query in page.items],
+        'next_cursor': page.next_cursor,
+    }
+
+
+def get_columnar_payload(page: SearchQueryPageEntity) -> dict:
+    # Массивы репозитория передаются как есть, без разбора на точки
+    return {
+        'result': [{
+            'id': search_query.id,
+            'text': search_query.value,
+            'rank': search_query.rank,
+            'rank_delta': search_query.rank_delta,
+            'dates': search_query.days,
+            'values': {
+                field: getattr(search_query, field)
+                for field in REQUESTS_FIELDS
+            },
+        } for search_query in page.items],
+        'next_cursor': page.next_cursor,
+    }
+
+
+def encode_msgpack_default(obj):
+    if isinstance(obj, date):
+        return obj.isoformat()
+
+    raise TypeError(f'Object of type {type(obj).__name__} is not MessagePack serializable')
+
+
+def encode_arrow(page: SearchQueryPageEntity) -> bytes:
+    """
+    Одна строка Arrow на запрос, ряды статистики - списочные столбцы.
+    Курсор следующей страницы передается в метаданных схемы.
+    """
+    items = page.items
+
+    def get_column(field: str) -> List:
+        return [getattr(search_query, field) for search_query in items]
+
+    table = pa.table(
+        {
+            'id': pa.array(get_column('id'), pa.int64()),
+            'text': pa.array(get_column('value'), pa.string()),
+            'rank': pa.array(get_column('rank'), pa.int64()),
+            'rank_delta': pa.array(get_column('rank_delta'), pa.int64()),
+            'dates': pa.array(get_column('days'), pa.list_(pa.date32())),
+            **{
+                field: pa.array(get_column(field), pa.list_(pa.int64()))
+                for field in REQUESTS_FIELDS
+            },
+        },
+        metadata={'next_cursor': page.next_cursor or ''},
+    )
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+
+    return sink.getvalue().to_pybytes()
+
+
+def render_search_queries_page(page: SearchQueryPageEntity, media_type: str, columnar: bool = False) -> Response:
+    if media_type == ARROW_MEDIA_TYPE:
+        return Response(content=encode_arrow(page), media_type=ARROW_MEDIA_TYPE)
+
+    payload = get_columnar_payload(page) if columnar else get_rows_payload(page)
+
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return Response(
+            content=msgpack.packb(payload, default=encode_msgpack_default),
+            media_type=MSGPACK_MEDIA_TYPE,
+        )
+
+    # orjson сериализует date в ISO 8601 сам и в разы быстрее json
+    return Response(content=orjson.dumps(payload), media_type=JSON_MEDIA_TYPE)
@@ -1,12 +1,28 @@
-from fastapi import Depends
+from datetime import date
+from typing import List, Optional
+
+from fastapi import Depends, Query
 from fastapi.routing import APIRouter
 
+from application.use_cases.search_query_daily_stats_use_cases import (
+    RunSearchQueryDailyStatsArchiveUseCase,
+    RunSearchQueryRanksCalculationUseCase,
+    RunSearchQueryRollupsCalculationUseCase,
+)
 from application.use_cases.search_query_use_cases import (
-    DownloadSearchQueryReportUseCase,
+    DownloadCombinedSearchQueryReportUseCase, DownloadSearchQueryReportUseCase,
+    RunSearchQueryCacheWarmUpUseCase,
 )
 from domain.enums.report_period_enum import ReportPeriod
 
-from ..dependencies import provide_download_search_query_report_use_case
+from ..dependencies import (
+    provide_download_combined_search_query_report_use_case,
+    provide_download_search_query_report_use_case,
+    provide_run_search_query_cache_warm_up_use_case,
+    provide_run_search_query_daily_stats_archive_use_case,
+    provide_run_search_query_ranks_calculation_use_case,
+    provide_run_search_query_rollups_calculation_use_case,
+)
 
 router = APIRouter()
 
@@ -16,3 +32,41 @@ async def run_download_one_week_report_command(
     download_search_query_report_use_case: DownloadSearchQueryReportUseCase = Depends(provide_download_search_query_report_use_case)
 ) -> None:
     await download_search_query_report_use_case.execute(ReportPeriod.ONE_WEEK)
+
+
+@router.post('/download_combined_report/')
+async def run_download_combined_report_command(
+    download_combined_search_query_report_use_case: DownloadCombinedSearchQueryReportUseCase = Depends(provide_download_combined_search_query_report_use_case)
+) -> None:
+    await download_combined_search_query_report_use_case.execute()
+
+
+@router.post('/calculate_search_query_ranks/')
+async def run_calculate_search_query_ranks_command(
+    day: Optional[date] = None,
+    run_search_query_ranks_calculation_use_case: RunSearchQueryRanksCalculationUseCase = Depends(provide_run_search_query_ranks_calculation_use_case)
+) -> None:
+    await run_search_query_ranks_calculation_use_case.execute(day)
+
+
+@router.post('/calculate_search_query_rollups/')
+async def run_calculate_search_query_rollups_command(
+    days: List[date] = Query(default=[], alias='day'),
+    run_search_query_rollups_calculation_use_case: RunSearchQueryRollupsCalculationUseCase = Depends(provide_run_search_query_rollups_calculation_use_case)
+) -> None:
+    await run_search_query_rollups_calculation_use_case.execute(days)
+
+
+@router.post('/archive_daily_stats/')
+async def run_archive_daily_stats_command(
+    days: List[date] = Query(default=[], alias='day'),
+    run_search_query_daily_stats_archive_use_case: RunSearchQueryDailyStatsArchiveUseCase = Depends(provide_run_search_query_daily_stats_archive_use_case)
+) -> None:
+    await run_search_query_daily_stats_archive_use_case.execute(days)
+
+
+@router.post('/warm_up_search_query_cache/')
+async def run_warm_up_search_query_cache_command(
+    run_search_query_cache_warm_up_use_case: RunSearchQueryCacheWarmUpUseCase = Depends(provide_run_search_query_cache_warm_up_use_case)
+) -> None:
+    await run_search_query_cache_warm_up_use_case.execute()
@@ -0,0 +1,143 @@
+import asyncio
+import csv
+import io
+import json
+from datetime import date
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
+
+from fastapi import Depends, Query
+from fastapi.responses import StreamingResponse
+from fastapi.routing import APIRouter
+
+from application.use_cases import (
+    ArchiveSearchQueryDailyStatsUseCase, ExportSearchQueryDailyStatsUseCase,
+)
+from domain.entities.search_query_daily_stats_entity import (
+    SearchQueryDailyStatsEntity,
+)
+
+from ..dependencies import (
+    provide_archive_search_query_daily_stats_use_case,
+    provide_export_search_query_daily_stats_use_case,
+)
+
+router = APIRouter()
+
+# Строки отдаются пачками, чтобы не писать в сокет по одной строке
+EXPORT_BATCH_SIZE = 1000
+# Число сжатых кусков COPY, ожидающих отправки клиенту
+ARCHIVE_QUEUE_SIZE = 16
+
+EXPORT_FIELDS = (
+    'id',
+    'text',
+    'date',
+    'requests_per_week',
+    'requests_per_month',
+    'requests_per_three_months',
+)
+
+
+def get_export_row(stats: SearchQueryDailyStatsEntity) -> tuple:
+    return (
+        stats.searchquery_id,
+        stats.value,
+        stats.day.isoformat(),
+        stats.requests_per_week,
+        stats.requests_per_month,
+        stats.requests_per_three_months,
+    )
+
+
+async def iter_ndjson(daily_stats: AsyncIterator[SearchQueryDailyStatsEntity]) -> AsyncIterator[str]:
+    lines = []
+    async for stats in daily_stats:
+        lines.append(json.dumps(dict(zip(EXPORT_FIELDS, get_export_row(stats))), ensure_ascii=False))
+
+        if len(lines) >= EXPORT_BATCH_SIZE:
+            yield '\n'.join(lines) + '\n'
+            lines.clear()
+
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+async def iter_csv(daily_stats: AsyncIterator[SearchQueryDailyStatsEntity]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+
+    rows_count = 0
+
+    async for stats in daily_stats:
+        writer.writerow(get_export_row(stats))
+        rows_count += 1
+
+        if rows_count % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue()
+
+
+@router.get('/daily-stats/')
+async def export_search_query_daily_stats(
+    day: Optional[date] = None,
+    format: str = Query(default='ndjson', pattern='^(ndjson|csv)$'),
+    export_search_query_daily_stats_use_case: ExportSearchQueryDailyStatsUseCase = Depends(provide_export_search_query_daily_stats_use_case),
+) -> StreamingResponse:
+    daily_stats = export_search_query_daily_stats_use_case.execute(day)
+
+    if format == 'csv':
+        return StreamingResponse(iter_csv(daily_stats), media_type='text/csv; charset=utf-8')
+
+    return StreamingResponse(iter_ndjson(daily_stats), media_type='application/x-ndjson')
+
+
+async def iter_output(
+    produce: Callable[[Callable[[bytes], Awaitable[None]]], Awaitable[None]],
+) -> AsyncIterator[bytes]:
+    """
+    Превращает выгрузку, которая сама передает куски в output, в асинхронный
+    итератор. Очередь ограничена, поэтому медленный клиент притормаживает
+    чтение COPY, а отключение клиента отменяет выгрузку.
+    """
+    queue = asyncio.Queue(maxsize=ARCHIVE_QUEUE_SIZE)
+
+    task = asyncio.create_task(produce(queue.put))
+    try:
+        while True:
+            get = asyncio.ensure_future(queue.get())
+            await asyncio.wait({get, task}, return_when=asyncio.FIRST_COMPLETED)
+
+            if get.done():
+                yield get.result()
+                continue
+
+            get.cancel()
+            while not queue.empty():
+                yield queue.get_nowait()
+
+            # Пробрасывает ошибку выгрузки
+            task.result()
+            break
+    finally:
+        task.cancel()
+
+
+@router.get('/daily-stats.csv.gz')
+async def archive_search_query_daily_stats(
+    days: List[date] = Query(alias='day'),
+    archive_search_query_daily_stats_use_case: ArchiveSearchQueryDailyStatsUseCase = Depends(provide_archive_search_query_daily_stats_use_case),
+) -> StreamingResponse:
+    async def produce(output: Callable[[bytes], Awaitable[None]]) -> None:
+        await archive_search_query_daily_stats_use_case.execute(days, output)
+
+    file_name = f'{min(days).isoformat()}_{max(days).isoformat()}_daily_stats.csv.gz'
+
+    return StreamingResponse(
+        iter_output(produce),
+        media_type='application/gzip',
+        headers={'Content-Disposition': f'attachment; filename="{file_name}"'},
+    )
@@ -0,0 +1,48 @@
+from typing import Optional
+
+from fastapi import Depends
+from fastapi.routing import APIRouter
+
+from application.use_cases import (
+    FindReportIngestCheckpointsUseCase, ResetReportIngestCheckpointsUseCase,
+)
+from domain.enums.report_period_enum import ReportPeriod
+
+from ..dependencies import (
+    provide_find_report_ingest_checkpoints_use_case,
+    provide_reset_report_ingest_checkpoints_use_case,
+)
+
+router = APIRouter()
+
+
+@router.get('/')
+async def get_report_ingest_checkpoints(
+    report_file_path: Optional[str] = None,
+    period: Optional[ReportPeriod] = None,
+    find_report_ingest_checkpoints_use_case: FindReportIngestCheckpointsUseCase = Depends(provide_find_report_ingest_checkpoints_use_case),
+) -> dict:
+    result = await find_report_ingest_checkpoints_use_case.execute(
+        report_file_path=report_file_path,
+        period=period,
+    )
+
+    return {
+        'result': result,
+    }
+
+
+@router.delete('/')
+async def reset_report_ingest_checkpoints(
+    report_file_path: Optional[str] = None,
+    period: Optional[ReportPeriod] = None,
+    reset_report_ingest_checkpoints_use_case: ResetReportIngestCheckpointsUseCase = Depends(provide_reset_report_ingest_checkpoints_use_case),
+) -> dict:
+    deleted = await reset_report_ingest_checkpoints_use_case.execute(
+        report_file_path=report_file_path,
+        period=period,
+    )
+
+    return {
+        'deleted': deleted,
+    }
@@ -0,0 +1,18 @@
+from fastapi import Depends
+from fastapi.routing import APIRouter
+
+from application.use_cases import GetResponseCacheStatsUseCase
+
+from ..dependencies import provide_get_response_cache_stats_use_case
+
+router = APIRouter()
+
+
+@router.get('/stats/')
+async def get_response_cache_stats(
+    get_response_cache_stats_use_case: GetResponseCacheStatsUseCase = Depends(provide_get_response_cache_stats_use_case),
+) -> dict:
+    return {
+        'result': await get_response_cache_stats_use_case.execute(),
+    }
+
@@ -2,72 +2,86 @@
 from datetime import date
 from typing import List, Optional
 
-from fastapi import Depends, Query
+from fastapi import Depends, HTTPException, Query, Request, Response
 from fastapi.routing import APIRouter
 
 from application.use_cases import (
-    FindSearchQueriesUseCase, FindSearchQueryDailyStatsUseCase,
-    FindTotalRequestsPerDayUseCase,
+    FindSearchQueriesWithStatisticsUseCase, FindTotalRequestsPerDayUseCase,
+    SuggestSearchQueriesUseCase,
 )
 
 from ..dependencies import (
-    provide_find_search_queies_use_case,
-    provide_find_search_query_daily_stats_use_case,
+    provide_find_search_queries_with_statistics_use_case,
     provide_find_total_requests_per_day_use_case,
+    provide_suggest_search_queries_use_case,
 )
+from ..renderers import negotiate_media_type, render_search_queries_page
 
 router = APIRouter()
 
 
 @router.get('/')
 async def get_search_query_daily_stats(
+    request: Request,
     from_date: Optional[date] = None,
     to_date: Optional[date] = None,
     search_query_ids: List[int] = Query(default=[], alias='search_query_id'),
     search: Optional[str] = None,
+    search_mode: str = 'fulltext',
     sort_by: Optional[str] = None,
     sort_dir: str = 'desc',
     limit: int = 100,
-    offset: int = 0,
-    find_search_queries_use_case: FindSearchQueriesUseCase = Depends(provide_find_search_queies_use_case),
-    find_search_query_daily_stats_use_case: FindSearchQueryDailyStatsUseCase = Depends(provide_find_search_query_daily_stats_use_case),
-) -> None:
-    search_queries = await find_search_queries_use_case.execute(
-        search_query_ids=search_query_ids,
-        search=search,
-        sort_by=sort_by,
-        sort_dir=sort_dir,
-        limit=limit,
-        offset=offset,
+    cursor: Optional[str] = None,
+    granularity: str = Query(default='day', pattern='^(day|week|month)$'),
+    response_format: str = Query(default='rows', alias='format', pattern='^(rows|columnar)$'),
+    find_search_queries_with_statistics_use_case: FindSearchQueriesWithStatisticsUseCase = Depends(provide_find_search_queries_with_statistics_use_case),
+) -> Response:
+    try:
+        search_queries_page = await find_search_queries_with_statistics_use_case.execute(
+            from_date=from_date,
+            to_date=to_date,
+            search_query_ids=search_query_ids,
+            search=search,
+            search_mode=search_mode,
+            sort_by=sort_by,
+            sort_dir=sort_dir,
+            limit=limit,
+            cursor=cursor,
+            granularity=granularity,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    response = render_search_queries_page(
+        search_queries_page,
+        media_type=negotiate_media_type(request.headers.get('accept')),
+        columnar=response_format == 'columnar',
     )
+    response.headers['Vary'] = 'Accept'
 
-    result = []
-    search_query_index_by_id = {}
-    for i, search_query in enumerate(search_queries):
-        search_query_index_by_id[search_query.id] = i
+    return response
 
-        result.append({
-            'id': search_query.id,
-            'text': search_query.value,
-            'statistics': [],
-        })
 
-    daily_search_query_stats = await find_search_query_daily_stats_use_case.execute(
-        from_date=from_date,
-        to_date=to_date,
-        search_query_ids=list(search_query_index_by_id.keys()),
-    )
-
-    for stats in daily_search_query_stats:
-        result_index = search_query_index_by_id[stats.searchquery_id]
-
-        result[result_index]['statistics'].append({
-            'date': stats.day,
-            'requests_per_week': stats.requests_per_week,
-        })
+@router.get('/suggest/')
+async def get_search_query_suggestions(
+    q: str = '',
+    limit: int = Query(default=10, ge=1),
+    suggest_search_queries_use_case: SuggestSearchQueriesUseCase = Depends(provide_suggest_search_queries_use_case),
+) -> dict:
+    try:
+        suggestions = await suggest_search_queries_use_case.execute(
+            prefix=q,
+            limit=limit,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
 
     return {
-        'result': result,
+        'result': [{
+            'id': suggestion.id,
+            'text': suggestion.value,
+            'requests_per_week': suggestion.requests_per_week,
+        } for suggestion in suggestions],
     }
 
 
@@ -75,16 +89,21 @@ async def get_search_query_daily_stats(
 async def get_total_requests_per_day_day(
     from_date: Optional[date] = None,
     to_date: Optional[date] = None,
+    granularity: str = Query(default='day', pattern='^(day|week|month)$'),
     find_total_requests_per_day_use_case: FindTotalRequestsPerDayUseCase = Depends(provide_find_total_requests_per_day_use_case),
 ) -> dict:
     result = await find_total_requests_per_day_use_case.execute(
         from_date=from_date,
         to_date=to_date,
+        granularity=granularity,
     )
 
     return {
         'result': [{
             'date': item['day'],
             'value': item['total_number_per_week'],
+            'queries_count': item['queries_count'],
+            'min_value': item['min_number_per_week'],
+            'max_value': item['max_number_per_week'],
         } for item in result],
     }
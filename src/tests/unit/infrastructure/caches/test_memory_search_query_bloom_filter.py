@@ -0,0 +1,80 @@
+from infrastructure.caches.memory_search_query_bloom_filter import (
+    MemorySearchQueryBloomFilter,
+)
+
+
+def load(bloom_filter: MemorySearchQueryBloomFilter, values: list, first_id: int = 1) -> None:
+    bloom_filter.load_values((value, i) for i, value in enumerate(values, first_id))
+    bloom_filter.finish_loading()
+
+
+def test_no_false_negatives():
+    values = [f'запрос {i}' for i in range(10000)]
+    bloom_filter = MemorySearchQueryBloomFilter(capacity=len(values), error_rate=0.01)
+    load(bloom_filter, values)
+
+    assert all(bloom_filter.might_contain(value) for value in values)
+    assert bloom_filter.max_id == len(values)
+
+
+def test_false_positive_rate():
+    bloom_filter = MemorySearchQueryBloomFilter(capacity=10000, error_rate=0.01)
+    load(bloom_filter, [f'запрос {i}' for i in range(10000)])
+
+    false_positives = sum(bloom_filter.might_contain(f'другой запрос {i}') for i in range(10000))
+
+    assert false_positives < 300
+
+
+def test_not_ready_answers_maybe():
+    bloom_filter = MemorySearchQueryBloomFilter(capacity=100)
+
+    assert bloom_filter.might_contain('запрос')
+    assert not bloom_filter.is_ready
+
+    # Загрузка начата, но не завершена: фильтр еще неполный
+    bloom_filter.load_values([('другой запрос', 1)])
+
+    assert bloom_filter.might_contain('запрос')
+
+    bloom_filter.finish_loading()
+
+    assert bloom_filter.is_ready
+    assert not bloom_filter.might_contain('запрос')
+
+
+def test_add_many_before_load_is_ignored():
+    bloom_filter = MemorySearchQueryBloomFilter(capacity=100)
+    bloom_filter.add_many(['новый запрос'])
+
+    assert len(bloom_filter) == 0
+
+    # Загрузка читает значения из базы, в том числе добавленные до нее
+    load(bloom_filter, ['новый запрос', 'запрос'])
+
+    assert bloom_filter.might_contain('новый запрос')
+    assert len(bloom_filter) == 2
+
+
+def test_add_many_after_load():
+    bloom_filter = MemorySearchQueryBloomFilter(capacity=100)
+    load(bloom_filter, ['запрос'])
+
+    bloom_filter.add_many(['новый запрос'])
+
+    assert bloom_filter.might_contain('новый запрос')
+    assert len(bloom_filter) == 2
+
+
+def test_reloading_values_does_not_change_filter():
+    values = [f'запрос {i}' for i in range(100)]
+    bloom_filter = MemorySearchQueryBloomFilter(capacity=1000)
+    load(bloom_filter, values)
+    bits = bytes(bloom_filter._bits)
+
+    # Окно повторного чтения при догрузке
+    load(bloom_filter, values[50:], first_id=51)
+
+    assert bytes(bloom_filter._bits) == bits
+    assert len(bloom_filter) == len(values)
+    assert bloom_filter.max_id == len(values)
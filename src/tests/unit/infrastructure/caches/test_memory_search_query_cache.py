@@ -0,0 +1,191 @@
+import pytest
+
+from domain.entities.search_query_entity import SearchQueryEntity
+from infrastructure.caches import memory_search_query_cache
+from infrastructure.caches.memory_search_query_cache import (
+    MemorySearchQueryCache,
+)
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(memory_search_query_cache.time, 'monotonic', clock)
+
+    return clock
+
+
+def create_query(search_query_id: int) -> SearchQueryEntity:
+    return SearchQueryEntity(id=search_query_id, value=f'запрос {search_query_id}')
+
+
+async def get_cached_ids(cache: MemorySearchQueryCache, ids) -> list:
+    found = await cache.get_queries_by_values([create_query(i).value for i in ids])
+
+    return sorted(query.id for query in found.values())
+
+
+async def test_lru_evicts_least_recently_read():
+    cache = MemorySearchQueryCache(max_entries=3, policy='lru')
+    await cache.save_many([create_query(i) for i in (1, 2, 3)])
+
+    await cache.get_query_by_value(create_query(1).value)
+    await cache.save_many([create_query(4)])
+    await cache.save_many([create_query(5)])
+
+    # Чтение сделало 1 самой свежей: вытесняются 2 и 3
+    assert await get_cached_ids(cache, range(1, 6)) == [1, 4, 5]
+    assert (await cache.get_stats())['evictions'] == 2
+
+
+async def test_lfu_evicts_least_frequently_read():
+    cache = MemorySearchQueryCache(max_entries=3, policy='lfu')
+    await cache.save_many([create_query(i) for i in (1, 2, 3)])
+
+    for _ in range(2):
+        await cache.get_query_by_value(create_query(1).value)
+    await cache.get_query_by_value(create_query(3).value)
+
+    await cache.save_many([create_query(4)])
+
+    # 2 читалась реже всех
+    assert len(cache) == 3
+    assert await cache.get_query_by_value(create_query(2).value) is None
+
+    await cache.save_many([create_query(5)])
+
+    # Из равных по числу чтений вытесняется давняя: 4 новее 3, но читалась реже
+    assert await get_cached_ids(cache, (1, 3, 4, 5)) == [1, 3, 5]
+
+
+async def test_lfu_min_hits_after_removal():
+    cache = MemorySearchQueryCache(max_entries=2, policy='lfu')
+    await cache.save_many([create_query(1), create_query(2)])
+    await cache.get_query_by_value(create_query(1).value)
+    await cache.get_query_by_value(create_query(2).value)
+
+    # Единственная запись с одним чтением уходит, наименьшее число чтений устаревает
+    cache.invalidate([create_query(1).value])
+    await cache.get_query_by_value(create_query(2).value)
+    await cache.save_many([create_query(3), create_query(4)])
+
+    assert await get_cached_ids(cache, (2, 3, 4)) == [2, 4]
+
+
+async def test_max_bytes():
+    query = create_query(1)
+    cache = MemorySearchQueryCache(max_bytes=2 * memory_search_query_cache.get_size(query))
+
+    await cache.save_many([create_query(i) for i in (1, 2, 3)])
+
+    assert await get_cached_ids(cache, (1, 2, 3)) == [2, 3]
+    assert (await cache.get_stats())['bytes'] <= 2 * memory_search_query_cache.get_size(query)
+
+
+async def test_expires_by_monotonic_time(clock):
+    cache = MemorySearchQueryCache(ttl=60)
+    await cache.save_many([create_query(1)])
+    await cache.save_many([create_query(2)], ttl=120)
+
+    clock.now += 60
+
+    assert await cache.get_query_by_value(create_query(1).value) is None
+    assert await cache.get_query_by_id(2) == create_query(2)
+    assert len(cache) == 1
+    assert (await cache.get_stats())['expirations'] == 1
+
+
+async def test_sweep_on_save(clock):
+    cache = MemorySearchQueryCache(ttl=60, sweep_size=1)
+    await cache.save_many([create_query(1), create_query(2)])
+    await cache.save_missing_values(['нет', 'тоже нет'], 60)
+
+    clock.now += 60
+    await cache.save_many([create_query(3)])
+
+    # Проверяется не больше sweep_size записей и отметок от начала очереди
+    assert len(cache) == 2
+    assert (await cache.get_stats())['missing_values'] == 1
+
+    await cache.save_many([create_query(4)])
+
+    assert len(cache) == 2
+    assert (await cache.get_stats())['missing_values'] == 0
+    assert cache.sweep() == 0
+
+
+async def test_sweep_skips_recently_read(clock):
+    cache = MemorySearchQueryCache(ttl=60, sweep_size=1)
+    await cache.save_many([create_query(1), create_query(2)])
+    await cache.get_query_by_value(create_query(1).value)
+
+    clock.now += 30
+    await cache.save_many([create_query(3)])
+
+    clock.now += 30
+
+    # Первая в очереди lru - давно не читавшаяся запись 2
+    assert cache.sweep(1) == 1
+    assert cache.sweep() == 1
+    assert len(cache) == 1
+
+
+async def test_missing_values(clock):
+    cache = MemorySearchQueryCache(max_entries=2)
+    await cache.save_missing_values(['а', 'б'], 60)
+    await cache.save_missing_values(['а', 'в'], 10)
+
+    # 'б' - самая давняя отметка
+    assert await cache.get_missing_values(['а', 'б', 'в']) == {'а', 'в'}
+
+    clock.now += 10
+
+    assert await cache.get_missing_values(['а', 'в']) == set()
+
+    await cache.save_missing_values([create_query(1).value], 60)
+    await cache.save_many([create_query(1)])
+
+    assert await cache.get_missing_values([create_query(1).value]) == set()
+
+
+async def test_replaces_entry_with_same_id():
+    cache = MemorySearchQueryCache(policy='lfu')
+    await cache.save_many([SearchQueryEntity(id=1, value='старое')])
+    await cache.save_many([SearchQueryEntity(id=1, value='новое')])
+
+    assert await cache.get_query_by_value('старое') is None
+    assert await cache.get_query_by_id(1) == SearchQueryEntity(id=1, value='новое')
+    assert len(cache) == 1
+    assert (await cache.get_stats())['bytes'] == memory_search_query_cache.get_size(SearchQueryEntity(id=1, value='новое'))
+
+
+async def test_replaces_entry_with_same_value():
+    cache = MemorySearchQueryCache()
+    await cache.save_many([SearchQueryEntity(id=1, value='запрос')])
+    await cache.save_many([SearchQueryEntity(id=2, value='запрос')])
+
+    assert await cache.get_query_by_id(1) is None
+    assert await cache.get_query_by_value('запрос') == SearchQueryEntity(id=2, value='запрос')
+    assert len(cache) == 1
+
+
+async def test_zero_max_entries_disables_cache():
+    cache = MemorySearchQueryCache(max_entries=0)
+    await cache.save_many([create_query(1)])
+    await cache.save_missing_values(['нет'], 60)
+
+    assert len(cache) == 0
+    assert await cache.get_missing_values(['нет']) == set()
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        MemorySearchQueryCache(policy='fifo')
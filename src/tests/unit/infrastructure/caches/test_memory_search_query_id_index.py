@@ -0,0 +1,75 @@
+import random
+
+from infrastructure.caches.memory_search_query_id_index import (
+    MemorySearchQueryIdIndex,
+)
+
+
+def load(index: MemorySearchQueryIdIndex, values: list, first_id: int = 1) -> None:
+    index.load_batch((value, i) for i, value in enumerate(values, first_id))
+    index.finish_loading()
+
+
+def test_get_ids():
+    values = [f'запрос {i}' for i in range(10000)]
+    random.Random(0).shuffle(values)
+
+    index = MemorySearchQueryIdIndex()
+    load(index, values)
+
+    assert index.get_ids(values) == {value: i for i, value in enumerate(values, 1)}
+    assert index.get_ids(['другой запрос']) == {}
+    assert len(index) == len(values)
+
+
+def test_empty():
+    index = MemorySearchQueryIdIndex()
+    load(index, [])
+
+    assert index.get_ids(['запрос']) == {}
+    assert len(index) == 0
+
+
+def test_add():
+    index = MemorySearchQueryIdIndex()
+    load(index, ['запрос'])
+
+    index.add('новый запрос', 2)
+
+    assert index.get_ids(['запрос', 'новый запрос']) == {'запрос': 1, 'новый запрос': 2}
+
+
+def test_hash_collision_is_not_returned(monkeypatch):
+    fingerprint = MemorySearchQueryIdIndex._fingerprint
+
+    # Значения с одинаковым хэшем и разной проверкой
+    def colliding_fingerprint(value: str) -> bytes:
+        return bytes(8) + fingerprint(value)[8:]
+
+    monkeypatch.setattr(MemorySearchQueryIdIndex, '_fingerprint', staticmethod(colliding_fingerprint))
+
+    index = MemorySearchQueryIdIndex()
+    load(index, ['запрос'])
+
+    assert index.get_ids(['запрос', 'другой запрос']) == {'запрос': 1}
+
+    index.add('другой запрос', 2)
+
+    assert index.get_ids(['запрос', 'другой запрос']) == {'запрос': 1, 'другой запрос': 2}
+
+
+def test_hash_collision_on_load(monkeypatch):
+    fingerprint = MemorySearchQueryIdIndex._fingerprint
+
+    def colliding_fingerprint(value: str) -> bytes:
+        if value.startswith('совпадение'):
+            return bytes(8) + fingerprint(value)[8:]
+
+        return fingerprint(value)
+
+    monkeypatch.setattr(MemorySearchQueryIdIndex, '_fingerprint', staticmethod(colliding_fingerprint))
+
+    index = MemorySearchQueryIdIndex()
+    load(index, ['совпадение 1', 'запрос', 'совпадение 2'])
+
+    assert index.get_ids(['совпадение 1', 'запрос', 'совпадение 2']) == {'запрос': 2}
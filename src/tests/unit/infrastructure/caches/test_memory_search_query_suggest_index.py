@@ -0,0 +1,102 @@
+from infrastructure.caches.memory_search_query_suggest_index import (
+    MemorySearchQuerySuggestIndex,
+)
+
+VALUES = [
+    'платье', 'Платье красное', 'платье синее', 'платье летнее', 'платье вечернее',
+    'пальто', 'пальто женское', 'пальто мужское', 'пальто', 'палатка',
+    'куртка', 'куртка зимняя', 'кроссовки',
+]
+
+
+def get_weight(search_query_id: int) -> int:
+    # Разные частоты, чтобы порядок не зависел от равных весов
+    return search_query_id * 7 % 13 + 1
+
+
+def create_index(scan_limit: int, top_size: int = 3) -> MemorySearchQuerySuggestIndex:
+    index = MemorySearchQuerySuggestIndex(top_size=top_size, scan_limit=scan_limit)
+    index.load_values((value, i) for i, value in enumerate(VALUES, 1))
+    index.load_weights((i, get_weight(i)) for i in range(1, len(VALUES) + 1))
+    index.finish_loading()
+
+    return index
+
+
+def suggest_by_scan(prefix: str, limit: int) -> list:
+    found = [
+        (get_weight(i), i)
+        for i, value in enumerate(VALUES, 1)
+        if value.lower().startswith(prefix.lower())
+    ]
+
+    return [i for _, i in sorted(found, reverse=True)[:limit]]
+
+
+def get_prefixes() -> set:
+    return {value.lower()[:n] for value in VALUES for n in range(len(value) + 1)}
+
+
+def test_build_top_only_for_ranges_longer_than_scan_limit():
+    index = create_index(scan_limit=4)
+    keys = index._state.keys
+
+    expected = {
+        prefix for prefix in get_prefixes()
+        if sum(key.startswith(prefix) for key in keys) > 4
+    }
+
+    assert set(index._state.top) == expected
+    assert {'', 'п', 'па', 'пл', 'платье'} <= expected
+
+
+def test_build_top_positions():
+    index = create_index(scan_limit=2)
+    state = index._state
+
+    for prefix, positions in state.top.items():
+        assert [state.ids[i] for i in positions] == suggest_by_scan(prefix, 3)
+
+
+def test_suggest_across_scan_limit():
+    # 'пальто' - 3 значения, 'платье' - 5: по обе стороны scan_limit
+    for scan_limit in (0, 3, 4, 5, 1024):
+        index = create_index(scan_limit=scan_limit)
+
+        for prefix in get_prefixes() | {'x', 'платье красное и'}:
+            for limit in (1, 3, 10):
+                suggestions = index.suggest(prefix, limit)
+
+                # limit не больше top_size
+                assert [suggestion.id for suggestion in suggestions] == suggest_by_scan(prefix, min(limit, 3))
+                assert all(
+                    suggestion.requests_per_week == get_weight(suggestion.id)
+                    and suggestion.value == VALUES[suggestion.id - 1]
+                    for suggestion in suggestions
+                )
+
+
+def test_suggest_normalizes_prefix():
+    index = create_index(scan_limit=2)
+
+    assert [suggestion.id for suggestion in index.suggest('  ПЛАТЬЕ К', 3)] == [2]
+
+
+def test_refresh_skips_known_ids_and_matches_full_build():
+    index = MemorySearchQuerySuggestIndex(top_size=3, scan_limit=2)
+    index.load_values((value, i) for i, value in enumerate(VALUES[:8], 1))
+    index.finish_loading()
+
+    # Окно повторного чтения: часть id уже загружена
+    index.load_values((value, i) for i, value in enumerate(VALUES, 1))
+    index.load_weights((i, get_weight(i)) for i in range(1, len(VALUES) + 1))
+    for _ in index.iter_finish_loading():
+        pass
+
+    expected = create_index(scan_limit=2)
+
+    assert len(index) == len(VALUES)
+    assert index.max_id == len(VALUES)
+    assert index._state.keys == expected._state.keys
+    assert list(index._state.ids) == list(expected._state.ids)
+    assert index._state.top == expected._state.top